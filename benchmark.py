@@ -0,0 +1,405 @@
+# BENCHMARK: Recipe Data (Web Scraping and CSV file construction)
+#
+# Objectives:
+# 1. To serve synthetic, allrecipes-like fixture pages from a local HTTP server.
+# 2. To measure the scraper's throughput, latency (end-to-end and per stage) and peak memory use against those pages,
+#    across fetch backends and concurrency settings, writing the results to a machine-readable (JSON) report.
+# 3. To catch performance regressions, by comparing a report with a previous (baseline) report.
+# 4. To check that scraping survives an unreliable website (the fixture server can inject faults).
+#
+# Usage (from the project folder):
+#   python benchmark.py                                                  (writes benchmark_report.json)
+#   python benchmark.py --cards 5000 --workers 1 4 --report new.json --baseline benchmark_report.json
+#   python benchmark.py --cards 500 --fault-rate 0.3
+
+# Import necessary library(ies):
+import argparse
+from datetime import datetime
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import importlib.util
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import main
+
+# Define constants for the default size of the fixture site and the default benchmark settings:
+DEFAULT_CARD_COUNT = 1000
+DEFAULT_CATEGORY_COUNT = 10
+DEFAULT_CONCURRENCY = [1, 8, 16]  # Recipe pages crawled concurrently (recipe details)
+DEFAULT_RECIPE_PAGE_COUNT = 200
+DEFAULT_REPEATS = 3
+DEFAULT_REPORT_PATH = "benchmark_report.json"
+DEFAULT_TOLERANCE = 0.25  # Fraction by which a result may be worse than its baseline before being reported as a regression
+DEFAULT_WORKERS = [1, 2, 4, 8]  # Recipe types scraped concurrently
+
+# Define constant for the kinds of fault the fixture server can inject:  An error status (telling the client to retry
+# immediately, in the case of 503), a connection dropped before responding, or a response cut short:
+FAULT_KINDS = ("status_500", "status_503", "drop", "truncate")
+
+
+# DEFINE FUNCTIONS TO BE USED FOR THIS BENCHMARK (LISTED IN ALPHABETICAL ORDER BY FUNCTION NAME):
+def benchmark_backend(base_url, backend, args):
+    """Function which measures the scraping of the recipe types, of one recipe type, and of all recipe types (per number of workers) using the given fetch backend.  For the HTTP backend, the crawling of recipe pages (per crawl concurrency) is measured as well"""
+    results = {}
+    prepare_scraper(base_url, backend)
+    main.recipe_type_urls.update(main.scrape_recipe_types())
+    recipe_types = list(main.recipe_type_urls)
+
+    results[backend + "/recipe_types"] = measure(main.scrape_recipe_types, args.categories, args.repeats)
+    results[backend + "/recipes"] = measure(lambda: main.scrape_recipes("Category 1"), args.cards, args.repeats)
+    for workers in args.workers:
+        results[f"{backend}/all_recipe_types/workers_{workers}"] = measure(lambda: count_recipes(main.scrape_recipe_categories(recipe_types, workers)), args.categories * args.cards, args.repeats)
+
+    # Recipe pages are always crawled over HTTP (asyncio), regardless of the fetch backend:
+    if backend == main.FETCH_BACKEND_HTTP and args.recipe_pages:
+        recipe_urls = [base_url + "recipe/1-" + str(i) + "/" for i in range(1, args.recipe_pages + 1)]
+        for concurrency in args.concurrency:
+            results[f"http/recipe_details/concurrency_{concurrency}"] = measure(lambda: crawl_details(recipe_urls, concurrency), args.recipe_pages, args.repeats)
+
+    return results
+
+
+def benchmark_bulk_extraction(base_url, card_count, repeats):
+    """Function which measures the extraction of all recipe cards from a fixture category page loaded in a Selenium driver, comparing the per-index XPath lookups used formerly with the single bulk query.  Returns an empty dictionary if Selenium (or Chrome) is not available"""
+    prepare_scraper(base_url, main.FETCH_BACKEND_SELENIUM)
+    driver = main.setup_driver(base_url + "category/1/", main.DRIVER_WINDOW_WIDTH, main.DRIVER_WINDOW_HEIGHT)
+    if not driver:
+        return {}
+
+    try:
+        return {"selenium/extraction/per_index": measure(lambda: extract_recipes_per_index(driver), card_count, repeats),
+                "selenium/extraction/bulk": measure(lambda: main.extract_recipes_bulk(driver), card_count, repeats)}
+    finally:
+        driver.quit()
+
+
+def benchmark_fault_tolerance(base_url, category_count, card_count):
+    """Function which scrapes every category of a fault-injecting fixture server, reporting how many were scraped completely, the number of retries needed, and the time taken"""
+
+    # Scrape over HTTP only, without the page cache and the politeness limit, starting from a clean retry state:
+    prepare_scraper(base_url, main.FETCH_BACKEND_HTTP)
+    main.retry_policy.retries = 0
+    main.recipe_type_urls.update(main.retry_policy.call(base_url, main.scrape_recipe_types_http))
+
+    start = time.perf_counter()
+    results = main.scrape_recipe_categories(list(main.recipe_type_urls))
+    seconds = time.perf_counter() - start
+
+    complete = sum(1 for recipes in results.values() if recipes is not None and len(recipes) == card_count)
+    return {"categories": category_count, "complete": complete, "retries": main.retry_policy.retries, "seconds": seconds}
+
+
+def benchmark_recipe_store(category_count, card_count, repeats):
+    """Function which measures the adding of every recipe type's recipes to a recipe store (each recipe type listing half of the previous one's recipes again, which are deduplicated by link)"""
+    categories = {"Category " + str(c): {"https://www.allrecipes.com/recipe/" + str(i) + "/recipe-" + str(i) + "-deluxe/": "Recipe " + str(i) + ", Deluxe"
+                                         for i in range((c - 1) * card_count // 2, (c + 1) * card_count // 2)}
+                  for c in range(1, category_count + 1)}
+    unique_count = len({url for recipes in categories.values() for url in recipes})
+
+    def add_all():
+        store = main.RecipeStore()
+        for recipe_type, recipes in categories.items():
+            store.add_many(recipe_type, recipes)
+        return store
+
+    return {"recipe_store/add": measure(add_all, unique_count, repeats)}
+
+
+def benchmark_write(card_count, repeats):
+    """Function which measures the writing of one recipe type's recipes (sorted by recipe name) to a file, per output file format (Parquet only if pyarrow is installed)"""
+    recipes = {"http://127.0.0.1/recipe/1-" + str(i) + "/": "Recipe 1-" + str(i) + ", Deluxe" for i in range(card_count, 0, -1)}
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in (".csv", ".csv.gz", ".jsonl", ".jsonl.gz", ".sqlite") + ((".parquet",) if importlib.util.find_spec("pyarrow") else ()):
+            file_path = os.path.join(folder, "recipes" + extension)
+            results["write/" + extension[1:].replace(".", "_")] = measure(lambda: range(main.write_recipes_to_file(file_path, "Category 1", recipes)), card_count, repeats)
+    return results
+
+
+def build_fixture_site(category_count, card_count, recipe_page_count=0, category_page_count=1):
+    """Function which generates the pages of a synthetic recipe website, using the same element ids and structure as the real website.  Each category's recipe cards are spread over category_page_count pages (linked with rel="next"; each page repeats the previous page's last card).  Recipe pages (with a JSON-LD "Recipe" block) are generated for the first recipe_page_count recipes of the first category.  Returns a dictionary of page path -> HTML"""
+    pages = {}
+
+    # Main page, with the navigation link (second item) that leads to the recipe-type page:
+    pages["/"] = ('<html><body><header><nav id="mntl-header-nav_1-0"><div><ul>'
+                  '<li><a href="/ingredients/">Ingredients</a></li>'
+                  '<li><a href="/recipes/">Recipes</a></li>'
+                  '</ul></div></nav></header></body></html>')
+
+    # Recipe-type page, listing every category:
+    items = "".join('<li id="mntl-link-list__item_' + str(i) + '-0" class="link-list__item"><a href="/category/' + str(i) + '/">Category ' + str(i) + '</a></li>'
+                    for i in range(1, category_count + 1))
+    pages["/recipes/"] = '<html><body><ul class="link-list">' + items + '</ul></body></html>'
+
+    # Pages for each category, together containing the requested number of recipe cards (numbered from 1 on each page):
+    cards_per_page = -(-card_count // category_page_count)
+    for c in range(1, category_count + 1):
+        for p in range(category_page_count):
+            first = max(1, p * cards_per_page)  # Each page after the first repeats the previous page's last card
+            cards = "".join('<a id="mntl-card-list-items_' + str(i - first + 1) + '-0" class="card" href="/recipe/' + str(c) + '-' + str(i) + '/">'
+                            '<div class="card__media"><img src="/img/' + str(i) + '.jpg" alt=""></div>'
+                            '<div class="card__content"><span class="card__title"><span class="card__title-text">Recipe ' + str(c) + '-' + str(i) + ', Deluxe</span></span></div>'
+                            '</a>'
+                            for i in range(first, min(card_count, (p + 1) * cards_per_page) + 1))
+            next_link = '<a rel="next" href="/category/' + str(c) + '/?page=' + str(p + 2) + '">Next</a>' if p + 1 < category_page_count else ''
+            pages["/category/" + str(c) + "/" + ("?page=" + str(p + 1) if p else "")] = '<html><body><div class="card-list">' + cards + '</div>' + next_link + '</body></html>'
+
+    # Recipe pages, each with its recipe's details in a JSON-LD block (as on the real website):
+    for i in range(1, recipe_page_count + 1):
+        recipe = {"@context": "https://schema.org", "@type": "Recipe", "name": "Recipe 1-" + str(i) + ", Deluxe",
+                  "recipeIngredient": ["Ingredient " + str(n) for n in range(1, 13)], "prepTime": "PT15M", "cookTime": "PT1H5M",
+                  "totalTime": "PT1H20M", "recipeYield": ["4", "4 servings"], "aggregateRating": {"ratingValue": "4.6", "ratingCount": str(i * 7)}}
+        pages["/recipe/1-" + str(i) + "/"] = ('<html><head><script type="application/ld+json">' + json.dumps([recipe]) + '</script></head>'
+                                              '<body><h1>' + recipe["name"] + '</h1>' + '<p>Step.</p>' * 50 + '</body></html>')
+
+    return pages
+
+
+def compare_with_baseline(results, baseline_results, tolerance):
+    """Function which compares benchmark results with those of a baseline report.  Returns a description of each regression:  A throughput lower, or a peak memory use higher, than the baseline's by more than the tolerance (a fraction)"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        baseline = baseline_results.get(name)
+        if not baseline:
+            continue
+        if result["items_per_second"] and baseline["items_per_second"] and result["items_per_second"] < baseline["items_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['items_per_second']:.0f}/s, baseline {baseline['items_per_second']:.0f}/s")
+        if result["peak_memory_bytes"] > baseline["peak_memory_bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {result['peak_memory_bytes'] / 2 ** 20:.1f} MiB, baseline {baseline['peak_memory_bytes'] / 2 ** 20:.1f} MiB")
+    return regressions
+
+
+def count_recipes(results):
+    """Function which returns the recipes scraped for several recipe types (see main.scrape_recipe_categories) as a single list, so that their number can be checked"""
+    return [recipe for recipes in results.values() for recipe in (recipes or {})]
+
+
+def crawl_details(recipe_urls, concurrency):
+    """Function which crawls recipe pages with the given concurrency, returning the details of each recipe crawled successfully"""
+    details = []
+    main.crawl_recipe_details(recipe_urls, lambda url, recipe_details: recipe_details and details.append(recipe_details), concurrency)
+    return details
+
+
+def extract_recipes_per_index(driver):
+    """Function which captures all recipes using one XPath lookup per element (the extraction strategy used before the bulk query), for comparison purposes"""
+    from selenium.webdriver.common.by import By
+
+    recipes = {}
+    i = 1   # Element-counter variable
+    while True:
+        try:
+            element = driver.find_element(By.XPATH, '// *[ @ id = "mntl-card-list-items_' + str(i) + '-0"]')
+            recipe_link = element.get_attribute('href')
+            element = driver.find_element(By.XPATH, '// *[ @ id = "mntl-card-list-items_' + str(i) + '-0"]/div[2]/span/span')
+            recipes.update({recipe_link: element.text.replace(',', '')})
+            i += 1
+        except Exception:  # No more recipes are available.
+            return recipes
+
+
+def measure(func, item_count, repeats):
+    """Function which runs a scraping call several times, reporting its latency (best, median and worst run), throughput, time spent per stage of scraping (from the scraper's metrics) and peak memory use.  Peak memory is measured by one extra run with tracemalloc, as tracing slows the call down"""
+    timings = []
+    main.metrics.reset()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items = func()
+        timings.append(time.perf_counter() - start)
+
+        # Ensure that every item was extracted (a fast but incomplete extraction is not a valid result):
+        if len(items) != item_count:
+            raise AssertionError(f"Expected {item_count} items, got {len(items)}")
+    stages = summarize_stages(main.metrics.snapshot(), repeats)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {"items": item_count, "repeats": repeats, "best_seconds": best, "median_seconds": statistics.median(timings), "worst_seconds": max(timings),
+            "items_per_second": item_count / best if best else None, "peak_memory_bytes": peak_memory, "stages": stages}
+
+
+def prepare_scraper(base_url, backend):
+    """Function which points the scraper at the fixture website, using the given fetch backend.  The page cache and the politeness limit are turned off, so that every run downloads its pages from the local fixture server"""
+    main.cache_mode = main.CACHE_MODE_DISABLED
+    main.host_rate_limiter.min_interval = 0
+    main.retry_policy.circuit_breaker.reset()
+    main.fetch_backend = backend
+    main.url_recipe_site = base_url
+    main.url_recipe_type_page = None
+    main.recipe_type_urls.clear()
+
+
+def run_benchmark():
+    """Main function used to run this benchmark.  Returns the exit code for the process (1 if a regression was found)"""
+    parser = argparse.ArgumentParser(description="Benchmark the recipe scraper against a local fixture website.")
+    parser.add_argument("--cards", type=int, default=DEFAULT_CARD_COUNT, help="recipe cards per category page (default: %(default)s)")
+    parser.add_argument("--category-pages", type=int, default=1, help="pages over which each category's recipe cards are spread (default: %(default)s)")
+    parser.add_argument("--categories", type=int, default=DEFAULT_CATEGORY_COUNT, help="number of recipe categories (default: %(default)s)")
+    parser.add_argument("--recipe-pages", type=int, default=DEFAULT_RECIPE_PAGE_COUNT, help="recipe pages crawled for recipe details, 0 to skip (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed runs per measurement (default: %(default)s)")
+    parser.add_argument("--backends", nargs="+", choices=[main.FETCH_BACKEND_HTTP, main.FETCH_BACKEND_SELENIUM], default=[main.FETCH_BACKEND_HTTP, main.FETCH_BACKEND_SELENIUM], help="fetch backends to measure (Selenium is skipped if not available)")
+    parser.add_argument("--driver-profile", choices=[main.DRIVER_PROFILE_LEAN, main.DRIVER_PROFILE_STANDARD], default=main.DRIVER_PROFILE_LEAN, help="profile of the browsers started for the Selenium backend (default: %(default)s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS, help="numbers of recipe types scraped concurrently (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY, help="numbers of recipe pages crawled concurrently (default: %(default)s)")
+    parser.add_argument("--report", default=DEFAULT_REPORT_PATH, help="file to which the JSON report is written (default: %(default)s)")
+    parser.add_argument("--baseline", help="previous JSON report to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="fraction by which a result may be worse than its baseline (default: %(default)s)")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="fraction of requests failed by the fixture server (if given, fault tolerance is checked instead)")
+    parser.add_argument("--seed", type=int, help="random seed for the injected faults (for reproducible runs)")
+    args = parser.parse_args()
+    main.driver_profile = args.driver_profile
+
+    server, base_url = start_fixture_server(build_fixture_site(args.categories, args.cards, args.recipe_pages, args.category_pages), args.fault_rate, args.seed)
+    try:
+        # Fault tolerance check:
+        if args.fault_rate:
+            result = benchmark_fault_tolerance(base_url, args.categories, args.cards)
+            print(f"{result['complete']} of {result['categories']} categories scraped completely, {result['retries']} retries, {result['seconds']:.1f} s")
+            return 0 if result["complete"] == result["categories"] else 1
+
+        # Benchmark each fetch backend, then the writing of output files:
+        results = {}
+        for backend in args.backends:
+            if backend == main.FETCH_BACKEND_SELENIUM:
+                if not selenium_available(base_url):
+                    print("Selenium (or Chrome) not available:  Selenium benchmarks skipped.")
+                    continue
+                results.update(benchmark_bulk_extraction(base_url, args.cards, args.repeats))
+            results.update(benchmark_backend(base_url, backend, args))
+        results.update(benchmark_recipe_store(args.categories, args.cards, args.repeats))
+        results.update(benchmark_write(args.cards, args.repeats))
+    finally:
+        server.shutdown()
+
+    # Show the results, then write them to the report:
+    for name, result in results.items():
+        print(f"{name:45s} {result['median_seconds'] * 1000:10.1f} ms {result['items_per_second']:12.0f} items/s {result['peak_memory_bytes'] / 2 ** 20:8.1f} MiB")
+    write_report(args.report, args, results)
+    print(f"Report written to {args.report}")
+
+    # Compare the results with the baseline report, if any:
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare_with_baseline(results, json.load(baseline_file)["results"], args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+        print("No regression found.")
+    return 0
+
+
+def selenium_available(base_url):
+    """Function which checks whether Selenium is installed and a Chrome browser can be started"""
+    if importlib.util.find_spec("selenium") is None:
+        return False
+    prepare_scraper(base_url, main.FETCH_BACKEND_SELENIUM)
+    driver = main.driver_pool.acquire()
+    if not driver:
+        return False
+    main.driver_pool.release(driver)
+    return True
+
+
+def start_fixture_server(pages, fault_rate=0.0, seed=None):
+    """Function which serves fixture pages from a local HTTP server running on a background thread.  Pages are served with an ETag (a hash of their content), and a request revalidating an unchanged page is answered "304 Not Modified", as by the real website.  A fraction (fault_rate) of the requests fail with a randomly chosen fault (see FAULT_KINDS).  Returns the server and its base URL"""
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class FixtureRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, as served by the real website
+        disable_nagle_algorithm = True  # Headers and body are written separately:  Do not delay the body
+
+        def do_GET(self):
+            body = pages.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            body = body.encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+            # Inject a fault, if so chosen:
+            with rng_lock:
+                fault = rng.choice(FAULT_KINDS) if rng.random() < fault_rate else None
+            if fault in ("status_500", "status_503"):
+                self.send_response(int(fault[-3:]))
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if fault == "drop":
+                self.close_connection = True
+                return
+
+            # The client's cached copy of the page is still current:
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if fault == "truncate":
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # Keep benchmark output free of request logging.
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:" + str(server.server_port) + "/"
+
+
+def summarize_stages(snapshot, repeats):
+    """Function which summarizes the time spent per stage of scraping (e.g., "page_load[http]"), per run, from a snapshot of the scraper's metrics"""
+    stages = {}
+    for name, histogram in sorted(snapshot["histograms"].items()):
+        stage = re.search(r'stage="(\w+)"', name)
+        if not name.startswith("stage_seconds") or not stage:
+            continue
+        backend = re.search(r'backend="(\w+)"', name)
+        stages[stage.group(1) + ("[" + backend.group(1) + "]" if backend else "")] = {
+            "calls_per_run": histogram["count"] / repeats,
+            "seconds_per_run": histogram["sum"] / repeats,
+            "mean_seconds": histogram["sum"] / histogram["count"] if histogram["count"] else None,
+        }
+    return stages
+
+
+def write_report(file_path, args, results):
+    """Function which writes the benchmark results to a JSON report, along with the settings and environment they were obtained with"""
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": {"python": sys.version.split()[0], "implementation": platform.python_implementation(), "platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "settings": {"categories": args.categories, "cards": args.cards, "category_pages": args.category_pages, "recipe_pages": args.recipe_pages, "driver_profile": args.driver_profile, "repeats": args.repeats, "workers": args.workers, "concurrency": args.concurrency},
+        "results": results,
+    }
+    with open(file_path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(run_benchmark())
@@ -3,26 +3,267 @@
 # Objectives:
 # 1. To scrape a website containing recipe data and capture desired data elements.
 # 2. To write captured data to a CSV file.
-
-# Import necessary library(ies):
-import collections  # Used for sorting items in the "selected recipes" dictionary
+#
+# Usage (from the project folder):
+#   python main.py                                         (GUI)
+#   python main.py types                                   (list the available recipe types)
+#   python main.py scrape --categories "Breakfast and Brunch Recipes" --out recipes --format jsonl --gzip
+#   python main.py scrape --out recipes --incremental      (all recipe types; only what changed since the previous run)
+#   python main.py scrape --out recipes --resume           (all recipe types; skip those completed by an interrupted run)
+#   python main.py search "chicken curry" --folder recipes --categories "Dinner Recipes"   (search the recipes saved by name / ingredients)
+#   python main.py --metrics-file metrics.prom --profile scrape.prof scrape --out recipes   (timings, counters and profile)
+#
+# The scraping functions (scrape_recipe_types, scrape_recipes, scrape_recipe_categories, crawl_recipe_details, ...) can
+# also be used by other code ("import main"), without any GUI.
+
+# Import necessary library(ies).  Tkinter (GUI mode) and Selenium (Selenium fetch backend) are only imported when needed,
+# so that the scraper can run (and be imported by other code) on machines without a display or a browser:
+import argparse
+from array import array  # Used for holding recipes compactly in memory (see RecipeStore)
+import asyncio  # Used for crawling recipe pages concurrently (recipe details)
+import atexit  # Used for closing all pooled Selenium drivers (browsers) when this application exits
+import bisect
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed  # Used for scraping several recipe types concurrently
+import contextlib
+import contextvars  # Used for adding the category / URL being scraped to each system log record
+import csv
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from tkinter import *
-from tkinter import filedialog, messagebox, ttk
+import functools
+import gzip
+import hashlib  # Used for fingerprinting recipes (incremental scraping)
+import heapq  # Used for merging sorted runs of rows (external merge sort) when writing sorted output files
+import http.client
+import importlib.util  # Used for checking that optional packages (pyarrow) are installed before scraping starts
+from html.parser import HTMLParser  # Used by the lightweight (HTTP) fetch backend for parsing pages
+import json
+import os
+import queue  # Used for passing progress and results from the background scraping worker to the GUI
+import random  # Used for spreading out retries of failed requests (backoff jitter)
+import re
+import sqlite3
+import ssl
+import sys
+import tempfile
+import threading
+import time
 import traceback
+import unicodedata  # Used for ignoring accents when searching recipes
+import urllib.error
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+import uuid
 
 # Define constants for application default font size as well as window's height and width:
 FONT_NAME = "Arial"
-WINDOW_HEIGHT = 570
+WINDOW_HEIGHT = 900
 WINDOW_WIDTH = 510
 
-# Define variable for the main GUI (application) window (so that it can be used globally), and make it a TKinter instance:
-window = Tk()
-
-# Withdraw the main application window from sight until it has been fully configured and ready for the user to interact with:
-window.withdraw()
+# Define constant for how often (in milliseconds) the GUI checks for progress reported by the background scraping worker:
+GUI_POLL_INTERVAL = 100
+
+# Define constant for the maximum number of recipes listed by a search (search box, or "search" command):
+SEARCH_RESULTS_LIMIT = 50
+
+# Define constants for the available fetch backends.  The "http" backend downloads pages over plain HTTP and parses them
+# with an HTML parser; the "selenium" backend drives a Chrome browser and is used as a fallback for pages needing JavaScript:
+FETCH_BACKEND_HTTP = "http"
+FETCH_BACKEND_SELENIUM = "selenium"
+
+# Define constants for the pool of reusable Selenium drivers (browsers), as well as the dimensions of each browser window:
+DRIVER_POOL_IDLE_TIMEOUT = 300  # Seconds an unused driver is kept open before being closed
+DRIVER_POOL_SIZE = 2  # Maximum number of drivers open at any time
+DRIVER_WINDOW_HEIGHT = 300
+DRIVER_WINDOW_WIDTH = 1600
+
+# Define constants for the available driver (browser) profiles.  The "lean" profile runs Chrome headless, without extensions,
+# hands pages over as soon as their HTML has been parsed (pageLoadStrategy "eager"; the elements read are waited for
+# explicitly, up to DRIVER_ELEMENT_WAIT_TIMEOUT seconds), and blocks images, fonts and media (DRIVER_BLOCKED_URL_PATTERNS) as
+# well as every domain other than the recipe website's.  Style sheets are still loaded, since the visible text of elements
+# (as read by the scraper) depends on them.  The "standard" profile runs a regular, visible Chrome window:
+DRIVER_PROFILE_LEAN = "lean"
+DRIVER_PROFILE_STANDARD = "standard"
+DRIVER_BLOCKED_URL_PATTERNS = ["*.avif", "*.bmp", "*.gif", "*.ico", "*.jpeg", "*.jpg", "*.png", "*.svg", "*.webp",
+                               "*.eot", "*.otf", "*.ttf", "*.woff", "*.woff2",
+                               "*.m3u8", "*.mp3", "*.mp4", "*.ogg", "*.ts", "*.wav", "*.webm"]
+DRIVER_ELEMENT_WAIT_TIMEOUT = 15  # Seconds
+
+# Define constant for the site profile, which describes where the data to be scraped is found on the recipe website's pages
+# (navigation links, lists of recipe types / recipes and their fields).  If the website's layout changes, only the site
+# profile needs to be updated (see SiteProfile).  Each step of an element's path is a tag, optionally followed by its 1-based
+# position among same-tag children (e.g., "li[2]"):
+SITE_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "site_profile.json")
+SITE_PROFILE_PATH_STEP = re.compile(r"([A-Za-z][A-Za-z0-9-]*)(?:\[([1-9][0-9]*)\])?")
+
+# Define constants for following a list (e.g., a recipe type's recipes) across several pages ("next page" links, "load more"
+# buttons or infinite scrolling).  At most PAGINATION_MAX_PAGES pages are followed per list (unless the site profile says
+# otherwise), and after triggering "load more" / scrolling, new items are waited for up to PAGINATION_WAIT_TIMEOUT seconds:
+PAGINATION_MAX_PAGES = 50
+PAGINATION_WAIT_TIMEOUT = 10  # Seconds
+
+# Define constants used by the lightweight (HTTP) fetch backend:
+HTTP_TIMEOUT = 30  # Seconds
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# Define constants for the on-disk page cache.  Cached pages younger than PAGE_CACHE_TTL are used without contacting the
+# website; older ones are revalidated with the website (ETag / Last-Modified) before being reused.  Once the cache exceeds
+# PAGE_CACHE_MAX_BYTES, the least recently used pages are removed:
+PAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+PAGE_CACHE_PATH = "recipe_data_web_scraper_cache.sqlite3"
+PAGE_CACHE_TTL = 12 * 60 * 60  # Seconds
+
+# Define constant for the database which records the recipes seen by previous runs (incremental scraping):
+SCRAPE_STATE_PATH = "recipe_data_web_scraper_state.sqlite3"
+
+# Define constants for the available page cache modes.  In "offline" mode, only cached pages are used (the website is
+# never contacted), which also allows scrapes to be replayed deterministically:
+CACHE_MODE_DISABLED = "disabled"
+CACHE_MODE_NORMAL = "normal"
+CACHE_MODE_OFFLINE = "offline"
+
+# Define constants for the system log.  Records are written as JSON lines to a dated log file, in batches of up to
+# LOG_BUFFER_RECORDS records, at least every LOG_FLUSH_INTERVAL seconds (while records are being logged) and when this
+# application exits:
+LOG_BUFFER_RECORDS = 100
+LOG_FILE_PREFIX = "log_recipe_data_web_scraper_"
+LOG_FLUSH_INTERVAL = 5  # Seconds
+
+# Define constants for the metrics (counters and latency histograms) collected while scraping.  Latencies are counted in
+# buckets whose upper bounds (in seconds) are listed in METRICS_LATENCY_BUCKETS:
+METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRICS_PREFIX = "recipe_scraper_"
+
+# Define constants for the available output file formats.  The format is identified by the file's extension (".csv",
+# ".jsonl", ".sqlite" or ".parquet"), and a CSV or JSON Lines file whose name ends with ".gz" is gzip-compressed (Parquet
+# files are compressed internally).  SQLite databases and Parquet files are meant for analysis:  Their rows are written in
+# batches of OUTPUT_BATCH_ROWS rows (one transaction / row group per batch), and their columns hold plain values (see
+# TABLE_COLUMNS_RECIPES) rather than spreadsheet formulas.  Writing Parquet files requires the pyarrow package:
+FILE_FORMAT_CSV = "csv"
+FILE_FORMAT_JSONL = "jsonl"
+FILE_FORMAT_PARQUET = "parquet"
+FILE_FORMAT_SQLITE = "sqlite"
+OUTPUT_BATCH_ROWS = 10000
+OUTPUT_FILE_TYPES = [("CSV file(*.csv)", "*.csv"), ("Compressed CSV file(*.csv.gz)", "*.csv.gz"), ("JSON Lines file(*.jsonl)", "*.jsonl"), ("Compressed JSON Lines file(*.jsonl.gz)", "*.jsonl.gz"),
+                     ("SQLite database(*.sqlite)", "*.sqlite"), ("Parquet file(*.parquet)", "*.parquet")]
+PARQUET_COMPRESSION = "zstd"
+PARQUET_MISSING_PACKAGE_MESSAGE = "Writing Parquet files requires the pyarrow package (pip install pyarrow)."
+
+# Define constant for the number of rows sorted in memory when writing a sorted output file.  Beyond that, sorted runs of
+# rows are spilled to temporary files and merged when the output file is closed (external merge sort):
+SORT_BUFFER_ROWS = 50000
+
+# Define the columns of each kind of CSV output file, as (column header, function returning the column's value for a row)
+# pairs.  In the recipe file, the URL is written inside a "HYPERLINK" formula (any double quotes in it doubled, as within any
+# formula's string) so that if the CSV file is opened in MS-Excel, the URL will be an active link that the user can click on
+# to get to the desired recipe.  In the recipe-details file, ingredients are separated by " | " within their column, and the
+# recipe's complete JSON-LD block is included:
+CSV_COLUMNS_RECIPES = [("Recipe", lambda row: row["name"]),
+                       ("URL", lambda row: '=HYPERLINK("' + row["url"].replace('"', '""') + '")')]
+CSV_COLUMNS_RECIPE_DETAILS = [("Recipe", lambda row: row["name"]),
+                              ("URL", lambda row: row["url"]),
+                              ("Ingredients", lambda row: " | ".join(row["ingredients"])),
+                              ("Prep Time (min)", lambda row: row["prep_time"]),
+                              ("Cook Time (min)", lambda row: row["cook_time"]),
+                              ("Total Time (min)", lambda row: row["total_time"]),
+                              ("Servings", lambda row: row["servings"]),
+                              ("Rating", lambda row: row["rating"]),
+                              ("Rating Count", lambda row: row["rating_count"]),
+                              ("JSON-LD", lambda row: json.dumps(row["json_ld"]) if row["json_ld"] else None)]
+
+# In the file of changes found by an incremental run, the details columns are only filled for the recipes whose details were
+# crawled (added or changed recipes, if requested) and are new or have changed since the previous run:
+CSV_COLUMNS_RECIPE_DELTA = [("Change", lambda row: row["change"]),
+                            ("Recipe Type", lambda row: row["recipe_type"]),
+                            ("Recipe", lambda row: row["name"]),
+                            ("URL", lambda row: row["url"])] + \
+                           [(header, lambda row, value=value: value(row["details"]) if row.get("details") else None)
+                            for header, value in CSV_COLUMNS_RECIPE_DETAILS if header not in ("Recipe", "URL")]
+
+# Define the columns of each kind of table written to an SQLite database or Parquet file, as (column name, SQL type, function
+# returning the column's value for a row) triples.  Links are written as they are, and lists and JSON-LD blocks as JSON text.
+# In a database, the columns listed in OUTPUT_INDEXED_COLUMNS are indexed (once all rows have been written):
+TABLE_COLUMNS_RECIPES = [("recipe_type", "TEXT", lambda row: row["recipe_type"]),
+                         ("name", "TEXT", lambda row: row["name"]),
+                         ("url", "TEXT", lambda row: row["url"])]
+TABLE_COLUMNS_RECIPE_DETAILS = [("recipe_type", "TEXT", lambda row: row.get("recipe_type")),
+                                ("name", "TEXT", lambda row: row["name"]),
+                                ("url", "TEXT", lambda row: row["url"]),
+                                ("ingredients", "TEXT", lambda row: json.dumps(row["ingredients"], ensure_ascii=False)),
+                                ("prep_time", "INTEGER", lambda row: row["prep_time"]),
+                                ("cook_time", "INTEGER", lambda row: row["cook_time"]),
+                                ("total_time", "INTEGER", lambda row: row["total_time"]),
+                                ("servings", "TEXT", lambda row: row["servings"]),
+                                ("rating", "REAL", lambda row: row["rating"]),
+                                ("rating_count", "INTEGER", lambda row: row["rating_count"]),
+                                ("json_ld", "TEXT", lambda row: json.dumps(row["json_ld"], ensure_ascii=False) if row["json_ld"] else None)]
+TABLE_COLUMNS_RECIPE_DELTA = [("change", "TEXT", lambda row: row["change"]),
+                              ("recipe_type", "TEXT", lambda row: row["recipe_type"]),
+                              ("name", "TEXT", lambda row: row["name"]),
+                              ("url", "TEXT", lambda row: row["url"])] + \
+                             [(column, sql_type, lambda row, value=value: value(row["details"]) if row.get("details") else None)
+                              for column, sql_type, value in TABLE_COLUMNS_RECIPE_DETAILS if column not in ("recipe_type", "name", "url")]
+OUTPUT_INDEXED_COLUMNS = ("recipe_type", "url")
+
+# Define the kinds of output written, each as its table name (SQLite / Parquet), CSV columns and table columns:
+OUTPUT_RECIPES = ("recipes", CSV_COLUMNS_RECIPES, TABLE_COLUMNS_RECIPES)
+OUTPUT_RECIPE_DELTA = ("recipe_changes", CSV_COLUMNS_RECIPE_DELTA, TABLE_COLUMNS_RECIPE_DELTA)
+OUTPUT_RECIPE_DETAILS = ("recipe_details", CSV_COLUMNS_RECIPE_DETAILS, TABLE_COLUMNS_RECIPE_DETAILS)
+
+# Define constants for scraping several recipe types concurrently.  Regardless of the number of workers, requests to the
+# same host are spaced at least HOST_MIN_REQUEST_INTERVAL seconds apart (politeness limit):
+HOST_MIN_REQUEST_INTERVAL = 0.5  # Seconds
+SCRAPE_MAX_WORKERS = 4
+
+# Define constants for retrying failed requests to the website.  Only transient errors (time-outs, dropped connections,
+# "429 Too Many Requests", server errors, ...) are retried, up to FETCH_MAX_ATTEMPTS attempts in total.  Between attempts,
+# a random time of up to FETCH_BACKOFF_BASE * 2^(attempt - 1) seconds (capped at FETCH_BACKOFF_MAX) is waited
+# (exponential backoff with jitter, so that concurrent workers do not retry in lockstep), unless the website asks for a
+# specific wait ("Retry-After"):
+FETCH_BACKOFF_BASE = 0.5  # Seconds
+FETCH_BACKOFF_MAX = 30  # Seconds
+FETCH_MAX_ATTEMPTS = 4
+FETCH_RETRY_HTTP_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+SELENIUM_TRANSIENT_ERRORS = ("StaleElementReferenceException", "TimeoutException", "WebDriverException")  # Selenium exception class names
+
+# Define constants identifying the Selenium errors which mean that a driver's browser (or its session) has died, by exception
+# class name (including the errors of the connection to the driver) or, for a generic WebDriverException, by message.  Such
+# an error is not retried and does not count against the website's circuit (the website is not at fault); the driver is
+# discarded instead:
+SELENIUM_DRIVER_FAILURE_ERRORS = ("InvalidSessionIdException", "MaxRetryError", "NoSuchDriverException", "NoSuchWindowException", "ProtocolError")
+SELENIUM_DRIVER_FAILURE_MESSAGES = ("chrome not reachable", "disconnected", "invalid session id", "no such window", "session deleted", "target window already closed")
+
+# Define constants for the per-host circuit breaker.  After CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive failed requests to
+# a host, further requests to it fail immediately, until a trial request is let through CIRCUIT_BREAKER_RESET_TIMEOUT seconds
+# later (and succeeds):
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+CIRCUIT_BREAKER_RESET_TIMEOUT = 60  # Seconds
+
+# Define constant for the name of the file, in the output folder, which records the recipe types completed by a scrape run
+# (so that an interrupted run can be resumed where it stopped):
+SCRAPE_CHECKPOINT_FILE_NAME = "Recipe Scrape Checkpoint.json"
+
+# Define constants for the work queue of a distributed crawl (coordinator / worker mode).  A worker claims a recipe type, or
+# a batch of up to WORK_QUEUE_BATCH_SIZE recipe pages, under a lease of WORK_QUEUE_LEASE_TIMEOUT seconds (renewed while it
+# works).  A task whose lease expires (e.g., its worker has crashed) is claimed again, up to WORK_QUEUE_MAX_ATTEMPTS times in
+# total.  Workers with nothing to claim check the queue again every WORK_QUEUE_POLL_INTERVAL seconds:
+WORK_QUEUE_BATCH_SIZE = 50
+WORK_QUEUE_LEASE_TIMEOUT = 300  # Seconds
+WORK_QUEUE_MAX_ATTEMPTS = 3
+WORK_QUEUE_POLL_INTERVAL = 2  # Seconds
+WORK_QUEUE_PARTITION_FOLDER_NAME = "Recipe Details"  # Folder, in the output folder, holding the partitions of recipe details
+
+# Define constants for crawling the recipe pages (recipe details) with asyncio.  At most DETAIL_CRAWL_CONCURRENCY pages are
+# in flight at a time, over at most HTTP_MAX_CONNECTIONS_PER_HOST reusable (keep-alive) connections per host.  Requests are
+# still spaced HOST_MIN_REQUEST_INTERVAL seconds apart, so that, whatever the concurrency, at most 1 / HOST_MIN_REQUEST_INTERVAL
+# pages per second (2 by default) are requested from the website; the interval can be changed with the --min-interval option:
+DETAIL_CRAWL_CONCURRENCY = 8
+HTTP_MAX_CONNECTIONS_PER_HOST = 8
+
+# Define variables for the Tkinter modules used in GUI mode (imported by load_gui_toolkit when the GUI is started):
+tk = ttk = filedialog = messagebox = None
+
+# Define variable for the main GUI (application) window (so that it can be used globally).  It is created when the GUI is
+# started (None when running without GUI):
+window = None
 
 # Define variable for image to be displayed at top part of application window:
 img = None
@@ -30,202 +271,2200 @@ img = None
 # Initiate a list variable which will store all available recipe types scraped from the recipe website:
 combobox_recipe_type_values = []
 
-# Initiate a variable which will store the recipe type selected by the user:
-selected_recipe_type = StringVar()
+# Initiate a variable which will store the recipe type selected by the user (a Tkinter variable, created when the GUI is started):
+selected_recipe_type = None
+
+# Initiate a variable which will store whether the user wishes to capture each recipe's details (from the recipe's own page).
+# It is a Tkinter variable, created when the GUI is started:
+include_recipe_details = None
+
+# Initiate a variable which will store whether the user wishes the recipe files to be sorted by recipe name (written once each
+# recipe type has been scraped) rather than written as the recipes are captured.  It is a Tkinter variable, created when the
+# GUI is started:
+sort_recipes = None
+
+# Initiate a dictionary variable which will store the user-interface widgets updated while this application runs (progress
+# bar, status text, buttons, ...), keyed by name:
+gui_widgets = {}
+
+# Initiate the queue through which the background scraping worker passes progress, messages and results to the GUI, the
+# event used for asking the worker to stop (Cancel button), and a variable which will store the worker (thread) itself.
+# Scraping runs on the worker so that the application window remains responsive while the website is being scraped:
+gui_event_queue = queue.Queue()
+scrape_cancel_event = threading.Event()
+scrape_worker = None
+
+# Initiate a variable which will store the thread refreshing, at start-up, the recipe types listed from those saved by the
+# previous run (see start_recipe_types_refresh):
+recipe_types_refresher = None
+
+# Initiate a dictionary variable which will store the progress of the scraping under way (used for calculating its
+# throughput and estimated time remaining):
+scrape_progress = {}
+
+# Initiate a context variable which will store the fields (e.g., the category and URL being scraped) added to each system log
+# record by the code being run (see log_context).  Each thread and asyncio task has its own value:
+log_context_fields = contextvars.ContextVar("log_context_fields", default={})
 
-# Initiate a dictionary variable which will store all available recipe names and links for a selected recipe type:
-selected_recipes = {}
+# Initiate a context variable which will store whether the code being run informs the user of errors (see notify_user).  The
+# background refresh of the recipe types at start-up mutes it, as the saved recipe types remain listed if the refresh fails:
+user_notifications_muted = contextvars.ContextVar("user_notifications_muted", default=False)
+
+# Initiate a dictionary variable which will store the link (URL) to each recipe type's page, keyed by recipe type, the lock
+# held while it is read or changed, and the scraping of the recipe types under way (a Future, so that when several scraping
+# threads need the links at once, the recipe types are only scraped once, see load_recipe_type_urls):
+recipe_type_urls = {}
+recipe_type_urls_lock = threading.Lock()
+recipe_type_urls_pending = None
 
 # Initiate a variables for storing the URL for the recipe website's main page:
 url_recipe_site = "https://www.allrecipes.com/"
 
+# Initiate a variable for storing the URL for the recipe website's recipe-type page (known once it has been navigated to):
+url_recipe_type_page = None
+
+# Initiate a variable for storing the path of the site profile in use, and a dictionary variable which will store each site
+# profile compiled so far (along with its file's modification time), keyed by path:
+site_profile_path = SITE_PROFILE_PATH
+site_profiles = {}
+
+# Initiate a variable which identifies the profile of the drivers (browsers) started by the Selenium fetch backend:
+driver_profile = DRIVER_PROFILE_LEAN
+
+# Initiate a variable which identifies the fetch backend to try first when scraping the recipe website:
+fetch_backend = FETCH_BACKEND_HTTP
+
+# Initiate a variable which identifies how the on-disk page cache is used:
+cache_mode = CACHE_MODE_NORMAL
+
+
+# DEFINE CLASSES TO BE USED FOR THIS APPLICATION (LISTED IN ALPHABETICAL ORDER BY CLASS NAME):
+class AsyncHTTPConnectionPool:
+    """Class which downloads pages with asyncio, keeping connections open (keep-alive) for reuse by later requests to the same host"""
+
+    def __init__(self, max_connections_per_host, timeout):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout  # Seconds allowed for each request (including reading the response)
+        self._idle = {}  # (scheme, host, port) -> idle connections, as (reader, writer) pairs
+        self._limits = {}  # (scheme, host, port) -> semaphore limiting the number of connections open to the host
+
+    async def close(self):
+        """Function which closes all idle connections"""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def get(self, url, extra_headers=None, max_redirects=5):
+        """Function which downloads a page, following redirects.  Returns the final URL, the HTTP status code, the response headers (lower-cased names) and the page's (decoded) content"""
+        for _ in range(max_redirects + 1):
+            status, headers, body = await asyncio.wait_for(self._request(url, extra_headers), self.timeout)
+
+            # Follow a redirect to its target:
+            if status in (301, 302, 303, 307, 308) and headers.get("location"):
+                url = urljoin(url, headers["location"])
+                continue
+
+            # Decode the page using the character set declared by the server (default to UTF-8):
+            charset = re.search(r'charset="?([\w-]+)', headers.get("content-type", ""))
+            return url, status, headers, body.decode(charset.group(1) if charset else "utf-8", errors="replace")
+
+        raise ConnectionError(f"Too many redirects: {url}")
+
+    async def _request(self, url, extra_headers):
+        # Identify the host to connect to, and the path to request from it:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        host = parts.hostname if parts.port is None else parts.hostname + ":" + str(parts.port)
+        request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {HTTP_USER_AGENT}\r\n"
+                   f"Accept: text/html,application/xhtml+xml\r\nAccept-Encoding: identity\r\nConnection: keep-alive\r\n"
+                   + "".join(f"{name}: {value}\r\n" for name, value in (extra_headers or {}).items()) + "\r\n").encode("latin-1")
+
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self.max_connections_per_host))
+        async with limit:
+            # Send the request over an idle connection, if any.  Such a connection may have been closed by the server in the
+            # meantime, in which case the request is sent again over a new connection:
+            while True:
+                reused = bool(self._idle.get(key))
+                reader, writer = self._idle[key].pop() if reused else await self._open_connection(key)
+                reusable = False
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, headers, body, reusable = await self._read_response(reader)
+                    return status, headers, body
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                finally:
+                    if reusable:
+                        self._idle.setdefault(key, []).append((reader, writer))
+                    else:
+                        writer.close()
+
+    @staticmethod
+    async def _open_connection(key):
+        scheme, hostname, port = key
+        return await asyncio.open_connection(hostname, port, ssl=ssl.create_default_context() if scheme == "https" else None)
+
+    @staticmethod
+    async def _read_response(reader):
+        # Read the status line and headers (header names are lower-cased):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server.")
+        try:
+            version, status = status_line.split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise ConnectionError(f"Malformed status line: {status_line[:100]!r}") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        # Read the body, which is either chunked, of a declared length, or ends when the server closes the connection:
+        framed = True
+        if status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            # A body cut short (the connection dropped mid-body) or garbled is reported as a connection error, so that the
+            # request is retried:
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                if not size_line:
+                    raise ConnectionResetError("Connection closed by server in the middle of a chunked body.")
+                try:
+                    size = int(size_line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise ConnectionError(f"Malformed chunk size: {size_line[:100]!r}") from None
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):  # Skip any trailers.
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                if (await reader.readline()) not in (b"\r\n", b"\n"):
+                    raise ConnectionError("Malformed chunked body (chunk not followed by a line break).")
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            framed = False
+
+        # The connection can be reused only if the response was framed and neither side asked for it to be closed:
+        reusable = framed and version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        return status, headers, body, reusable
+
+
+class CircuitBreaker:
+    """Class which stops requests to a host for a while after too many consecutive failures (per-host circuit breaker), so that a failing website is not hammered and the scrape fails fast instead of waiting on every request"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout  # Seconds before a trial request is let through an open circuit
+        self._lock = threading.Lock()
+        self._failures = {}  # Number of consecutive failed requests, per host
+        self._opened_at = {}  # Time at which each open circuit was opened (or last let a trial request through), per host
+
+    def check(self, url):
+        """Function which raises CircuitOpenError if requests to the URL's host are stopped.  Once the reset time-out has passed, a single trial request is let through:  If it succeeds the circuit is closed, otherwise it remains open for another reset time-out"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            now = time.monotonic()
+            if now - opened_at >= self.reset_timeout:
+                self._opened_at[host] = now
+                return
+        metrics.increment("circuit_open_rejections_total")
+        raise CircuitOpenError(f"Requests to {host} are paused after {self.failure_threshold} consecutive failures.")
+
+    def record_failure(self, url):
+        """Function which records a failed request to the URL's host, opening the host's circuit if there have been too many consecutive failures"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+    def record_success(self, url):
+        """Function which records a successful request to the URL's host, closing the host's circuit"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def reset(self):
+        """Function which closes all circuits"""
+        with self._lock:
+            self._failures.clear()
+            self._opened_at.clear()
+
+
+class CircuitOpenError(ConnectionError):
+    """Class of the error raised when a request is not sent because its host's circuit is open (see CircuitBreaker)"""
+
+
+class DriverPool:
+    """Class which maintains a pool of reusable Selenium drivers (browsers), so that a new browser need not be started for every operation"""
+
+    def __init__(self, size, idle_timeout):
+        self.size = size  # Maximum number of drivers open at any time
+        self.idle_timeout = idle_timeout  # Seconds an unused driver is kept open before being closed
+        self._condition = threading.Condition()
+        self._idle = []  # Drivers not in use, as (driver, time released, URL its browser was on) tuples
+        self._in_use = set()
+        self._starting = 0  # Number of drivers currently being started
+        self._reaper = None  # Background thread which closes drivers left unused for too long
+
+    def acquire(self, preferred_url=None):
+        """Function which leases a healthy driver from the pool, preferring one whose browser is already on the preferred URL.  If none is available, a new driver is started (or, if the pool is full, one being released is waited for).  Returns False if a driver could not be started"""
+        while True:
+            expired = []
+            with self._condition:
+                while True:
+                    # Close drivers left unused for too long, then look for an idle driver:
+                    expired += self._evict_idle_locked()
+                    driver = self._take_idle_locked(preferred_url)
+
+                    # Stop looking if an idle driver was found or a new one may be started (the pool is not full).
+                    # Otherwise, wait for a driver to be released:
+                    if driver or len(self._in_use) + self._starting < self.size:
+                        break
+                    self._condition.wait()
+
+                if driver:
+                    self._in_use.add(driver)
+                else:
+                    self._starting += 1
+
+            # Close the drivers removed from the pool (outside of the lock, as closing a browser takes a while):
+            self._quit(expired)
+            if not driver:
+                break
+
+            # Health-check the idle driver taken (outside of the lock, as its browser may be slow to respond).  If its
+            # browser no longer responds, close it and look again:
+            if self._is_healthy(driver):
+                return driver
+            self.release(driver, discard=True)
+
+        # Start a new driver (outside of the lock, as starting a browser takes a while):
+        driver = False
+        try:
+            driver = setup_driver(preferred_url or url_recipe_site, DRIVER_WINDOW_WIDTH, DRIVER_WINDOW_HEIGHT)
+        finally:
+            with self._condition:
+                self._starting -= 1
+                if driver:
+                    self._in_use.add(driver)
+                    self._start_reaper_locked()
+                else:
+                    self._condition.notify()
 
-# DEFINE FUNCTIONS TO BE USED FOR THIS APPLICATION (LISTED IN ALPHABETICAL ORDER BY FUNCTION NAME):
-def get_recipes():
-    """Function used to scrape the recipe website and retrieve all recipes for the selected recipe type"""
-    global selected_recipe_type, selected_recipes
+        return driver
 
-    try:
-        # Capture the selected recipe type:
-        selected_recipe_type_scrape = selected_recipe_type.get()
+    def close_all(self):
+        """Function which closes all drivers of the pool, whether in use or not"""
+        with self._condition:
+            drivers = [entry[0] for entry in self._idle] + list(self._in_use)
+            self._idle.clear()
+            self._in_use.clear()
+            self._condition.notify_all()
+        self._quit(drivers)
+
+    def evict_idle(self):
+        """Function which closes all drivers left unused for longer than the idle timeout"""
+        with self._condition:
+            expired = self._evict_idle_locked()
+        self._quit(expired)
+
+    def release(self, driver, discard=False):
+        """Function which returns a leased driver to the pool.  A driver which is discarded (e.g., after an error), or whose browser no longer responds, is closed instead of being reused"""
+        # Note the URL the driver's browser is on (outside of the lock, as this queries the browser), so that it can be
+        # preferred for that URL:
+        current_url = None
+        if not discard:
+            try:
+                current_url = driver.current_url
+            except Exception:
+                discard = True
+
+        with self._condition:
+            if driver not in self._in_use:
+                return
+            self._in_use.discard(driver)
+            if not discard:
+                self._idle.append((driver, time.monotonic(), current_url))
+            self._condition.notify()
+        if discard:
+            self._quit([driver])
+
+    def _evict_idle_locked(self):
+        # Remove drivers left unused for longer than the idle timeout from the pool.  Return them so they can be closed
+        # once the lock is released:
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [entry[0] for entry in self._idle if entry[1] < cutoff]
+        self._idle = [entry for entry in self._idle if entry[1] >= cutoff]
+        return expired
+
+    @staticmethod
+    def _is_healthy(driver):
+        # A driver is healthy if its browser still responds:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
 
-        # Go to the recipe-type page on the website.  Return the Selenium driver initiated in same for further use in this function.
-        # If an error occurs, return None (does not represent grounds for exiting this application):
-        driver = go_to_recipe_type_page_on_website()
-        if not driver:
+    def _reap(self):
+        # Periodically close drivers left unused for too long, until no drivers remain in the pool:
+        while True:
+            time.sleep(max(self.idle_timeout / 2, 1))
+            self.evict_idle()
+            with self._condition:
+                if not self._idle and not self._in_use and not self._starting:
+                    self._reaper = None
+                    return
+
+    def _start_reaper_locked(self):
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, name="driver-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _take_idle_locked(self, preferred_url):
+        # Take the idle driver last on the preferred URL (if any), otherwise the one most recently used.  No browser is
+        # queried here, so that the lock is only held briefly (the driver is health-checked by acquire):
+        if not self._idle:
+            return None
+        entry = max(self._idle, key=lambda entry: (entry[2] == preferred_url, entry[1]))
+        self._idle.remove(entry)
+        return entry[0]
+
+    @staticmethod
+    def _quit(drivers):
+        # Close each driver's browser, ignoring drivers whose browser has already gone away:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class HostRateLimiter:
+    """Class which spaces requests to the same host at least a minimum interval apart, across all threads"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval  # Seconds between the start of two requests to the same host
+        self._lock = threading.Lock()
+        self._next_request_time = {}  # Earliest time the next request to each host may start
+
+    def wait(self, url):
+        """Function which blocks until a request to the URL's host is allowed to start"""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        """Function which waits (without blocking the asyncio event loop) until a request to the URL's host is allowed to start"""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve(self, url):
+        # Reserve the next available time slot for the host.  Return the number of seconds until that time arrives:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start_time = max(now, self._next_request_time.get(host, now))
+            self._next_request_time[host] = start_time + self.min_interval
+        return start_time - now
+
+
+class HTMLDocumentParser(HTMLParser):
+    """Class which parses an HTML page into a tree of HTMLNode objects, indexing each element by its "id" attribute (and noting its "next page" links)"""
+
+    # Elements which never have content or an end tag:
+    VOID_ELEMENTS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HTMLNode("#document", {}, None)
+        self.elements_by_id = {}
+        self.next_page_links = []  # Links (<a> / <link>) to the page's next page (rel="next"), in document order
+        self._current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        # Attach the new element to the element currently open.  Descend into it, unless it cannot have content:
+        node = self._add_element(tag, attrs)
+        if tag not in self.VOID_ELEMENTS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing element (e.g., "<img />"):  Attach it without descending into it:
+        self._add_element(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # Close the nearest open element with a matching tag.  Stray end tags (no matching open element) are ignored:
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.children.append(data)
+
+    def _add_element(self, tag, attrs):
+        # Attach the new element to the element currently open, and index it by its "id" (first occurrence wins, as in a browser):
+        node = HTMLNode(tag, dict(attrs), self._current)
+        self._current.children.append(node)
+        element_id = node.attrs.get("id")
+        if element_id and element_id not in self.elements_by_id:
+            self.elements_by_id[element_id] = node
+
+        # Note each link to the page's next page (as used by paginated lists):
+        if tag in ("a", "link") and "next" in (node.attrs.get("rel") or "").lower().split():
+            self.next_page_links.append(node)
+        return node
+
+
+class HTMLNode:
+    """Class representing a single element of a parsed HTML page"""
+    __slots__ = ("tag", "attrs", "parent", "children")
+
+    # Elements whose content is never rendered as visible text:
+    NON_TEXT_ELEMENTS = frozenset(("script", "style", "template", "noscript"))
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []  # Child elements (HTMLNode) and text fragments (str), in document order.
+
+    def get_attribute(self, name):
+        """Function which returns the value of an attribute of this element (None if the attribute is not present)"""
+        return self.attrs.get(name)
+
+    def iter(self, tag=None):
+        """Function which yields every element within this element (in document order), optionally only those with a given tag"""
+        pending = [child for child in reversed(self.children) if isinstance(child, HTMLNode)]
+        while pending:
+            node = pending.pop()
+            if tag is None or node.tag == tag:
+                yield node
+            pending.extend(child for child in reversed(node.children) if isinstance(child, HTMLNode))
+
+    @property
+    def text(self):
+        """Function which returns the visible text of this element, with whitespace collapsed (as Selenium's "text" does)"""
+        parts = []
+        pending = [self]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.tag not in self.NON_TEXT_ELEMENTS:
+                pending.extend(reversed(item.children))
+
+        return " ".join("".join(parts).split())
+
+
+class HTTPStatusError(ConnectionError):
+    """Class of the error raised when the website responds to a request with an unexpected HTTP status code"""
+
+    def __init__(self, url, status, retry_after=None):
+        super().__init__(f"HTTP status {status}: {url}")
+        self.status = status
+        self.retry_after = retry_after  # Value of the response's "Retry-After" header, if any
+
+
+class ListExtractor:
+    """Class which captures the fields (e.g., name and link) of each item of a list on a page, as described by a list of a site profile.  Items are elements whose id contains their (1-based) item number; they are visited in item-number order, stopping at the first number not present on the page.  Items missing a field are skipped"""
+
+    def __init__(self, item_id, fields):
+        # Split the item id template (e.g., "mntl-card-list-items_{index}-0") around the item number:
+        if not isinstance(item_id, str) or "{index}" not in item_id:
+            raise ValueError(f'Item id {item_id!r} does not contain "{{index}}".')
+        self.item_id_prefix, _, self.item_id_suffix = item_id.partition("{index}")
+
+        # Compile each field's path, and identify the value captured from the element found there:  Its text ("text"), or
+        # one of its attributes ("@<name>"; links and image sources are made absolute):
+        if not isinstance(fields, dict) or not all(isinstance(field, dict) for field in fields.values()):
+            raise ValueError('"fields" is not an object of fields, each given as {"path": ..., "value": ...}.')
+        self.fields = []
+        for name, field in fields.items():
+            value = field.get("value", "text")
+            if value != "text" and not (isinstance(value, str) and value.startswith("@") and len(value) > 1):
+                raise ValueError(f'Value {value!r} of field "{name}" is neither "text" nor "@<attribute>".')
+            try:
+                self.fields.append((name, compile_node_path(field.get("path", "")), field.get("path", ""), value))
+            except ValueError as err:
+                raise ValueError(f'Field "{name}":  {err}') from err
+
+        # Generate the JavaScript which captures all items in a single WebDriver round trip, and the JavaScript which counts
+        # the items (Selenium fetch backend):
+        self.script = self._generate_script()
+        self.count_script = (f"var i = 1; while (document.getElementById({json.dumps(self.item_id_prefix)} + i + {json.dumps(self.item_id_suffix)})) i++; "
+                             "return i - 1;")
+
+    def extract(self, document, page_url):
+        """Function which captures the fields of each item on a parsed page.  Returns a list of dictionaries of field name -> value"""
+        rows = []
+        i = 1   # Item-number variable
+        while True:
+            item = document.elements_by_id.get(self.item_id_prefix + str(i) + self.item_id_suffix)
+            if item is None:
+                break
+
+            row = {}
+            for name, steps, _, value in self.fields:
+                element = find_node_at_path(item, steps)
+                if element is None:
+                    break
+                if value == "text":
+                    row[name] = element.text
+                elif value in ("@href", "@src"):
+                    row[name] = urljoin(page_url, element.get_attribute(value[1:]) or "")
+                else:
+                    row[name] = element.get_attribute(value[1:])
+            else:
+                rows.append(row)
+
+            i += 1
+
+        return rows
+
+    def extract_from_driver(self, driver):
+        """Function which captures the fields of each item on the page currently loaded in a Selenium driver, using a single WebDriver round trip (once the first item is present).  Returns a list of dictionaries of field name -> value"""
+        self.wait_in_driver(driver)
+        field_names = [name for name, *_ in self.fields]
+        return [dict(zip(field_names, values)) for values in (driver.execute_script(self.script) or [])]
+
+    def wait_in_driver(self, driver, timeout=DRIVER_ELEMENT_WAIT_TIMEOUT):
+        """Function which waits until the first item of the list is present on the page currently loaded in a Selenium driver (pages are handed over before they have fully loaded; see DRIVER_PROFILE_LEAN).  Returns False if it has not appeared in time (e.g., the list is empty)"""
+        return wait_for_element_in_driver(driver, f'//*[@id="{self.item_id_prefix}1{self.item_id_suffix}"]', timeout, clickable=False) is not None
+
+    def _generate_script(self):
+        lines = ["var results = [];",
+                 "for (var i = 1; ; i++) {",
+                 f"    var item = document.getElementById({json.dumps(self.item_id_prefix)} + i + {json.dumps(self.item_id_suffix)});",
+                 "    if (!item) break;",
+                 "    var row = [], node;"]
+        for _, _, path, value in self.fields:
+            lines.append(f"    node = document.evaluate({json.dumps(path)}, item, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;" if path else "    node = item;")
+            lines.append("    if (!node) continue;")
+            if value == "text":
+                lines.append("    row.push(node.innerText.trim());")
+            elif value in ("@href", "@src"):
+                lines.append(f"    row.push(node.{value[1:]});")
+            else:
+                lines.append(f"    row.push(node.getAttribute({json.dumps(value[1:])}));")
+        lines += ["    results.push(row);", "}", "return results;"]
+        return "\n".join(lines)
+
+
+class Metrics:
+    """Class which collects counters (e.g., pages fetched) and latency histograms (e.g., time taken by each stage of scraping), and exposes them in the Prometheus text format"""
+
+    def __init__(self, prefix, latency_buckets):
+        self.prefix = prefix  # Prefix of every metric name
+        self.latency_buckets = latency_buckets  # Upper bounds (seconds) of the histogram buckets, in increasing order
+        self._lock = threading.Lock()
+        self._counters = {}  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [count per bucket (the last one being unbounded), sum of the values]
+
+    def increment(self, name, value=1, **labels):
+        """Function which adds a value to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Function which records a value (e.g., a latency in seconds) in a histogram"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.latency_buckets) + 1), 0.0]
+            histogram[0][bisect.bisect_left(self.latency_buckets, value)] += 1
+            histogram[1] += value
+
+    def render_prometheus(self):
+        """Function which returns all metrics in the Prometheus text format"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {self.prefix}{name} counter")
+                    typed.add(name)
+                lines.append(f"{self.prefix}{name}{self._format_labels(labels)} {value}")
+            for (name, labels), (bucket_counts, total) in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {self.prefix}{name} histogram")
+                    typed.add(name)
+                cumulative_count = 0
+                for upper_bound, count in zip(self.latency_buckets + ("+Inf",), bucket_counts):
+                    cumulative_count += count
+                    lines.append(f"{self.prefix}{name}_bucket{self._format_labels(labels + (('le', upper_bound),))} {cumulative_count}")
+                lines.append(f"{self.prefix}{name}_sum{self._format_labels(labels)} {total}")
+                lines.append(f"{self.prefix}{name}_count{self._format_labels(labels)} {cumulative_count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Function which clears all metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def serve(self, port):
+        """Function which serves the metrics (Prometheus text format) at http://<host>:<port>/metrics from a background thread.  Returns the server"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # Keep the console free of request logging.
+                pass
+
+        server = ThreadingHTTPServer(("", port), MetricsRequestHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+    def snapshot(self):
+        """Function which returns all metrics as a dictionary:  Counters as "name{labels}" -> value, and histograms as "name{labels}" -> count, sum and count per bucket upper bound"""
+        with self._lock:
+            counters = {name + self._format_labels(labels): value for (name, labels), value in self._counters.items()}
+            histograms = {name + self._format_labels(labels): {"count": sum(bucket_counts), "sum": total, "buckets": dict(zip(self.latency_buckets + ("+Inf",), bucket_counts))}
+                          for (name, labels), (bucket_counts, total) in self._histograms.items()}
+        return {"counters": counters, "histograms": histograms}
+
+    @contextlib.contextmanager
+    def timer(self, stage, **labels):
+        """Function which times the code run within a "with" block, recording its duration in the histogram of the given stage of scraping (e.g., "page_load")"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+    def write_prometheus(self, file_path):
+        """Function which writes all metrics (Prometheus text format) to a file"""
+        with open(file_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(self.render_prometheus())
+
+    @staticmethod
+    def _format_labels(labels):
+        return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}" if labels else ""
+
+
+class NodeLocator:
+    """Class which locates an element of a page, as described by a site profile:  The element with a given id, followed by a relative, positional XPath-style path (e.g., "div[1]/ul/li[2]/a") from it"""
+
+    def __init__(self, element_id, path=""):
+        if not isinstance(element_id, str) or not element_id:
+            raise ValueError(f"Element id {element_id!r} is not a non-empty string.")
+        self.element_id = element_id
+        self.steps = compile_node_path(path)
+        self.xpath = f'//*[@id="{element_id}"]' + ("/" + path if path else "")  # Equivalent XPath (Selenium fetch backend)
+
+    @classmethod
+    def compile_steps(cls, steps):
+        """Function which compiles a list of steps of a site profile (e.g., navigation links followed in turn), each given as {"element_id": ..., "path": ...}.  Returns a list of NodeLocator"""
+        if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+            raise ValueError(f'{json.dumps(steps)} is not a list of steps, each given as {{"element_id": ..., "path": ...}}.')
+        return [cls(step["element_id"], step.get("path", "")) for step in steps]
+
+    def find(self, document):
+        """Function which returns the element located on a parsed page (None if no such element exists)"""
+        element = document.elements_by_id.get(self.element_id)
+        return find_node_at_path(element, self.steps) if element is not None else None
+
+
+class OutputSink:
+    """Class which is the common interface of the outputs (sinks) to which rows (dictionaries) are written as they are produced:  Files (see RecipeWriter), SQLite databases (see SQLiteSink) and Parquet files (see ParquetSink).  Rows can be written sorted, in which case they are held (beyond sort_buffer_rows rows, in sorted runs spilled to temporary files) until the sink is closed.  Sinks are opened by open_recipe_sink, according to the output file's extension"""
+
+    def __init__(self, file_path, sort_key=None, sort_buffer_rows=SORT_BUFFER_ROWS):
+        self.file_path = file_path
+        self.sort_key = sort_key  # If given, rows are written in the order of this key once the sink is closed
+        self.sort_buffer_rows = sort_buffer_rows
+        self.rows_written = 0
+        self._sort_buffer = []  # Rows not yet sorted
+        self._sort_runs = []  # Temporary files each holding a sorted run of rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Function which writes any rows held for sorting, then closes the sink"""
+        try:
+            # Merge the sorted runs spilled to temporary files with the rows still in memory:
+            if self.sort_key is not None:
+                self._sort_buffer.sort(key=self.sort_key)
+                for row in heapq.merge(*(self._read_run(run) for run in self._sort_runs), self._sort_buffer, key=self.sort_key):
+                    self._write_row(row)
+                self._sort_buffer = []
+        finally:
+            for run in self._sort_runs:
+                run.close()
+            self._sort_runs = []
+            self._close_output()
+
+    def write(self, row):
+        """Function which writes a row to the sink (or, if the sink is sorted, holds it until the sink is closed)"""
+        if self.sort_key is None:
+            self._write_row(row)
+            return
+
+        # Hold the row for sorting.  Once too many rows are held, sort them and spill them to a temporary file:
+        self._sort_buffer.append(row)
+        if len(self._sort_buffer) >= self.sort_buffer_rows:
+            self._sort_buffer.sort(key=self.sort_key)
+            run = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+            for held_row in self._sort_buffer:
+                run.write(json.dumps(held_row) + "\n")
+            run.seek(0)
+            self._sort_runs.append(run)
+            self._sort_buffer = []
+
+    def _close_output(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _read_run(run):
+        for line in run:
+            yield json.loads(line)
+
+    def _write_row(self, row):
+        raise NotImplementedError
+
+
+class PageCache:
+    """Class which keeps downloaded pages in an SQLite database on disk (keyed by URL), along with the validators (ETag / Last-Modified) needed to revalidate them with the website"""
+
+    def __init__(self, path, ttl, max_bytes):
+        self.path = path
+        self.ttl = ttl  # Seconds a cached page is used without revalidation
+        self.max_bytes = max_bytes  # Maximum total size of the cached pages
+        self._connection = None  # Opened on first use
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Function which removes all pages from the cache"""
+        with self._lock:
+            self._connect().execute("DELETE FROM pages")
+            self._connection.execute("UPDATE cache_size SET total = 0")
+            self._connection.commit()
+
+    def get(self, url):
+        """Function which returns the cached entry for a URL (a dictionary with keys final_url, html, etag, last_modified and fresh), or None if the URL is not cached"""
+        with self._lock:
+            row = self._connect().execute("SELECT final_url, html, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+
+            # Record the access, so that recently used pages are the last to be evicted:
+            self._connection.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._connection.commit()
+
+        final_url, html, etag, last_modified, fetched_at = row
+        return {"final_url": final_url, "html": html, "etag": etag, "last_modified": last_modified, "fresh": time.time() - fetched_at < self.ttl}
+
+    def put(self, url, final_url, html, etag=None, last_modified=None):
+        """Function which adds (or replaces) a page in the cache, then evicts the least recently used pages if the cache has grown too large"""
+        now = time.time()
+        size = len(html.encode("utf-8"))
+        with self._lock:
+            # Keep the total size of the cache up to date (in the same transaction, so that it remains correct when the cache
+            # is shared by several processes), so that it never needs to be summed over the whole cache:
+            self._connect().execute("UPDATE cache_size SET total = total + ? - COALESCE((SELECT size FROM pages WHERE url = ?), 0)", (size, url))
+            self._connection.execute("INSERT OR REPLACE INTO pages (url, final_url, html, etag, last_modified, fetched_at, last_access, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     (url, final_url, html, etag, last_modified, now, now, size))
+            self._evict_locked()
+            self._connection.commit()
+
+    def revalidated(self, url):
+        """Function which marks a cached page as fresh again (the website has confirmed that it has not changed)"""
+        with self._lock:
+            self._connect().execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?", (time.time(), time.time(), url))
+            self._connection.commit()
+
+    def _connect(self):
+        # Open the database (creating it if needed) on first use.  The connection is shared by all threads (access to it is
+        # serialized by the lock):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, final_url TEXT, html TEXT, etag TEXT, last_modified TEXT, fetched_at REAL, last_access REAL, size INTEGER)")
+
+            # Index the pages in least-recently-used order, along with their size, so that eviction reads sizes from the index
+            # rather than from the pages (whose size column is stored after their large HTML):
+            self._connection.execute("DROP INDEX IF EXISTS pages_last_access")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages (last_access, size)")
+
+            # Total size of the cached pages (computed once, when the cache is created or was created without it):
+            self._connection.execute("CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER)")
+            self._connection.execute("INSERT OR IGNORE INTO cache_size (id, total) VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM pages))")
+            self._connection.commit()
+        return self._connection
+
+    def _evict_locked(self):
+        # Remove the least recently used pages until the total size of the cache is within its limit:
+        excess = self._connection.execute("SELECT total FROM cache_size").fetchone()[0] - self.max_bytes
+        while excess > 0:
+            rows = self._connection.execute("SELECT rowid, size FROM pages ORDER BY last_access LIMIT 100").fetchall()
+            if not rows:
+                break
+            for rowid, size in rows:
+                self._connection.execute("DELETE FROM pages WHERE rowid = ?", (rowid,))
+                self._connection.execute("UPDATE cache_size SET total = total - ?", (size,))
+                excess -= size
+                if excess <= 0:
+                    break
+
+
+class Paginator:
+    """Class which follows a list (e.g., a recipe type's recipes) across several pages, as described by the site profile's pagination for the list:  Through "next page" links (located by the profile, or marked rel="next"), "load more" buttons and/or infinite scrolling (the latter two with the Selenium fetch backend only)"""
+
+    def __init__(self, spec):
+        self.next_page = NodeLocator.compile_steps(spec.get("next_page", []))
+        self.load_more = NodeLocator.compile_steps(spec.get("load_more", []))
+        self.infinite_scroll = bool(spec.get("infinite_scroll", False))
+        self.max_pages = spec.get("max_pages", PAGINATION_MAX_PAGES)
+        if not isinstance(self.max_pages, int) or isinstance(self.max_pages, bool) or self.max_pages < 1:
+            raise ValueError(f'"max_pages" ({self.max_pages!r}) is not a whole number of at least 1.')
+
+    def load_more_in_driver(self, driver, extractor):
+        """Function which loads more items into the page currently loaded in a Selenium driver, by clicking its "load more" button or scrolling to its bottom, then waits for them.  Returns True if more items have appeared"""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        # Trigger the loading of more items.  If the page has no (visible) "load more" button and does not scroll infinitely,
+        # it has no more items:
+        item_count = driver.execute_script(extractor.count_script)
+        buttons = [element for step in self.load_more for element in driver.find_elements(By.XPATH, step.xpath) if element.is_displayed()]
+        if buttons:
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", buttons[0])
+        elif self.infinite_scroll:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        else:
+            return False
+
+        # Wait for more items to appear:
+        try:
+            WebDriverWait(driver, PAGINATION_WAIT_TIMEOUT).until(lambda driver: driver.execute_script(extractor.count_script) > item_count)
+            return True
+        except TimeoutException:
+            return False
+
+    def next_page_url(self, document, page_url):
+        """Function which returns the link to the next page of a parsed page (None if it is the last page)"""
+        links = [step.find(document) for step in self.next_page] + document.next_page_links
+        for link in links:
+            if link is not None and link.get_attribute("href"):
+                return urljoin(page_url, link.get_attribute("href"))
+        return None
+
+    def next_page_url_in_driver(self, driver):
+        """Function which returns the link to the next page of the page currently loaded in a Selenium driver (None if it is the last page)"""
+        from selenium.webdriver.common.by import By
+        for step in self.next_page:
+            for element in driver.find_elements(By.XPATH, step.xpath):
+                if element.get_attribute("href"):
+                    return element.get_attribute("href")
+        return driver.execute_script("var link = document.querySelector('a[rel~=\"next\"], link[rel~=\"next\"]'); return link ? link.href : null;")
+
+
+class ParquetSink(OutputSink):
+    """Class which writes rows (dictionaries) to a Parquet file, in columnar batches (row groups) of OUTPUT_BATCH_ROWS rows, compressed.  Requires the pyarrow package, which is imported on first use"""
+
+    def __init__(self, file_path, table_columns, sort_key=None, sort_buffer_rows=SORT_BUFFER_ROWS, batch_rows=OUTPUT_BATCH_ROWS):
+        super().__init__(file_path, sort_key, sort_buffer_rows)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(PARQUET_MISSING_PACKAGE_MESSAGE) from None
+        self._pyarrow = pyarrow
+        self.table_columns = table_columns
+        self.batch_rows = batch_rows
+        self._batch = [[] for _ in table_columns]  # Values of the rows not yet written, column by column
+
+        # Open the file, declaring the type of each column:
+        types = {"TEXT": pyarrow.string(), "INTEGER": pyarrow.int64(), "REAL": pyarrow.float64()}
+        self._schema = pyarrow.schema([(name, types[column_type]) for name, column_type, _ in table_columns])
+        self._writer = pyarrow.parquet.ParquetWriter(file_path, self._schema, compression=PARQUET_COMPRESSION)
+
+    def _close_output(self):
+        try:
+            self._write_batch()
+        finally:
+            self._writer.close()
+
+    def _write_batch(self):
+        if self._batch[0]:
+            self._writer.write_batch(self._pyarrow.record_batch(self._batch, schema=self._schema))
+            self._batch = [[] for _ in self.table_columns]
+
+    def _write_row(self, row):
+        for values, (_, _, value) in zip(self._batch, self.table_columns):
+            values.append(value(row))
+        self.rows_written += 1
+        if len(self._batch[0]) >= self.batch_rows:
+            self._write_batch()
+
+
+class Recipe:
+    """Class representing a single recipe held by a recipe store (see RecipeStore)"""
+    __slots__ = ("id", "recipe_type", "name", "url")
+
+    def __init__(self, recipe_id, recipe_type, name, url):
+        self.id = recipe_id
+        self.recipe_type = recipe_type
+        self.name = name
+        self.url = url
+
+    def __repr__(self):
+        return f"Recipe({self.id!r}, {self.recipe_type!r}, {self.name!r}, {self.url!r})"
+
+
+class RecipeListProgress:
+    """Class which records the progress made through a recipe type's pages:  The recipes captured so far and the next page to be scraped, so that if a fetch backend fails part way, the fallback resumes from the page at which it failed (see scrape_recipes)"""
+
+    def __init__(self):
+        self.recipes = {}  # Recipes captured so far (recipe link -> name)
+        self.next_url = None  # Link to the next page to be scraped (None until the first page has been scraped, and once the last one has)
+        self.page_count = 0  # Number of pages scraped so far
+
+
+class RecipeSearchIndex:
+    """Class which indexes the recipes held by a recipe store for searching:  An inverted index from each word (token) of the recipes' names and, once captured, details (ingredients) to the recipes containing it.  Recipes added to the store are indexed on the next search (incrementally, as the store only grows).  Searches match every word of the query, the last word also as a prefix (search as you type), optionally within a recipe type"""
+
+    def __init__(self, store):
+        self.store = store
+        self._postings = {}  # Token -> positions (in the store) of the recipes containing it
+        self._tokens_sorted = []  # Every token, sorted (for prefix lookups)
+        self._tokens_sorted_count = 0  # Number of tokens included in _tokens_sorted
+        self._indexed_count = 0  # Number of the store's recipes indexed so far
+        self._name_ranks_source = None  # Name order of the store from which _name_ranks_cache was computed
+        self._name_ranks_cache = array("L")
+        self._lock = threading.Lock()
+
+    def add_details(self, url, details):
+        """Function which indexes the details (ingredients) captured for a recipe held by the store"""
+        self.update()
+        position = self.store.position(url)
+        if position is None:
+            return
+        with self._lock:
+            self._add_tokens(position, tokenize_text(" ".join(details.get("ingredients") or [])))
+
+    def complete(self, prefix, limit=10):
+        """Function which returns the indexed words starting with a prefix (autocompletion), the most frequent first"""
+        self.update()
+        with self._lock:
+            tokens = self._tokens_with_prefix("".join(tokenize_text(prefix)[-1:]))
+            return sorted(tokens, key=lambda token: (-len(self._postings[token]), token))[:limit]
+
+    def search(self, query, recipe_type=None, limit=None):
+        """Function which returns the recipes matching every word of a query (the last word also as a prefix), optionally only those listed under a recipe type, sorted by name"""
+        self.update()
+        tokens = tokenize_text(query)
+        if not tokens:
+            return []
+
+        # Find the recipes containing each word (for the last word, any word it is a prefix of), starting with the rarest
+        # word and narrowing down from there:
+        with self._lock:
+            matches = [self._postings.get(token, ()) for token in tokens[:-1]]
+            matches.append(set().union(*(self._postings[token] for token in self._tokens_with_prefix(tokens[-1]))))
+        matches.sort(key=len)
+        positions = set(matches[0])
+        for postings in matches[1:]:
+            if not positions:
+                break
+            positions.intersection_update(postings)
+        if recipe_type is not None:
+            positions.intersection_update(self.store.positions(recipe_type))
+
+        # Sort the matches by name, using each recipe's rank in the name order (only the recipes returned are retrieved):
+        name_ranks = self._name_ranks()
+        if limit is not None:
+            positions = heapq.nsmallest(limit, positions, key=name_ranks.__getitem__)
+        else:
+            positions = sorted(positions, key=name_ranks.__getitem__)
+        return [self.store[position] for position in positions]
+
+    def update(self):
+        """Function which indexes the names of the recipes added to the store since the last update"""
+        with self._lock:
+            for position in range(self._indexed_count, len(self.store)):
+                self._add_tokens(position, tokenize_text(self.store[position].name))
+            self._indexed_count = max(self._indexed_count, len(self.store))
+
+    def _add_tokens(self, position, tokens):
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = array("L")
+                self._tokens_sorted_count = -1  # New token:  The sorted tokens are out of date
+            if not postings or postings[-1] != position:
+                postings.append(position)
+
+    def _name_ranks(self):
+        # Rank (position in the name order) of each recipe, updated along with the store's name order:
+        positions_by_name = self.store.positions_by_name()
+        if positions_by_name is not self._name_ranks_source:
+            name_ranks = array("L", [0]) * len(positions_by_name)
+            for rank, position in enumerate(positions_by_name):
+                name_ranks[position] = rank
+            self._name_ranks_source, self._name_ranks_cache = positions_by_name, name_ranks
+        return self._name_ranks_cache
+
+    def _tokens_with_prefix(self, prefix):
+        # Include the tokens added since the last lookup in the sorted tokens (sorted again only when needed):
+        if self._tokens_sorted_count != len(self._postings):
+            self._tokens_sorted = sorted(self._postings)
+            self._tokens_sorted_count = len(self._postings)
+        start = bisect.bisect_left(self._tokens_sorted, prefix)
+        end = bisect.bisect_left(self._tokens_sorted, prefix + "\U0010ffff")
+        return self._tokens_sorted[start:end]
+
+
+class RecipeStore:
+    """Class which holds recipes (name, link and recipe type) in memory compactly:  Names and links are packed as UTF-8 into a single byte array instead of being kept as separate string objects, links' site prefixes and recipe types are stored once each, and links are indexed by a 64-bit hash (open addressing) so that duplicates are detected in constant time.  Each recipe's id is derived from its link, so it is stable across runs.  Recipes can be looked up by id, link, recipe type or name prefix"""
+
+    # Define the initial number of slots of the link index (a power of 2; doubled whenever it becomes half full):
+    INITIAL_INDEX_SLOTS = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def __contains__(self, url):
+        return self._find_slot(url_hash(url), url)[1] >= 0
+
+    def __getitem__(self, position):
+        return self._recipe(position)
+
+    def __iter__(self):
+        return (self._recipe(index) for index in range(len(self)))
+
+    def __len__(self):
+        return len(self._recipe_type_ids)
+
+    def add(self, recipe_type, name, url):
+        """Function which adds a recipe, unless a recipe with the same link is already held (e.g., under another recipe type, which the recipe is then also listed under).  Returns the recipe's id"""
+        with self._lock:
+            return self._add(recipe_type, name, url)
+
+    def add_many(self, recipe_type, recipes):
+        """Function which adds the recipes (a dictionary of recipe link -> name) scraped for a recipe type (see add).  Returns the number of recipes added (not already held)"""
+        with self._lock:
+            count = len(self)
+            for url, name in recipes.items():
+                self._add(recipe_type, name, url)
+            return len(self) - count
+
+    def by_recipe_type(self, recipe_type):
+        """Function which returns the recipes listed under a recipe type, in the order they were added"""
+        recipe_type_id = self._recipe_type_index.get(recipe_type)
+        return [] if recipe_type_id is None else [self._recipe(index) for index in self._recipes_by_type[recipe_type_id]]
+
+    def clear(self):
+        """Function which removes every recipe"""
+        self._text = bytearray()  # Each recipe's name, then its link (less its site prefix), as UTF-8
+        self._text_offsets = array("Q", [0])  # Start of each recipe's name and link in _text (plus the end of the last one)
+        self._recipe_type_ids = array("H")  # Recipe type under which each recipe was first added (index into _recipe_types)
+        self._url_prefix_ids = array("H")  # Site prefix of each recipe's link (index into _url_prefixes)
+        self._recipe_types = []
+        self._recipe_type_index = {}
+        self._recipes_by_type = []  # For each recipe type, the recipes listed under it (array of recipe indexes)
+        self._other_listings = set()  # (Recipe type, recipe index) of each recipe also listed under another recipe type
+        self._url_prefixes = []
+        self._url_prefix_index = {}
+        self._slot_hashes = array("Q", bytes(8 * self.INITIAL_INDEX_SLOTS))  # Link index:  Hash of each slot's link...
+        self._slot_recipes = array("l", [-1]) * self.INITIAL_INDEX_SLOTS  # ...and its recipe index (-1 for an empty slot)
+        self._names_sorted = array("L")  # Recipe indexes sorted by name (case-insensitively), for prefix lookups
+        self._names_sorted_count = 0  # Number of recipes included in _names_sorted
+
+    def get(self, recipe_id):
+        """Function which returns the recipe with a given id (None if there is no such recipe)"""
+        with contextlib.suppress(ValueError):
+            hash_value = int(recipe_id, 16)
+            mask = len(self._slot_recipes) - 1
+            slot = hash_value & mask
+            while self._slot_recipes[slot] >= 0:
+                if self._slot_hashes[slot] == hash_value:
+                    return self._recipe(self._slot_recipes[slot])
+                slot = (slot + 1) & mask
+        return None
+
+    def find(self, url):
+        """Function which returns the recipe with a given link (None if there is no such recipe)"""
+        index = self._find_slot(url_hash(url), url)[1]
+        return self._recipe(index) if index >= 0 else None
+
+    def position(self, url):
+        """Function which returns the position (in the order added) of the recipe with a given link (None if there is no such recipe)"""
+        index = self._find_slot(url_hash(url), url)[1]
+        return index if index >= 0 else None
+
+    def positions(self, recipe_type):
+        """Function which returns the positions (in the order added) of the recipes listed under a recipe type"""
+        recipe_type_id = self._recipe_type_index.get(recipe_type)
+        return self._recipes_by_type[recipe_type_id] if recipe_type_id is not None else array("L")
+
+    def recipe_types(self):
+        """Function which returns the recipe types under which recipes are listed"""
+        return list(self._recipe_types)
+
+    def positions_by_name(self):
+        """Function which returns the positions (in the order added) of all recipes, sorted by name (case-insensitively)"""
+        # Include the recipes added since the last lookup in the name order (sorted again only when needed):
+        with self._lock:
+            if self._names_sorted_count != len(self):
+                self._names_sorted = array("L", sorted(range(len(self)), key=self._sort_name))
+                self._names_sorted_count = len(self)
+            return self._names_sorted
+
+    def search_prefix(self, prefix, recipe_type=None, limit=None):
+        """Function which returns the recipes whose name starts with a prefix (case-insensitively), optionally only those listed under a recipe type, sorted by name"""
+        names_sorted = self.positions_by_name()
+        prefix = prefix.casefold()
+        type_recipes = None
+        if recipe_type is not None:
+            recipe_type_id = self._recipe_type_index.get(recipe_type)
+            type_recipes = set(self._recipes_by_type[recipe_type_id]) if recipe_type_id is not None else set()
+
+        results = []
+        for position in range(bisect.bisect_left(names_sorted, prefix, key=self._sort_name), len(names_sorted)):
+            index = names_sorted[position]
+            if not self._sort_name(index).startswith(prefix):
+                break
+            if type_recipes is None or index in type_recipes:
+                results.append(self._recipe(index))
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def _add(self, recipe_type, name, url):
+        # Identify the recipe type (stored once):
+        recipe_type_id = self._recipe_type_index.get(recipe_type)
+        if recipe_type_id is None:
+            recipe_type_id = self._recipe_type_index[recipe_type] = len(self._recipe_types)
+            self._recipe_types.append(sys.intern(recipe_type))
+            self._recipes_by_type.append(array("L"))
+
+        # If the link is already held, only list the recipe under the recipe type (if not already listed):
+        hash_value = url_hash(url)
+        slot, index = self._find_slot(hash_value, url)
+        if index >= 0:
+            if self._recipe_type_ids[index] != recipe_type_id and (recipe_type_id, index) not in self._other_listings:
+                self._other_listings.add((recipe_type_id, index))
+                self._recipes_by_type[recipe_type_id].append(index)
+            return format(hash_value, "016x")
+
+        # Split the link into its site prefix (stored once) and the rest:
+        split = url.find("/", url.find("//") + 2) if "//" in url else 0
+        split = split if split >= 0 else len(url)
+        prefix_id = self._url_prefix_index.get(url[:split])
+        if prefix_id is None:
+            prefix_id = self._url_prefix_index[url[:split]] = len(self._url_prefixes)
+            self._url_prefixes.append(url[:split])
+
+        # Append the recipe:
+        index = len(self)
+        self._text += (name or "").encode("utf-8")
+        self._text_offsets.append(len(self._text))
+        self._text += url[split:].encode("utf-8")
+        self._text_offsets.append(len(self._text))
+        self._url_prefix_ids.append(prefix_id)
+        self._recipe_type_ids.append(recipe_type_id)  # Last, as this makes the recipe visible to readers (see __len__)
+        self._recipes_by_type[recipe_type_id].append(index)
+
+        # Index its link, enlarging the index once it is half full (so that lookups remain short):
+        self._slot_hashes[slot] = hash_value
+        self._slot_recipes[slot] = index
+        if len(self) * 2 > len(self._slot_recipes):
+            self._grow_index()
+        return format(hash_value, "016x")
+
+    def _find_slot(self, hash_value, url):
+        # Probe the link index from the hash's home slot until the link or an empty slot is found.  Returns the slot and the
+        # recipe index (-1 if the link is not held, in which case the slot is where it would go):
+        mask = len(self._slot_recipes) - 1
+        slot = hash_value & mask
+        while True:
+            index = self._slot_recipes[slot]
+            if index < 0 or (self._slot_hashes[slot] == hash_value and self._url(index) == url):
+                return slot, index
+            slot = (slot + 1) & mask
+
+    def _grow_index(self):
+        slot_hashes, slot_recipes = self._slot_hashes, self._slot_recipes
+        size = len(slot_recipes) * 2
+        self._slot_hashes = array("Q", bytes(8 * size))
+        self._slot_recipes = array("l", [-1]) * size
+        for hash_value, index in zip(slot_hashes, slot_recipes):
+            if index >= 0:
+                slot = hash_value & (size - 1)
+                while self._slot_recipes[slot] >= 0:
+                    slot = (slot + 1) & (size - 1)
+                self._slot_hashes[slot] = hash_value
+                self._slot_recipes[slot] = index
+
+    def _name(self, index):
+        return self._text[self._text_offsets[2 * index]:self._text_offsets[2 * index + 1]].decode("utf-8")
+
+    def _recipe(self, index):
+        url = self._url(index)
+        return Recipe(format(url_hash(url), "016x"), self._recipe_types[self._recipe_type_ids[index]], self._name(index), url)
+
+    def _sort_name(self, index):
+        return self._name(index).casefold()
+
+    def _url(self, index):
+        return self._url_prefixes[self._url_prefix_ids[index]] + self._text[self._text_offsets[2 * index + 1]:self._text_offsets[2 * index + 2]].decode("utf-8")
+
+
+class RecipeWriter(OutputSink):
+    """Class which writes rows (dictionaries) to a CSV or JSON Lines file as they are produced, optionally gzip-compressed and/or sorted.  Unsorted rows are flushed to the file as they are written, so that partial results survive a crash"""
+
+    def __init__(self, file_path, csv_columns, sort_key=None, sort_buffer_rows=SORT_BUFFER_ROWS):
+        super().__init__(file_path, sort_key, sort_buffer_rows)
+        self.csv_columns = csv_columns  # Columns written to a CSV file (a JSON Lines file contains the rows as they are)
+
+        # Identify the file's format and compression from its name, then open it:
+        compressed = file_path.lower().endswith(".gz")
+        self.file_format = FILE_FORMAT_JSONL if re.search(r"\.jsonl?(\.gz)?$", file_path.lower()) else FILE_FORMAT_CSV
+        self._file = (gzip.open if compressed else open)(file_path, mode="wt", newline="", encoding="utf-8")
+        self._flush_interval = 100 if compressed else 1  # Rows between flushes (flushing compressed output too often hurts compression)
+
+        # Write the column headers of a CSV file:
+        if self.file_format == FILE_FORMAT_CSV:
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow([header for header, _ in csv_columns])
+
+    def _close_output(self):
+        self._file.close()
+
+    def _write_row(self, row):
+        if self.file_format == FILE_FORMAT_CSV:
+            self._csv_writer.writerow([value(row) for _, value in self.csv_columns])
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+        self.rows_written += 1
+        if self.rows_written % self._flush_interval == 0:
+            self._file.flush()
+
+
+class RetryPolicy:
+    """Class which retries requests failing with a transient error (see is_transient_error), waiting an exponentially increasing, random time between attempts, and keeps the circuit breaker of each host informed of the outcome"""
+
+    def __init__(self, max_attempts, backoff_base, backoff_max, circuit_breaker):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base  # Seconds
+        self.backoff_max = backoff_max  # Seconds
+        self.circuit_breaker = circuit_breaker
+        self.retries = 0  # Number of requests retried so far
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt, err=None):
+        """Function which returns the number of seconds to wait after the given (failed) attempt:  The wait requested by the website ("Retry-After", in seconds) if any, otherwise a random time of up to backoff_base * 2^(attempt - 1) seconds"""
+        retry_after = getattr(err, "retry_after", None)
+        if retry_after is None and isinstance(err, urllib.error.HTTPError):
+            retry_after = err.headers.get("Retry-After")
+        try:
+            return min(self.backoff_max, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def call(self, url, request):
+        """Function which calls request() (which sends a request to the URL) until it succeeds, returning its result.  The last error is raised if the error is permanent, all attempts have failed, or the host's circuit is open"""
+        for attempt in range(1, self.max_attempts + 1):
+            self.circuit_breaker.check(url)
+            try:
+                result = request()
+            except Exception as err:
+                delay = self._handle_failure(url, attempt, err)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            else:
+                self.circuit_breaker.record_success(url)
+                return result
+
+    async def call_async(self, url, request):
+        """Function which awaits request() (which sends a request to the URL) until it succeeds, without blocking the asyncio event loop while waiting between attempts (see call)"""
+        for attempt in range(1, self.max_attempts + 1):
+            self.circuit_breaker.check(url)
+            try:
+                result = await request()
+            except Exception as err:
+                delay = self._handle_failure(url, attempt, err)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                self.circuit_breaker.record_success(url)
+                return result
+
+    def _handle_failure(self, url, attempt, err):
+        # A permanent error (e.g., page not found) is not retried.  As the website did respond, it does not count against
+        # the host's circuit either.  Nor does the death of a Selenium driver's browser (the driver is discarded by the caller):
+        if not is_transient_error(err):
+            metrics.increment("fetch_errors_total", kind="driver" if is_driver_failure_error(err) else "permanent")
             return None
 
-        # Loop through all recipe types at the target website.  Search for the recipe type that the user has selected:
-        additional_searching_needed = True    # Proceed with searching.
-        i = 1   # Element-counter variable
-        while additional_searching_needed:
+        # A transient error counts against the host's circuit, and is retried unless all attempts have been made.  Return the
+        # number of seconds to wait before the next attempt (None if there is none):
+        metrics.increment("fetch_errors_total", kind="transient")
+        self.circuit_breaker.record_failure(url)
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff_delay(attempt, err)
+        with self._lock:
+            self.retries += 1
+        metrics.increment("retries_total")
+        update_system_log("retry", f"Attempt {attempt} of {self.max_attempts} failed ({err!r}), retrying in {delay:.1f} s", level="warning", url=url)
+        return delay
+
+
+class ScrapeStateStore:
+    """Class which records, in an SQLite database on disk, the recipes seen by previous runs along with fingerprints of their content, so that a run can report (and process) only what has changed since.  It also keeps the recipe types last scraped from each website, so that the GUI can list them at once on start-up"""
+
+    # Define the kinds of change reported by a run:
+    CHANGE_ADDED = "added"
+    CHANGE_CHANGED = "changed"
+    CHANGE_REMOVED = "removed"
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None  # Opened on first use
+        self._lock = threading.Lock()
+
+    def apply(self, recipe_type, recipes, complete=True):
+        """Function which compares the recipes just scraped for a recipe type (a dictionary of recipe link -> name) with those previously seen, records the new state, and returns the differences as a list of rows (dictionaries with keys change, recipe_type, name and url).  If complete is False (only some of the recipe type's pages were scraped), the recipes not scraped are kept rather than reported as removed"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            previous = {url: (name, fingerprint) for url, name, fingerprint in
+                        connection.execute("SELECT url, name, fingerprint FROM recipes WHERE recipe_type = ?", (recipe_type,))}
+
+            # Recipes are identified by their link (within their recipe type; a recipe may be listed under several).  A recipe whose fingerprint differs from the one previously seen has changed:
+            delta = []
+            current = {}
+            for url, name in recipes.items():
+                fingerprint = fingerprint_recipe(name)
+                current[url] = fingerprint
+                if url not in previous:
+                    delta.append({"change": self.CHANGE_ADDED, "recipe_type": recipe_type, "name": name, "url": url})
+                elif previous[url][1] != fingerprint:
+                    delta.append({"change": self.CHANGE_CHANGED, "recipe_type": recipe_type, "name": name, "url": url})
+            for url, (name, _) in previous.items() if complete else ():
+                if url not in current:
+                    delta.append({"change": self.CHANGE_REMOVED, "recipe_type": recipe_type, "name": name, "url": url})
+
+            # Record the new state (in a single transaction):
+            with connection:
+                connection.executemany("INSERT INTO recipes (url, recipe_type, name, fingerprint, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?) "
+                                       "ON CONFLICT (recipe_type, url) DO UPDATE SET name = excluded.name, fingerprint = excluded.fingerprint, last_seen = excluded.last_seen",
+                                       [(url, recipe_type, name, current[url], now, now) for url, name in recipes.items()])
+                connection.executemany("DELETE FROM recipes WHERE url = ? AND recipe_type = ?",
+                                       [(row["url"], recipe_type) for row in delta if row["change"] == self.CHANGE_REMOVED])
+
+        return delta
+
+    def apply_details(self, url, details):
+        """Function which records the fingerprint of a recipe's details.  Returns True if the details differ from those previously seen (or were never seen before)"""
+        fingerprint = fingerprint_recipe(json.dumps({key: value for key, value in details.items() if key != "url"}, sort_keys=True))
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT details_fingerprint FROM recipes WHERE url = ? LIMIT 1", (url,)).fetchone()
+            with connection:
+                connection.execute("UPDATE recipes SET details_fingerprint = ? WHERE url = ?", (fingerprint, url))
+        return row is None or row[0] != fingerprint
+
+    def is_known(self, url, recipe_type=None):
+        """Function which returns True if a recipe (identified by its link) has been seen by a previous run (under a given recipe type, if any)"""
+        with self._lock:
+            if recipe_type is None:
+                return self._connect().execute("SELECT 1 FROM recipes WHERE url = ?", (url,)).fetchone() is not None
+            return self._connect().execute("SELECT 1 FROM recipes WHERE recipe_type = ? AND url = ?", (recipe_type, url)).fetchone() is not None
+
+    def load_recipe_types(self, site):
+        """Function which returns the recipe types (list of name, link) last saved for a website, and when they were saved (time stamp).  Returns an empty list and None if none were saved (or they cannot be read)"""
+        try:
+            with self._lock:
+                rows = self._connect().execute("SELECT name, url, saved_at FROM recipe_types WHERE site = ? ORDER BY position", (site,)).fetchall()
+        except sqlite3.Error:  # An error has occurred.  Update system log with error details (the recipe types will be scraped instead):
+            update_system_log("ScrapeStateStore.load_recipe_types", traceback.format_exc())
+            return [], None
+        return [(name, url) for name, url, _ in rows], (rows[0][2] if rows else None)
+
+    def save_recipe_types(self, site, recipe_types):
+        """Function which saves the recipe types (list of name, link) just scraped from a website, replacing those previously saved"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM recipe_types WHERE site = ?", (site,))
+                connection.executemany("INSERT INTO recipe_types (site, position, name, url, saved_at) VALUES (?, ?, ?, ?, ?)",
+                                       [(site, position, name, url, now) for position, (name, url) in enumerate(recipe_types)])
+
+    def _connect(self):
+        # Open the database (creating it if needed) on first use.  The connection is shared by all threads (access to it is
+        # serialized by the lock):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS recipes (recipe_type TEXT, url TEXT, name TEXT, fingerprint TEXT, details_fingerprint TEXT, first_seen REAL, last_seen REAL, PRIMARY KEY (recipe_type, url))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS recipes_url ON recipes (url)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS recipe_types (site TEXT, position INTEGER, name TEXT, url TEXT, saved_at REAL, PRIMARY KEY (site, position))")
+        return self._connection
+
+
+class SiteProfile:
+    """Class which compiles a site profile (a JSON file, e.g. site_profile.json) describing where the data to be scraped is found on the recipe website's pages:  Its navigation steps (links followed from the main page to reach a page), its lists (items and their fields) and how each list continues across pages (pagination).  Compiled profiles are cached (see get_site_profile)"""
+
+    # Navigation steps and lists (with their fields) used by this application, which every site profile must define:
+    REQUIRED_NAVIGATION = ("recipe_type_page",)
+    REQUIRED_LISTS = {"recipe_types": ("name", "url"), "recipes": ("name", "url")}
+
+    def __init__(self, profile):
+        if not isinstance(profile, dict):
+            raise ValueError("Site profile is not a JSON object.")
+        self.name = profile.get("name", "")
+
+        # Compile the navigation steps, lists and pagination, each of which is an object (of entries named by their keys).
+        # Errors name the entry in which they are found:
+        sections = {}
+        for section in ("navigation", "lists", "pagination"):
+            sections[section] = profile.get(section, {})
+            if not isinstance(sections[section], dict):
+                raise ValueError(f'Site profile {self.name!r} is malformed:  "{section}" is not an object.')
+        self.navigation = {}
+        for name, steps in sections["navigation"].items():
+            with self._malformed(f'navigation "{name}"'):
+                self.navigation[name] = NodeLocator.compile_steps(steps)
+        self.lists = {}
+        for name, spec in sections["lists"].items():
+            with self._malformed(f'list "{name}"'):
+                if not isinstance(spec, dict):
+                    raise ValueError('The list is not an object of "item_id" and "fields".')
+                self.lists[name] = ListExtractor(spec["item_id"], spec["fields"])
+        for name in sections["pagination"]:
+            if name not in self.lists:
+                raise ValueError(f'Site profile {self.name!r} is malformed:  Pagination "{name}" is given for a list which is not defined.')
+        self.pagination = {}
+        for name in self.lists:
+            with self._malformed(f'pagination "{name}"'):
+                spec = sections["pagination"].get(name, {})
+                if not isinstance(spec, dict):
+                    raise ValueError("The pagination is not an object.")
+                self.pagination[name] = Paginator(spec)
+
+        # Ensure that everything needed by this application is defined:
+        for name in self.REQUIRED_NAVIGATION:
+            if not self.navigation.get(name):
+                raise ValueError(f'Site profile {self.name!r} does not define navigation "{name}".')
+        for name, field_names in self.REQUIRED_LISTS.items():
+            if name not in self.lists or not set(field_names) <= {field_name for field_name, *_ in self.lists[name].fields}:
+                raise ValueError(f'Site profile {self.name!r} does not define list "{name}" with fields {", ".join(field_names)}.')
+
+    @classmethod
+    def load(cls, file_path):
+        """Function which reads and compiles a site profile from a JSON file"""
+        with open(file_path, encoding="utf-8") as profile_file:
             try:
-                # Identify the xpath that leads to the element where the recipe type is referenced:
-                xpath = '// *[ @ id = "mntl-link-list__item_' + str(i) + '-0"] / a'
+                profile = json.load(profile_file)
+            except json.JSONDecodeError as err:
+                raise ValueError(f"Site profile {file_path} is not valid JSON:  {err}") from err
+        return cls(profile)
+
+    @contextlib.contextmanager
+    def _malformed(self, location):
+        """Function which turns an error raised while compiling an entry of the site profile into a ValueError naming the entry (e.g., list "recipes")"""
+        try:
+            yield
+        except KeyError as err:
+            raise ValueError(f'Site profile {self.name!r} is malformed:  {location} does not define "{err.args[0]}".') from err
+        except ValueError as err:
+            raise ValueError(f"Site profile {self.name!r} is malformed:  {location}:  {err}") from err
+
+
+class SQLiteSink(OutputSink):
+    """Class which writes rows (dictionaries) to a table of a new SQLite database, in batches of OUTPUT_BATCH_ROWS rows (one transaction each).  Once all rows have been written, the table's recipe type and URL columns are indexed"""
+
+    def __init__(self, file_path, table_name, table_columns, sort_key=None, sort_buffer_rows=SORT_BUFFER_ROWS, batch_rows=OUTPUT_BATCH_ROWS):
+        super().__init__(file_path, sort_key, sort_buffer_rows)
+        self.table_name = table_name
+        self.table_columns = table_columns
+        self.batch_rows = batch_rows
+        self._batch = []  # Rows not yet written, as tuples of column values
+
+        # Create the database (replacing any existing file, as with other output files) and its table:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(file_path)
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)  # Written by the scraping thread, closed by the thread that collects the results
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f'CREATE TABLE "{table_name}" (' + ", ".join(f'"{name}" {column_type}' for name, column_type, _ in table_columns) + ")")
+        self._insert = f'INSERT INTO "{table_name}" VALUES (' + ", ".join("?" for _ in table_columns) + ")"
+
+    def _close_output(self):
+        try:
+            # Write the remaining rows, then index the table (faster than maintaining the indexes while rows are inserted):
+            self._write_batch()
+            with self._connection:
+                for name in (name for name, _, _ in self.table_columns if name in OUTPUT_INDEXED_COLUMNS):
+                    self._connection.execute(f'CREATE INDEX "{self.table_name}_{name}" ON "{self.table_name}" ("{name}")')
+        finally:
+            self._connection.close()
+
+    def _write_batch(self):
+        if self._batch:
+            with self._connection:
+                self._connection.executemany(self._insert, self._batch)
+            self._batch = []
+
+    def _write_row(self, row):
+        self._batch.append(tuple(value(row) for _, _, value in self.table_columns))
+        self.rows_written += 1
+        if len(self._batch) >= self.batch_rows:
+            self._write_batch()
+
+
+class StructuredLogger:
+    """Class which writes the system log as JSON lines:  One record per event, including the run id, and the category and URL being scraped (see log_context).  Records are buffered in memory and written in batches"""
+
+    def __init__(self, file_prefix, buffer_records, flush_interval):
+        self.file_prefix = file_prefix  # The log file is named <file_prefix><date>.jsonl
+        self.buffer_records = buffer_records
+        self.flush_interval = flush_interval  # Seconds
+        self.run_id = uuid.uuid4().hex[:12]  # Identifies the records logged by this run of the application
+        self.console = None  # If set (e.g., to sys.stderr when run from the command line), progress ("info") and "warning" records are also shown there
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Function which writes the buffered records to the log file"""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if records:
+                with open(self.file_prefix + datetime.now().strftime("%Y-%m-%d") + ".jsonl", "a", encoding="utf-8") as log_file:
+                    log_file.write("\n".join(records) + "\n")
+
+    def log(self, level, activity, message=None, **fields):
+        """Function which logs an event.  Fields set by log_context and any given fields (None values are left out) are added to the record"""
+        record = {"time": datetime.now().isoformat(timespec="milliseconds"), "run_id": self.run_id, "level": level, "activity": activity}
+        record.update(log_context_fields.get())
+        record.update((name, value) for name, value in fields.items() if value is not None)
+        if message is not None:
+            record["message"] = message
+
+        if self.console is not None and level in ("info", "warning") and message is not None:
+            print(message, file=self.console)
+
+        with self._lock:
+            self._buffer.append(json.dumps(record, default=str))
+            flush_due = len(self._buffer) >= self.buffer_records or time.monotonic() - self._last_flush >= self.flush_interval
+        if flush_due:
+            self.flush()
+
+
+class WorkQueue:
+    """Class which holds the tasks of a distributed crawl (recipe types to scrape, recipe pages to crawl) in an SQLite database (WAL mode) shared by a coordinator and any number of worker processes.  Tasks are identified (deduplicated) by their URL and claimed under a lease:  A task whose lease expires (e.g., its worker has crashed) is claimed again by another worker, and a task's output is only accepted while its lease is held, so that no work is lost or duplicated"""
+
+    # Define the kinds of task (recipe types are claimed first, since they produce recipe-page tasks):
+    KIND_RECIPE_TYPE = "recipe_type"
+    KIND_RECIPE = "recipe"
+
+    # Define the states of a task:
+    STATE_PENDING = "pending"
+    STATE_LEASED = "leased"
+    STATE_DONE = "done"
+    STATE_FAILED = "failed"
+
+    def __init__(self, path, lease_timeout=WORK_QUEUE_LEASE_TIMEOUT, max_attempts=WORK_QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_timeout = lease_timeout  # Seconds
+        self.max_attempts = max_attempts
+        self._connection = None  # Opened on first use
+        self._lock = threading.Lock()
+
+    def claim(self, batch_size=WORK_QUEUE_BATCH_SIZE):
+        """Function which claims tasks of a single kind under a new lease:  One recipe type, or up to batch_size recipe pages.  Returns the lease id, the tasks' kind and the tasks (dictionaries with keys url, kind, recipe_type, name and include_details), or None if no task is available"""
+        now = time.time()
+        with self._transaction() as connection:
+            # Tasks whose lease has expired too many times are given up on:
+            connection.execute("UPDATE tasks SET state = ?, lease_id = NULL WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                               (self.STATE_FAILED, self.STATE_LEASED, now, self.max_attempts))
+
+            # Find the tasks available (pending, or whose lease has expired), taking recipe types first:
+            available = "(state = ? OR (state = ? AND lease_expires < ?))"
+            row = connection.execute(f"SELECT kind FROM tasks WHERE {available} ORDER BY kind = ? DESC LIMIT 1",
+                                     (self.STATE_PENDING, self.STATE_LEASED, now, self.KIND_RECIPE_TYPE)).fetchone()
+            if row is None:
+                return None
+            kind = row[0]
+            tasks = [dict(zip(("url", "kind", "recipe_type", "name", "include_details"), task)) for task in
+                     connection.execute(f"SELECT url, kind, recipe_type, name, include_details FROM tasks WHERE kind = ? AND {available} ORDER BY rowid LIMIT ?",
+                                        (kind, self.STATE_PENDING, self.STATE_LEASED, now, 1 if kind == self.KIND_RECIPE_TYPE else batch_size))]
+
+            # Lease the tasks:
+            lease_id = uuid.uuid4().hex
+            connection.executemany("UPDATE tasks SET state = ?, lease_id = ?, lease_expires = ?, attempts = attempts + 1 WHERE url = ?",
+                                   [(self.STATE_LEASED, lease_id, now + self.lease_timeout, task["url"]) for task in tasks])
+        return lease_id, kind, tasks
+
+    def complete(self, lease_id, done_urls, failed_urls=(), output=None, new_tasks=(), permanently_failed_urls=()):
+        """Function which records the outcome of leased tasks, along with the output (file) holding their results and any new tasks they produced (all in a single transaction).  Failed tasks are retried later, up to max_attempts times, except those which failed permanently (e.g., page not found), which are given up on at once.  Returns False, recording nothing, if the lease has been lost (expired and claimed again), in which case the output must be discarded"""
+        with self._transaction() as connection:
+            held = {url for url, in connection.execute("SELECT url FROM tasks WHERE lease_id = ? AND state = ?", (lease_id, self.STATE_LEASED))}
+            if not held >= set(done_urls) | set(failed_urls) | set(permanently_failed_urls):
+                connection.rollback()
+                return False
+
+            connection.executemany("UPDATE tasks SET state = ?, lease_id = NULL, output = ? WHERE url = ?", [(self.STATE_DONE, output, url) for url in done_urls])
+            connection.executemany("UPDATE tasks SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, lease_id = NULL WHERE url = ?",
+                                   [(self.max_attempts, self.STATE_FAILED, self.STATE_PENDING, url) for url in failed_urls])
+            connection.executemany("UPDATE tasks SET state = ?, lease_id = NULL WHERE url = ?", [(self.STATE_FAILED, url) for url in permanently_failed_urls])
+            self._insert(connection, new_tasks)
+        return True
+
+    def counts(self):
+        """Function which returns the number of tasks of each kind in each state, as a dictionary of kind -> state -> number"""
+        counts = {self.KIND_RECIPE_TYPE: {}, self.KIND_RECIPE: {}}
+        with self._lock:
+            for kind, state, number in self._connect().execute("SELECT kind, state, COUNT(*) FROM tasks GROUP BY kind, state"):
+                counts.setdefault(kind, {})[state] = number
+        return counts
+
+    def enqueue(self, tasks):
+        """Function which adds tasks (dictionaries with keys url, kind, recipe_type and optionally name and include_details) to the queue, skipping any whose URL is already queued.  Returns the number of tasks added"""
+        with self._transaction() as connection:
+            return self._insert(connection, tasks)
+
+    def is_drained(self):
+        """Function which returns True if no task remains to be done (none pending or leased)"""
+        with self._lock:
+            return self._connect().execute("SELECT 1 FROM tasks WHERE state IN (?, ?) LIMIT 1", (self.STATE_PENDING, self.STATE_LEASED)).fetchone() is None
+
+    @contextlib.contextmanager
+    def keep_lease(self, lease_id):
+        """Function which keeps a lease for the duration of a "with" block (while its tasks are being worked on), renewing it from a background thread"""
+        stopped = threading.Event()
+
+        def renew_lease():
+            while not stopped.wait(self.lease_timeout / 3):
+                if not self.renew(lease_id):
+                    return
+
+        renewer = threading.Thread(target=renew_lease, name="lease-renewer", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            renewer.join()
+
+    def outputs(self):
+        """Function which returns the outputs (files) holding the results of completed tasks"""
+        with self._lock:
+            return {output for output, in self._connect().execute("SELECT DISTINCT output FROM tasks WHERE state = ? AND output IS NOT NULL", (self.STATE_DONE,))}
+
+    def release(self, lease_id):
+        """Function which gives up leased tasks (e.g., when a worker is stopped), so that they can be claimed again straight away"""
+        with self._transaction() as connection:
+            connection.execute("UPDATE tasks SET state = ?, lease_id = NULL, attempts = attempts - 1 WHERE lease_id = ? AND state = ?",
+                               (self.STATE_PENDING, lease_id, self.STATE_LEASED))
+
+    def renew(self, lease_id):
+        """Function which extends a lease (while its tasks are still being worked on).  Returns False if the lease has been lost"""
+        with self._transaction() as connection:
+            return connection.execute("UPDATE tasks SET lease_expires = ? WHERE lease_id = ? AND state = ?",
+                                      (time.time() + self.lease_timeout, lease_id, self.STATE_LEASED)).rowcount > 0
+
+    def _connect(self):
+        # Open the database (creating it if needed) on first use.  Transactions are started explicitly (BEGIN IMMEDIATE), so
+        # that claiming tasks is atomic across processes; a process waits up to HTTP_TIMEOUT seconds for another's transaction:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=HTTP_TIMEOUT, isolation_level=None, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS tasks (url TEXT PRIMARY KEY, kind TEXT, recipe_type TEXT, name TEXT, include_details INTEGER, "
+                                     "state TEXT, lease_id TEXT, lease_expires REAL, attempts INTEGER DEFAULT 0, output TEXT)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, kind)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS tasks_lease ON tasks (lease_id)")
+        return self._connection
+
+    def _insert(self, connection, tasks):
+        rows = [(task["url"], task["kind"], task["recipe_type"], task.get("name"), int(bool(task.get("include_details"))), self.STATE_PENDING) for task in tasks]
+        before = connection.total_changes
+        connection.executemany("INSERT OR IGNORE INTO tasks (url, kind, recipe_type, name, include_details, state) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return connection.total_changes - before
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except:
+                connection.rollback()
+                raise
+            if connection.in_transaction:
+                connection.commit()
+
 
-                # Locate the element and assess if it pertains to the recipe type the user has selected:
-                element = driver.find_element(By.XPATH, xpath)
-                if element.text == selected_recipe_type_scrape:  # Element pertains to the user-selected recipe type
-                    additional_searching_needed = False  # No more searching is needed.
+# Initiate the system log, ensuring that its buffered records are written when this application exits, as well as the
+# metrics collected while scraping:
+system_log = StructuredLogger(LOG_FILE_PREFIX, LOG_BUFFER_RECORDS, LOG_FLUSH_INTERVAL)
+atexit.register(system_log.flush)
+metrics = Metrics(METRICS_PREFIX, METRICS_LATENCY_BUCKETS)
 
-                # Increment the element-counter variable by 1.
-                i += 1
+# Initiate the pool of reusable Selenium drivers, ensuring that all of its browsers are closed when this application exits:
+driver_pool = DriverPool(DRIVER_POOL_SIZE, DRIVER_POOL_IDLE_TIMEOUT)
+atexit.register(driver_pool.close_all)
 
-            except: # No more searching for the desired recipe type will be performed.
-                additional_searching_needed = False
+# Initiate the rate limiter which spaces requests to the recipe website (shared by all fetch backends and worker threads):
+host_rate_limiter = HostRateLimiter(HOST_MIN_REQUEST_INTERVAL)
 
-        # Click on the link pertaining to the chosen element.
-        # This will lead to a page where all recipes for the selected recipe type are available:
-        element.click()
 
-        # Clear the recipe dictionary of its contents:
-        selected_recipes.clear()
+# Initiate the policy for retrying failed requests to the website, along with its per-host circuit breaker:
+retry_policy = RetryPolicy(FETCH_MAX_ATTEMPTS, FETCH_BACKOFF_BASE, FETCH_BACKOFF_MAX, CircuitBreaker(CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RESET_TIMEOUT))
 
-        # Loop through the recipe types at the target website.
-        # Capture the name and link for each recipe pertaining to the user-selected recipe type:
-        additional_searching_needed = True    # Proceed with searching.
-        i = 1   # Element-counter variable
-        error_count = 0
-        while additional_searching_needed:
+# Initiate the on-disk page cache:
+page_cache = PageCache(PAGE_CACHE_PATH, PAGE_CACHE_TTL, PAGE_CACHE_MAX_BYTES)
+
+# Initiate the store of the recipes scraped while this application runs, and its search index:
+recipe_store = RecipeStore()
+recipe_search_index = RecipeSearchIndex(recipe_store)
+
+# Initiate the store of recipes seen by previous runs (incremental scraping):
+scrape_state_store = ScrapeStateStore(SCRAPE_STATE_PATH)
+
+
+# DEFINE FUNCTIONS TO BE USED FOR THIS APPLICATION (LISTED IN ALPHABETICAL ORDER BY FUNCTION NAME):
+def cancel_scrape_job():
+    """Function which asks the background scraping worker to stop (Cancel button).  Pages being scraped are finished (and their drivers returned to the pool), while the remaining ones are skipped"""
+    scrape_cancel_event.set()
+    gui_widgets["button_cancel"].config(state="disabled")
+    gui_widgets["label_status"].config(text="Cancelling...")
+
+
+def compile_node_path(path):
+    """Function which compiles a relative, positional XPath-style path (e.g., "div[2]/span/span") into a tuple of (tag, 1-based position among same-tag children) steps.  No position means the first such child; an empty path means the element itself"""
+    if not isinstance(path, str):
+        raise ValueError(f"Path {path!r} is not a string.")
+    steps = []
+    for step in path.split("/") if path.strip() else []:
+        match = SITE_PROFILE_PATH_STEP.fullmatch(step.strip())
+        if not match:
+            raise ValueError(f'Path "{path}" is not valid:  Step "{step}" is not a tag, optionally followed by its position (e.g., "li[2]").')
+        steps.append((match.group(1), int(match.group(2) or 1)))
+    return tuple(steps)
+
+
+def conditional_request_headers(cached):
+    """Function which returns the request headers asking the website to send a page only if it has changed since it was cached (based on the cached page's ETag / Last-Modified validators)"""
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def crawl_recipe_details(recipe_urls, on_result, concurrency=DETAIL_CRAWL_CONCURRENCY, cancel_event=None, on_error=None):
+    """Function which crawls recipe pages and extracts the details of each recipe, passing each URL and its details (None if the page could not be crawled) to on_result as soon as they are available.  If given, on_error is first called with each URL which could not be crawled and the error raised.  If cancel_event is set, the remaining pages are skipped.  Returns the number of pages crawled successfully and the number which failed"""
+    return asyncio.run(crawl_recipe_details_async(recipe_urls, on_result, concurrency, cancel_event, on_error))
+
+
+async def crawl_recipe_details_async(recipe_urls, on_result, concurrency, cancel_event=None, on_error=None):
+    """Function which crawls recipe pages concurrently with asyncio (see crawl_recipe_details)"""
+    pool = AsyncHTTPConnectionPool(HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_TIMEOUT)
+    counts = {"succeeded": 0, "failed": 0}
+
+    # URLs are handed to the workers through a bounded queue.  Once it is full, no more URLs are taken from recipe_urls until
+    # a worker is ready for one (backpressure), so recipe_urls can be a generator of any length:
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def crawl_worker():
+        while True:
+            url = await queue.get()
             try:
-                # Identify the xpath that leads to the element for the current recipe's link (href):
-                xpath = '// *[ @ id = "mntl-card-list-items_' + str(i) + '-0"]'
+                # A None URL indicates that no more URLs are to be crawled:
+                if url is None:
+                    return
+
+                # If the crawl has been cancelled, skip the URL (without reporting it):
+                if cancel_event is not None and cancel_event.is_set():
+                    continue
+
+                # Download the recipe page (or use its cached copy), then extract the recipe's details:
+                with log_context(url=url):
+                    _, html = await fetch_page_html_async(pool, url)
+                    details = parse_recipe_details(html, url)
+                counts["succeeded"] += 1
+                metrics.increment("recipe_pages_crawled_total", outcome="succeeded")
+
+            except Exception as err:  # An error has occurred.  Update system log with error details, and report the page as failed:
+                update_system_log("crawl_recipe_details", traceback.format_exc(), url=url)
+                details = None
+                counts["failed"] += 1
+                metrics.increment("recipe_pages_crawled_total", outcome="failed")
+                if on_error is not None:
+                    on_error(url, err)
+
+            finally:
+                queue.task_done()
+
+            on_result(url, details)
+
+    # Start the workers, feed them every URL (until the crawl is cancelled) followed by one "no more URLs" indication each,
+    # then wait for them to finish:
+    workers = [asyncio.create_task(crawl_worker()) for _ in range(concurrency)]
+    try:
+        for url in recipe_urls:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            await queue.put(url)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await pool.close()
+
+    return counts["succeeded"], counts["failed"]
+
+
+def extract_recipe_types_from_document(document, page_url):
+    """Function which captures the name and link of every recipe type on a parsed recipe-type page (see the site profile's "recipe_types" list)"""
+    with metrics.timer("element_lookup", backend=FETCH_BACKEND_HTTP):
+        return [(row["name"], row["url"]) for row in get_site_profile().lists["recipe_types"].extract(document, page_url)]
+
+
+def extract_recipe_types_bulk(driver):
+    """Function which captures the name and link of every recipe type on the recipe-type page currently loaded in a Selenium driver, using a single WebDriver round trip"""
+    with metrics.timer("element_lookup", backend=FETCH_BACKEND_SELENIUM):
+        return [(row["name"], row["url"]) for row in get_site_profile().lists["recipe_types"].extract_from_driver(driver)]
+
+
+def extract_recipes_bulk(driver):
+    """Function which captures the name and link of every recipe on the recipe-type page currently loaded in a Selenium driver, using a single WebDriver round trip.  Returns a dictionary of recipe link -> name"""
+    with metrics.timer("element_lookup", backend=FETCH_BACKEND_SELENIUM):
+        return {row["url"]: row["name"] for row in get_site_profile().lists["recipes"].extract_from_driver(driver)}
+
+
+def extract_recipes_from_document(document, page_url):
+    """Function which captures the name and link of every recipe on a parsed recipe-type page (see the site profile's "recipes" list).  Returns a dictionary of recipe link -> name"""
+    with metrics.timer("element_lookup", backend=FETCH_BACKEND_HTTP):
+        return {row["url"]: row["name"] for row in get_site_profile().lists["recipes"].extract(document, page_url)}
 
-                # Locate the element.  Once found, capture the recipe's link:
-                element = driver.find_element(By.XPATH, xpath)
-                recipe_link = element.get_attribute('href')
 
-                # Identify the xpath that leads to the element where the current recipe's name is referenced:
-                xpath = '// *[ @ id = "mntl-card-list-items_' + str(i) + '-0"]/div[2]/span/span'
+def fetch_page_html(url):
+    """Function for downloading a page over plain HTTP (lightweight fetch backend), using the on-disk page cache according to the cache mode.  Returns the final URL (after any redirects) and the page's HTML"""
 
-                # Locate the element.  Once found, capture the recipe's name and remove all commas from same:
-                element = driver.find_element(By.XPATH, xpath)
-                recipe_name = element.text.replace(',','')
+    # Use the cached copy of the page, if it is fresh (or, in offline mode, if there is one at all):
+    cached = page_cache.get(url) if cache_mode != CACHE_MODE_DISABLED else None
+    if cached and (cached["fresh"] or cache_mode == CACHE_MODE_OFFLINE):
+        metrics.increment("cache_hits_total")
+        return cached["final_url"], cached["html"]
+    if cache_mode == CACHE_MODE_OFFLINE:
+        raise LookupError(f"Page is not cached (offline mode): {url}")
 
-                # Add the recipe's name and link to the "selected recipes" dictionary.
-                # This dictionary will serve as the source of data to be written to the CSV file:
-                selected_recipes.update({recipe_name: recipe_link})
+    # Request the page, identifying as a regular browser (some sites reject unknown user agents).  If a stale copy of the
+    # page is cached, the website is asked to send the page only if it has changed since:
+    headers = {"User-Agent": HTTP_USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
+    headers.update(conditional_request_headers(cached))
 
-                # Increment the element-counter variable by 1.
-                i += 1
+    def request():
+        # Wait until a request to the website is allowed (politeness limit), then send the request:
+        host_rate_limiter.wait(url)
+        try:
+            with metrics.timer("page_load", backend=FETCH_BACKEND_HTTP), urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=HTTP_TIMEOUT) as response:
+                # Decode the page using the character set declared by the server (default to UTF-8):
+                charset = response.headers.get_content_charset() or "utf-8"
+                final_url, html = response.geturl(), response.read().decode(charset, errors="replace")
+                metrics.increment("pages_fetched_total", backend=FETCH_BACKEND_HTTP)
+
+                # Store the page in the cache, along with its validators:
+                if cache_mode != CACHE_MODE_DISABLED:
+                    page_cache.put(url, final_url, html, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return final_url, html
+
+        except urllib.error.HTTPError as err:
+            # The page has not changed since it was cached ("304 Not Modified"):  Use the cached copy:
+            if err.code == 304 and cached:
+                metrics.increment("cache_revalidations_total")
+                page_cache.revalidated(url)
+                return cached["final_url"], cached["html"]
+            raise
+
+    # Send the request, retrying it if it fails with a transient error:
+    return retry_policy.call(url, request)
+
+
+async def fetch_page_html_async(pool, url):
+    """Function for downloading a page with asyncio (see fetch_page_html), using the on-disk page cache according to the cache mode.  Returns the final URL (after any redirects) and the page's HTML"""
+
+    # Use the cached copy of the page, if it is fresh (or, in offline mode, if there is one at all).  The page cache (an SQLite
+    # database on disk) is used on a worker thread, so that the asyncio event loop is not blocked while it is read or written:
+    cached = await asyncio.to_thread(page_cache.get, url) if cache_mode != CACHE_MODE_DISABLED else None
+    if cached and (cached["fresh"] or cache_mode == CACHE_MODE_OFFLINE):
+        metrics.increment("cache_hits_total")
+        return cached["final_url"], cached["html"]
+    if cache_mode == CACHE_MODE_OFFLINE:
+        raise LookupError(f"Page is not cached (offline mode): {url}")
+
+    async def request():
+        # Wait until a request to the website is allowed (politeness limit), then request the page (only if it has changed
+        # since it was cached, if a stale copy is cached):
+        await host_rate_limiter.wait_async(url)
+        with metrics.timer("page_load", backend="http_async"):
+            final_url, status, headers, html = await pool.get(url, conditional_request_headers(cached))
+
+        # The page has not changed since it was cached ("304 Not Modified"):  Use the cached copy:
+        if status == 304 and cached:
+            metrics.increment("cache_revalidations_total")
+            await asyncio.to_thread(page_cache.revalidated, url)
+            return cached["final_url"], cached["html"]
+        if status != 200:
+            raise HTTPStatusError(url, status, headers.get("retry-after"))
+        metrics.increment("pages_fetched_total", backend="http_async")
+
+        # Store the page in the cache, along with its validators:
+        if cache_mode != CACHE_MODE_DISABLED:
+            await asyncio.to_thread(page_cache.put, url, final_url, html, headers.get("etag"), headers.get("last-modified"))
+        return final_url, html
+
+    # Send the request, retrying it if it fails with a transient error:
+    return await retry_policy.call_async(url, request)
+
+
+def fingerprint_recipe(content):
+    """Function which returns a fingerprint (hash) of a recipe's content, used for detecting changes between runs"""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def find_json_ld_recipe(data):
+    """Function which finds the "Recipe" object within JSON-LD data (which may be a single object, a list of objects, or a "@graph" of objects).  Returns None if there is none"""
+    if isinstance(data, list):
+        for item in data:
+            recipe = find_json_ld_recipe(item)
+            if recipe:
+                return recipe
+    elif isinstance(data, dict):
+        types = data.get("@type")
+        if types == "Recipe" or (isinstance(types, list) and "Recipe" in types):
+            return data
+        if "@graph" in data:
+            return find_json_ld_recipe(data["@graph"])
+
+    return None
+
+
+def find_node_at_path(node, steps):
+    """Function which follows a compiled, relative path (see compile_node_path) from an element of a parsed HTML page.  Returns None if no such element exists"""
+    for tag, position in steps:
+        # Move to the matching child element (the position-th child with the step's tag), if it exists:
+        for child in node.children:
+            if isinstance(child, HTMLNode) and child.tag == tag:
+                position -= 1
+                if not position:
+                    node = child
+                    break
+        else:
+            return None
+
+    return node
 
-            except: # No more recipes are available.
-                error_count += 1
-                if error_count == 100:
-                    additional_searching_needed = False
 
-        # Close and delete the Selenium driver object:
-        driver.close()
-        del driver
+def format_duration(seconds):
+    """Function which formats a duration (in seconds) for display, such as 1:05 (minutes and seconds) or 1:02:05"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
 
-        # Sort the selected recipes by recipe name:
-        selected_recipes = collections.OrderedDict(sorted(selected_recipes.items()))
 
-        # Write the results to a CSV file, giving user a choice of file name and location.
-        # If an error occurs, return None (does not represent grounds for exiting this application):
-        if not write_to_csv_file(selected_recipe_type_scrape):
+def get_all_recipes():
+    """Function used to scrape the recipe website and retrieve all recipes for every recipe type, writing one CSV file per recipe type (Get All Recipes button)"""
+    try:
+        # Ask user for the folder in which the CSV files are to be created.  If none is selected, no scraping is performed:
+        folder_path_identified = filedialog.askdirectory(parent=window, title="Save Recipes For All Recipe Types To Folder")
+        if not folder_path_identified:
+            notify_user("Recipe Files Not Created", "Files have not been created.")
             return None
 
+        # Scrape all recipe types on the background worker, so that the application window remains responsive:
+        start_scrape_job(scrape_job_all_recipes, list(combobox_recipe_type_values), folder_path_identified, sort_recipes.get())
+
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (get_recipes): {traceback.format_exc()}")
+        notify_user("Error", f"Error (get_all_recipes): {traceback.format_exc()}")
 
         # Update system log with error details:
-        update_system_log("get_recipes", traceback.format_exc())
-
-        # If Selenium driver object is open, close and destroy it:
-        try:
-            driver.close()
-            del driver
-        except:
-            pass
+        update_system_log("get_all_recipes", traceback.format_exc())
 
         # Return None (does not represent grounds for exiting this application):
         return None
 
 
-def get_recipe_types():
-    """Function to scrape the recipe website, collect all recipe types from same, and add the recipe types to a list.  This list will feed the combo box on the main application window"""
-    global combobox_recipe_type_values
+def get_recipe_details(recipe_urls):
+    """Function which crawls recipe pages and returns the details of each recipe crawled successfully, in the order of the given URLs"""
+    recipe_urls = list(recipe_urls)  # Iterated twice (once crawled, then in order), so that any iterable of URLs may be given
+    details_by_url = {}
+    crawl_recipe_details(recipe_urls, details_by_url.__setitem__)
+    return [details_by_url[url] for url in recipe_urls if details_by_url.get(url)]
 
+
+def get_recipes():
+    """Function used to scrape the recipe website and retrieve all recipes for the selected recipe type (Get Recipes button)"""
     try:
-        # Go to the recipe-type page on the website.  Return the Selenium driver initiated in same for further use in this function.
-        # If an error occurs, return failed-execution indication to the calling function:
-        driver = go_to_recipe_type_page_on_website()
-        if not driver:
-            return False
+        # Capture the selected recipe type:
+        selected_recipe_type_scrape = selected_recipe_type.get()
+        if not selected_recipe_type_scrape:
+            notify_user("Recipe Type Not Selected", "Please select a recipe type.")
+            return None
 
-        # Loop through all recipe types at the target website:
-        recipe_types_available = True    # Additional recipe types are presumed to be available for retrieval from the target URL.
-        i = 1   # Element-counter variable
-        while recipe_types_available:
-            try:
-                # Identify the xpath that leads to the element where the recipe type is referenced:
-                xpath = '// *[ @ id = "mntl-link-list__item_' + str(i) + '-0"] / a'
+        # Ask user for the file to which the recipes are to be written.  If none is selected, no scraping is performed:
+        file_path_identified = filedialog.asksaveasfilename(parent=window, initialfile="Recipes - " + selected_recipe_type_scrape, title="Save Recipes To File", defaultextension=".csv", filetypes=OUTPUT_FILE_TYPES)
+        if not file_path_identified:
+            notify_user("Recipe File Not Created", "File has not been created.")
+            return None
+        if missing_output_package(file_path_identified):
+            notify_user("Recipe File Not Created", missing_output_package(file_path_identified))
+            return None
 
-                # Locate the element.  Once found, append it to the recipe-type list:
-                element = driver.find_element(By.XPATH, xpath)
-                combobox_recipe_type_values.append(element.text)
+        # Scrape the recipe type on the background worker, so that the application window remains responsive:
+        start_scrape_job(scrape_job_recipes, selected_recipe_type_scrape, file_path_identified, include_recipe_details.get(), sort_recipes.get())
 
-                # Increment the element-counter variable by 1.
-                i += 1
+    except:  # An error has occurred.
+        # Inform user:
+        notify_user("Error", f"Error (get_recipes): {traceback.format_exc()}")
 
-            except: # No more recipe types are available.
-                recipe_types_available = False
+        # Update system log with error details:
+        update_system_log("get_recipes", traceback.format_exc())
 
-        # Close and delete the Selenium driver object:
-        driver.close()
-        del driver
+        # Return None (does not represent grounds for exiting this application):
+        return None
+
+
+def get_recipe_types():
+    """Function to scrape the recipe website and collect all recipe types from same (run in the background at start-up).  The recipe types are saved for the next start-up, and passed on to the GUI, where they feed the combo box on the main application window"""
+    try:
+        # Scrape the recipe website for the name and link of each recipe type.
+        # If an error occurs, return failed-execution indication to the calling function:
+        recipe_types = scrape_recipe_types()
+        if recipe_types is None:
+            return False
+
+        # Save the recipe types, so that the next start-up can list them at once (see run_app):
+        scrape_state_store.save_recipe_types(url_recipe_site, recipe_types)
+
+        # Pass the recipe types on to the GUI (see show_recipe_types):
+        post_gui_event("recipe_types", recipe_types)
 
         # Return successful-execution indication to the calling function:
         return True
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (get_recipe_types): {traceback.format_exc()}")
+        notify_user("Error", f"Error (get_recipe_types): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("get_recipe_types", traceback.format_exc())
 
-        # If Selenium driver object is open, close and destroy it:
-        try:
-            driver.close()
-            del driver
-        except:
-            pass
-
         # Return failed-execution indication to the calling function:
         return False
 
 
+def get_site_profile():
+    """Function which returns the site profile in use (see site_profile_path), compiled.  It is compiled once, then reused until its file is changed"""
+    modified = os.path.getmtime(site_profile_path)
+    cached = site_profiles.get(site_profile_path)
+    if cached is None or cached[0] != modified:
+        cached = site_profiles[site_profile_path] = (modified, SiteProfile.load(site_profile_path))
+    return cached[1]
+
+
 def go_to_recipe_type_page_on_website():
-    """Function for scraping the recipe website to access the recipe-type page of same"""
+    """Function for scraping the recipe website to access the recipe-type page of same.  Returns a Selenium driver leased from the driver pool, which the calling function must release back to the pool"""
+    global url_recipe_type_page
+
     try:
-        # Initiate and configure a Selenium object which starts scraping at the website's main page.
+        # Lease a Selenium driver from the pool, preferring one which is already on the recipe-type page.
         # If an error occurs, return failed-execution indication to the calling function:
-        driver = setup_driver(url_recipe_site, 1600, 300)
+        driver = driver_pool.acquire(url_recipe_type_page)
         if not driver:
             return False
 
-        # Find the element which, upon clicking, moves to the recipe-type page of the website:
-        xpath = '//*[@id="mntl-header-nav_1-0"]/div[1]/ul/li[2]/a'
-        element = driver.find_element(By.XPATH, xpath)
-        element.click()
+        # If the driver is already on the recipe-type page (warm session), no navigation is needed:
+        if url_recipe_type_page and driver.current_url == url_recipe_type_page:
+            return driver
+
+        # If the recipe-type page has been visited before, go straight to it:
+        if url_recipe_type_page:
+            load_page_in_driver(driver, url_recipe_type_page)
+            return driver
+
+        # Otherwise, start at the website's main page and click on the element of each navigation step (see the site
+        # profile) in turn, to move to the recipe-type page of the website:
+        if driver.current_url != url_recipe_site:
+            load_page_in_driver(driver, url_recipe_site)
+        for step in get_site_profile().navigation["recipe_type_page"]:
+            with metrics.timer("element_lookup", backend=FETCH_BACKEND_SELENIUM):
+                element = wait_for_element_in_driver(driver, step.xpath)
+            if element is None:
+                raise LookupError(f"Navigation link not found: {step.xpath}")
+            element.click()
+
+        # Remember the recipe-type page, so that later visits can go straight to it:
+        url_recipe_type_page = driver.current_url
 
         # Return the Selenium driver object to the calling function:
         return driver
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (go_to_recipe_type_page_on_website): {traceback.format_exc()}")
+        notify_user("Error", f"Error (go_to_recipe_type_page_on_website): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("go_to_recipe_type_page_on_website", traceback.format_exc())
 
-        # If Selenium driver object is open, close and destroy it:
+        # If a Selenium driver has been leased, close it (its state is unknown) and remove it from the pool:
         try:
-            driver.close()
-            del driver
+            driver_pool.release(driver, discard=True)
         except:
             pass
 
@@ -233,46 +2472,503 @@ def go_to_recipe_type_page_on_website():
         return False
 
 
+def handle_search_box_changed(event=None):
+    """Function which updates the search results as the user types in the search box:  The recipe types listed in the combo box are narrowed down to those matching the search, and the matching recipes scraped so far are listed below it"""
+    query = gui_widgets["entry_search"].get()
+    tokens = tokenize_text(query)
+
+    # List the recipe types each of whose words starts with... each word searched for (all recipe types if nothing is searched for):
+    recipe_types = [recipe_type for recipe_type in combobox_recipe_type_values
+                    if all(any(word.startswith(token) for word in tokenize_text(recipe_type)) for token in tokens)]
+    gui_widgets["combobox_recipe_type"].config(values=recipe_types)
+    if len(recipe_types) == 1:
+        selected_recipe_type.set(recipe_types[0])
+
+    # List the matching recipes (keeping their links for opening them):
+    listbox_search_results = gui_widgets["listbox_search_results"]
+    listbox_search_results.delete(0, "end")
+    gui_widgets["search_results"] = search_recipes(query, limit=SEARCH_RESULTS_LIMIT) if tokens else []
+    for recipe in gui_widgets["search_results"]:
+        listbox_search_results.insert("end", f"{recipe.name}  ({recipe.recipe_type})")
+
+
+def handle_search_result_opened(event=None):
+    """Function which opens the recipe selected in the search results in the user's web browser"""
+    import webbrowser
+    for selected in gui_widgets["listbox_search_results"].curselection():
+        webbrowser.open(gui_widgets["search_results"][selected].url)
+
+
 def handle_window_on_closing():
     """Function which confirms with user if s/he wishes to exit this application"""
 
-    # Confirm with user if s/he wishes to exit this application:
-    if messagebox.askokcancel("Exit?", "Do you want to exit this application?"):
+    # Confirm with user if s/he wishes to exit this application (warning him/her if scraping is under way):
+    if scrape_worker is not None and scrape_worker.is_alive():
+        question = "Recipes are still being retrieved.  Do you want to stop and exit this application?"
+    else:
+        question = "Do you want to exit this application?"
+    if messagebox.askokcancel("Exit?", question):
+        scrape_cancel_event.set()
         window.destroy()
 
+        # Close all Selenium drivers (browsers) opened by this application:
+        driver_pool.close_all()
+
         # Exit this application:
         exit()
 
 
+def is_driver_failure_error(err):
+    """Function which returns True if an error raised by a Selenium driver means that its browser (or its session) has died, so that the driver must be discarded (see SELENIUM_DRIVER_FAILURE_ERRORS)"""
+    if type(err).__name__ in SELENIUM_DRIVER_FAILURE_ERRORS:
+        return True
+    return type(err).__name__ == "WebDriverException" and any(message in str(err).lower() for message in SELENIUM_DRIVER_FAILURE_MESSAGES)
+
+
+def is_transient_error(err):
+    """Function which classifies an error raised while fetching a page or extracting its elements:  True if the error is transient (time-outs, dropped connections, "429 Too Many Requests", server errors, browser hiccups, ...) and the request is worth retrying, False if it is permanent (page not found, offline mode, open circuit, invalid TLS certificate, unexpected page content, dead browser, ...)"""
+    if isinstance(err, CircuitOpenError):
+        return False
+    if isinstance(err, urllib.error.HTTPError):
+        return err.code in FETCH_RETRY_HTTP_STATUSES
+    if isinstance(err, HTTPStatusError):
+        return err.status in FETCH_RETRY_HTTP_STATUSES
+    if isinstance(err, ssl.SSLCertVerificationError) or isinstance(getattr(err, "reason", None), ssl.SSLCertVerificationError):  # An invalid certificate does not fix itself (urllib wraps it in a URLError)
+        return False
+    if isinstance(err, (OSError, http.client.HTTPException, asyncio.IncompleteReadError)):  # Includes time-outs and network errors
+        return True
+
+    # Selenium errors are identified by name, as Selenium is not imported unless the Selenium fetch backend is used.  A dead
+    # browser does not come back, however often it is retried:
+    return type(err).__name__ in SELENIUM_TRANSIENT_ERRORS and not is_driver_failure_error(err)
+
+
+def iter_recipe_categories(recipe_types, max_workers=SCRAPE_MAX_WORKERS, cancel_event=None, on_page=None):
+    """Function which scrapes several recipe types concurrently, yielding each recipe type and its recipes (None if it could not be scraped) as soon as it has been scraped.  If cancel_event is set, the remaining recipe types are skipped.  If given, on_page is called with each recipe type and the recipes newly captured from each of its pages (see scrape_recipes)"""
+
+    # Fan the recipe types out across a pool of worker threads.  The shared rate limiter keeps the combined request rate to
+    # the website within the politeness limit:
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape") as executor:
+        futures = {executor.submit(scrape_recipes, recipe_type, on_page and functools.partial(on_page, recipe_type)): recipe_type for recipe_type in recipe_types}
+        try:
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                # Forget the recipe type's future once done with, so that its recipes are not held until every recipe type
+                # has been scraped:
+                recipe_type = futures.pop(future)
+                try:
+                    recipes = future.result()
+                except:  # An error has occurred.  Update system log with error details, and report the recipe type as failed:
+                    update_system_log("iter_recipe_categories", traceback.format_exc())
+                    recipes = None
+                yield recipe_type, recipes
+        finally:
+            # If stopped early, abandon the recipe types not yet started.  Those being scraped are finished (returning their
+            # drivers to the pool) before the executor is shut down:
+            for future in futures:
+                future.cancel()
+
+
+def iter_recipe_categories_to_files(recipe_types, file_path_for, max_workers=SCRAPE_MAX_WORKERS, cancel_event=None, sort=False, on_page=None):
+    """Function which scrapes several recipe types concurrently (see iter_recipe_categories), writing each recipe type's recipes to its own file (at file_path_for(recipe_type)) page by page, as soon as they are captured, so that memory use does not grow with the number of recipes written and partial results survive a crash.  If sort is True, the recipes are written sorted by recipe name instead (once the recipe type has been scraped).  If cancel_event is set, the remaining pages and recipe types are skipped.  If given, on_page is called with each recipe type and the recipes captured from each of its pages once they have been written; if it returns True, the recipe type's remaining pages are skipped.  Yields each recipe type, its recipes (None if it could not be scraped) and the number of recipes written"""
+    sinks = {}  # Recipe type -> sink to which its recipes are being written
+
+    def write_page(recipe_type, page_recipes):
+        # Called on the worker thread scraping the recipe type (each recipe type is scraped by a single thread), with the
+        # recipes not passed on before (see scrape_recipes):
+        if recipe_type not in sinks:
+            sinks[recipe_type] = open_recipe_sink(file_path_for(recipe_type), OUTPUT_RECIPES, sort_key=(lambda row: row["name"]) if sort else None)
+        with metrics.timer("write"):
+            for recipe_link, recipe_name in page_recipes.items():
+                sinks[recipe_type].write({"recipe_type": recipe_type, "name": recipe_name, "url": recipe_link})
+        return bool(on_page and on_page(recipe_type, page_recipes)) or (cancel_event is not None and cancel_event.is_set())
+
+    try:
+        for recipe_type, recipes in iter_recipe_categories(recipe_types, max_workers, cancel_event, on_page=write_page):
+            # Close the recipe type's file (creating it, if no page has been captured) once it has been scraped:
+            sink = sinks.pop(recipe_type, None)
+            if sink is None and recipes is not None:
+                sink = open_recipe_sink(file_path_for(recipe_type), OUTPUT_RECIPES)
+            rows_written = 0
+            if sink is not None:
+                with metrics.timer("write"):
+                    sink.close()
+                rows_written = sink.rows_written
+                metrics.increment("rows_written_total", rows_written)
+            yield recipe_type, recipes, rows_written
+    finally:
+        # If stopped early, close the files of the recipe types being scraped (their recipes written so far are kept):
+        for sink in sinks.values():
+            sink.close()
+
+
+def iso_duration_to_minutes(duration):
+    """Function which converts an ISO 8601 duration (e.g., "PT1H30M", as used by JSON-LD recipe times) to a number of minutes.  Returns None if the duration is missing or not valid"""
+    match = re.fullmatch(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?", (duration or "").strip())
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (float(group) if group else 0 for group in match.groups())
+    return round(days * 1440 + hours * 60 + minutes + seconds / 60)
+
+
+def load_gui_toolkit():
+    """Function which imports Tkinter (only needed in GUI mode, so it is not imported until the GUI is started)"""
+    global tk, ttk, filedialog, messagebox
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
+
+
+def load_page_in_driver(driver, url):
+    """Function which loads a page in a Selenium driver (once allowed by the politeness limit), retrying it if loading fails with a transient error"""
+
+    def request():
+        host_rate_limiter.wait(url)
+        with metrics.timer("page_load", backend=FETCH_BACKEND_SELENIUM):
+            driver.get(url)
+        metrics.increment("pages_fetched_total", backend=FETCH_BACKEND_SELENIUM)
+
+    retry_policy.call(url, request)
+
+
+def load_recipe_type_urls(recipe_type):
+    """Function which scrapes the link of each recipe type (lightweight fetch backend) into recipe_type_urls, unless the recipe type's link is already known.  If several threads need the links at once, only the first scrapes them (without holding the lock, as it waits for the website); the others wait for its outcome"""
+    global recipe_type_urls_pending
+
+    # Join the scraping of the recipe types under way, if any, or start one:
+    with recipe_type_urls_lock:
+        if recipe_type in recipe_type_urls:
+            return
+        pending = recipe_type_urls_pending
+        if pending is None:
+            pending = recipe_type_urls_pending = Future()
+            started = True
+        else:
+            started = False
+    if not started:
+        pending.result()
+        return
+
+    # Scrape the recipe types, then pass the outcome on to the threads waiting for it:
+    try:
+        recipe_types = scrape_recipe_types_http()
+        with recipe_type_urls_lock:
+            recipe_type_urls.update(recipe_types)
+        pending.set_result(None)
+    except BaseException as err:
+        pending.set_exception(err)
+        raise
+    finally:
+        with recipe_type_urls_lock:
+            recipe_type_urls_pending = None
+
+
+def load_saved_recipes(folder, recipe_types=None):
+    """Function which loads the recipes saved in an output folder (by the scrape command, or by the workers of a distributed crawl) into the recipe store, indexing the ingredients of those whose details were saved, so that they can be searched without scraping.  Only the recipes of the given recipe types are loaded, if any.  Returns the number of files read"""
+
+    # Identify the recipe files, then the recipe-details files and partitions (read last, so that their recipes are already held).
+    # Other files (e.g., the file of changes written by an incremental run) are not listings of the recipes, so they are skipped:
+    extensions = tuple(output_file_extension(file_format, compressed) for file_format in (FILE_FORMAT_CSV, FILE_FORMAT_JSONL, FILE_FORMAT_SQLITE, FILE_FORMAT_PARQUET)
+                       for compressed in (False, True))
+    file_names = sorted(name for name in os.listdir(folder) if name.startswith("Recipes - ") and name.lower().endswith(extensions)) if os.path.isdir(folder) else []
+    partition_folder = os.path.join(folder, WORK_QUEUE_PARTITION_FOLDER_NAME)
+    partition_names = sorted(name for name in os.listdir(partition_folder) if name.startswith("part-") and name.lower().endswith(extensions)) if os.path.isdir(partition_folder) else []
+    file_paths = [os.path.join(folder, name) for name in file_names if " - Details." not in name] + \
+                 [os.path.join(folder, name) for name in file_names if " - Details." in name] + \
+                 [os.path.join(partition_folder, name) for name in partition_names]
+
+    files_read = 0
+    for file_path in file_paths:
+        if missing_output_package(file_path):
+            update_system_log("load_saved_recipes", f"{file_path} skipped:  {missing_output_package(file_path)}", level="warning")
+            continue
+
+        # The recipe type of a CSV file's recipes is only recorded in its name ("Recipes - <recipe type>[ - Details].csv"):
+        file_recipe_type = None
+        if os.path.dirname(file_path) == folder:
+            file_name = os.path.basename(file_path)
+            file_recipe_type = os.path.splitext(file_name[:-3] if file_name.lower().endswith(".gz") else file_name)[0].removeprefix("Recipes - ").removesuffix(" - Details")
+        try:
+            for row in read_recipe_file(file_path):
+                recipe_type = row.get("recipe_type") or file_recipe_type
+                if recipe_type is None:  # Details of unknown recipe type (older partition):  Only indexed if the recipe is held
+                    if row["url"] not in recipe_store:
+                        continue
+                elif recipe_types is None or recipe_type in recipe_types:
+                    recipe_store.add(recipe_type, row["name"], row["url"])
+                else:
+                    continue
+                if row.get("ingredients"):
+                    recipe_search_index.add_details(row["url"], row)
+        except:  # An error has occurred.  Update system log with error details, and load the other files:
+            update_system_log("load_saved_recipes", traceback.format_exc())
+            continue
+        files_read += 1
+
+    return files_read
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Function which adds fields (e.g., category or url) to every system log record made by the code run within a "with" block (in the same thread or asyncio task)"""
+    token = log_context_fields.set({**log_context_fields.get(), **fields})
+    try:
+        yield
+    finally:
+        log_context_fields.reset(token)
+
+
+def missing_output_package(file_path):
+    """Function which checks that the package needed for writing an output file (according to its extension) is installed, so that a missing package is reported before any scraping starts.  Returns a message naming the missing package, or None if nothing is missing"""
+    if file_path.lower().endswith("." + FILE_FORMAT_PARQUET) and importlib.util.find_spec("pyarrow") is None:
+        return PARQUET_MISSING_PACKAGE_MESSAGE
+    return None
+
+
+def notify_user(title, message):
+    """Function which informs user of an event or error:  In a message box in GUI mode, otherwise on the console (unless muted, see user_notifications_muted).  It can be called from any thread"""
+    if user_notifications_muted.get():
+        return
+    if window is None:
+        print(f"{title}: {message}", file=sys.stderr)
+    elif threading.current_thread() is threading.main_thread():
+        messagebox.showinfo(title, message)
+    else:
+        # Tkinter may only be used from the main (GUI) thread, so pass the message on to it:
+        post_gui_event("message", title, message)
+
+
+def open_recipe_sink(file_path, output, sort_key=None):
+    """Function which opens the sink to which rows of a kind of output (e.g., OUTPUT_RECIPES) are written, according to the output file's extension:  An SQLite database (".sqlite"), a Parquet file (".parquet"), or else a CSV or JSON Lines file.  Rows are written in the order of sort_key, if given"""
+    table_name, csv_columns, table_columns = output
+    if file_path.lower().endswith("." + FILE_FORMAT_SQLITE):
+        return SQLiteSink(file_path, table_name, table_columns, sort_key)
+    if file_path.lower().endswith("." + FILE_FORMAT_PARQUET):
+        return ParquetSink(file_path, table_columns, sort_key)
+    return RecipeWriter(file_path, csv_columns, sort_key)
+
+
+def output_file_extension(file_format, compressed=False):
+    """Function which returns the extension of output files of a format, gzip-compressed if so requested (SQLite databases and Parquet files are never gzip-compressed)"""
+    return "." + file_format + (".gz" if compressed and file_format in (FILE_FORMAT_CSV, FILE_FORMAT_JSONL) else "")
+
+
+def parse_html_document(html):
+    """Function which parses the HTML of a page (lightweight fetch backend).  Returns the parser, which exposes the page's element tree ("root") and its elements indexed by "id" ("elements_by_id")"""
+    with metrics.timer("parse"):
+        parser = HTMLDocumentParser()
+        parser.feed(html)
+        parser.close()
+    return parser
+
+
+def parse_recipe_details(html, url):
+    """Function which extracts the details of a recipe (ingredients, times, servings and rating) from its page's JSON-LD "Recipe" block"""
+
+    # Find the first JSON-LD block of the page which contains a recipe:
+    recipe = None
+    for element in parse_html_document(html).root.iter("script"):
+        if (element.get_attribute("type") or "").strip().lower() != "application/ld+json":
+            continue
+        try:
+            recipe = find_json_ld_recipe(json.loads("".join(child for child in element.children if isinstance(child, str))))
+        except ValueError:  # Malformed JSON-LD block.  Skip it.
+            continue
+        if recipe:
+            break
+    recipe = recipe or {}
+
+    # Capture the recipe's servings (JSON-LD allows a single value or a list of equivalent values) and rating:
+    servings = recipe.get("recipeYield")
+    if isinstance(servings, list):
+        servings = servings[0] if servings else None
+    rating = recipe.get("aggregateRating") or {}
+    try:
+        rating_value = float(rating.get("ratingValue"))
+    except (TypeError, ValueError):
+        rating_value = None
+    try:
+        rating_count = int(rating.get("ratingCount") or rating.get("reviewCount"))
+    except (TypeError, ValueError):
+        rating_count = None
+
+    return {
+        "url": url,
+        "name": recipe.get("name"),
+        "ingredients": [str(ingredient).strip() for ingredient in recipe.get("recipeIngredient") or []],
+        "prep_time": iso_duration_to_minutes(recipe.get("prepTime")),
+        "cook_time": iso_duration_to_minutes(recipe.get("cookTime")),
+        "total_time": iso_duration_to_minutes(recipe.get("totalTime")),
+        "servings": str(servings) if servings is not None else None,
+        "rating": rating_value,
+        "rating_count": rating_count,
+        "json_ld": recipe or None,
+    }
+
+
+def poll_gui_events():
+    """Function which applies the progress, messages and results passed on by the background scraping worker to the GUI.  It runs on the main (GUI) thread, every GUI_POLL_INTERVAL milliseconds while the worker is running"""
+    try:
+        while True:
+            try:
+                event, *args = gui_event_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if event == "message":
+                messagebox.showinfo(*args)
+            elif event == "progress":
+                show_scrape_progress(*args)
+            elif event == "recipe_types":
+                show_recipe_types(*args)
+            elif event == "done":
+                set_scrape_controls_running(False)
+
+    except:  # An error has occurred.
+        # Inform user:
+        notify_user("Error", f"Error (poll_gui_events): {traceback.format_exc()}")
+
+        # Update system log with error details:
+        update_system_log("poll_gui_events", traceback.format_exc())
+
+    # Keep checking for as long as the worker (or the recipe types refresh) is running, or has left events to be applied:
+    if any(thread is not None and thread.is_alive() for thread in (scrape_worker, recipe_types_refresher)) or not gui_event_queue.empty():
+        window.after(GUI_POLL_INTERVAL, poll_gui_events)
+
+
+def post_gui_event(event, *args):
+    """Function which passes an event (progress, message or result) from the background scraping worker on to the GUI (see poll_gui_events)"""
+    gui_event_queue.put((event,) + args)
+
+
+def read_page_from_cache(url):
+    """Function which returns the final URL and HTML of a cached page which may be used without contacting the website (a fresh page or, in offline mode, any cached page).  Returns None if there is no such page"""
+    if not url or cache_mode == CACHE_MODE_DISABLED:
+        return None
+
+    cached = page_cache.get(url)
+    if cached and (cached["fresh"] or cache_mode == CACHE_MODE_OFFLINE):
+        return cached["final_url"], cached["html"]
+    return None
+
+
+def read_recipe_file(file_path):
+    """Function which reads the rows of an output file (see open_recipe_sink), whatever its format, as dictionaries with (at least) the keys name and url, plus recipe_type if recorded in the file and ingredients (a list) for recipe details"""
+    file_path_lower = file_path.lower()
+    with contextlib.ExitStack() as stack:
+
+        # SQLite database or Parquet file:  One row per recipe, with the table columns (lists are written as JSON text):
+        if file_path_lower.endswith("." + FILE_FORMAT_SQLITE) or file_path_lower.endswith("." + FILE_FORMAT_PARQUET):
+            if file_path_lower.endswith("." + FILE_FORMAT_SQLITE):
+                connection = stack.enter_context(contextlib.closing(sqlite3.connect(file_path)))
+                connection.row_factory = sqlite3.Row
+                table = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' LIMIT 1").fetchone()
+                rows = (dict(row) for row in connection.execute(f'SELECT * FROM "{table[0]}"')) if table else ()
+            else:
+                import pyarrow.parquet
+                rows = (row for batch in pyarrow.parquet.ParquetFile(file_path).iter_batches() for row in batch.to_pylist())
+            for row in rows:
+                if row.get("ingredients"):
+                    row["ingredients"] = json.loads(row["ingredients"])
+                yield row
+            return
+
+        # JSON Lines file (the rows as they were written) or CSV file (the CSV columns, mapped back to the rows' keys):
+        file = stack.enter_context((gzip.open if file_path_lower.endswith(".gz") else open)(file_path, mode="rt", newline="", encoding="utf-8"))
+        if re.search(r"\.jsonl?(\.gz)?$", file_path_lower):
+            yield from (json.loads(line) for line in file if line.strip())
+            return
+        for record in csv.DictReader(file):
+            link = re.fullmatch(r'=HYPERLINK\("(.*)"\)', record["URL"])
+            row = {"name": record["Recipe"], "url": link.group(1).replace('""', '"') if link else record["URL"]}
+            if record.get("Recipe Type"):
+                row["recipe_type"] = record["Recipe Type"]
+            if "Ingredients" in record:
+                row["ingredients"] = record["Ingredients"].split(" | ") if record["Ingredients"] else []
+            yield row
+
+
+def read_scrape_checkpoint(checkpoint_path):
+    """Function which returns the recipe types completed by a previous scrape run, as recorded in its checkpoint file (an empty list if there is none)"""
+    try:
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            return json.load(checkpoint_file)["completed_recipe_types"]
+    except FileNotFoundError:
+        return []
+
+
+def recipe_details_file_path(file_path):
+    """Function which returns the path of the recipe-details file written alongside a recipe file (same folder, format and compression)"""
+    base, compression = (file_path[:-3], file_path[-3:]) if file_path.lower().endswith(".gz") else (file_path, "")
+    base, extension = os.path.splitext(base)
+    return base + " - Details" + extension + compression
+
+
+def recipe_type_file_path(folder, recipe_type, extension=".csv"):
+    """Function which returns the path of the output file for a recipe type within a folder, replacing characters not allowed in file names"""
+    return os.path.join(folder, "Recipes - " + re.sub(r'[\\/:*?"<>|]', "_", recipe_type) + extension)
+
+
+def remove_orphaned_partitions(work_queue, folder):
+    """Function which removes the partitions of recipe details, in an output folder, not recorded as the output of completed tasks in a distributed crawl's work queue (left by a worker which stopped, or lost its lease, before recording them)"""
+    partition_folder = os.path.join(folder, WORK_QUEUE_PARTITION_FOLDER_NAME)
+    outputs = {os.path.normcase(os.path.abspath(output)) for output in work_queue.outputs()}
+    for file_name in os.listdir(partition_folder) if os.path.isdir(partition_folder) else []:
+        file_path = os.path.join(partition_folder, file_name)
+        if os.path.normcase(os.path.abspath(file_path)) not in outputs:
+            with contextlib.suppress(OSError):
+                os.remove(file_path)
+
+
 def run_app():
-    """Main function used to run this application"""
+    """Main function used to run this application (GUI mode)"""
+    global window, selected_recipe_type, include_recipe_details, sort_recipes
+
     try:
-        # Inform user that retrieval of recipe types will commence:
-        messagebox.showinfo("Get Recipe Types", f"Click on the OK button to begin retrieving the recipe types for you to select from.\n\nOnce you click on OK, please wait a brief moment and the main application window will appear.")
+        # Import Tkinter, then create the main application window.  Withdraw it from sight until it has been fully configured
+        # and ready for the user to interact with:
+        load_gui_toolkit()
+        window = tk.Tk()
+        window.withdraw()
 
-        # Scrape the recipe website and retrieve available recipe types.  This list of recipe types will feed the combo box
-        # on the main application window.  If an error occurs, exit this application:
-        if not get_recipe_types():
-            exit()
+        # Create the variables which store the user's choices:
+        selected_recipe_type = tk.StringVar()
+        include_recipe_details = tk.BooleanVar()
+        sort_recipes = tk.BooleanVar(value=True)
 
         # Creates and configure all visible aspects of the main application window.  If an error
         # occurs, exit this application:
         if not window_config():
             exit()
 
+        # List the recipe types saved by the previous run, so that the user can begin interacting with the window at once
+        # (without waiting for the recipe website):
+        saved_recipe_types, saved_at = scrape_state_store.load_recipe_types(url_recipe_site)
+        if saved_recipe_types:
+            show_recipe_types(saved_recipe_types, saved_at, refreshing=True)
+
         # Bring the main application window to sight so that the user can begin interacting with it:
         # window.attributes("-topmost", True)
         window.deiconify()
 
+        # Scrape the recipe website and retrieve available recipe types in the background.  Once retrieved, they will feed
+        # (or, if saved recipe types are listed, update) the combo box on the main application window.  Saved recipe types
+        # are refreshed without holding up the Get Recipes buttons; otherwise, the user has to wait for the background worker:
+        if saved_recipe_types:
+            start_recipe_types_refresh(saved_recipe_types, saved_at)
+        else:
+            start_scrape_job(get_recipe_types)
+
         # From this point, test will start and end based on user's use of the start/end button, with subsequent
-        # functionality defined from there.
+        # functionality defined from there.  Keep application window open until user closes it:
+        window.mainloop()
 
     except SystemExit:  # Exiting application.
         exit()
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (run_app): {traceback.format_exc()}")
+        notify_user("Error", f"Error (run_app): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("run_app", traceback.format_exc())
@@ -287,36 +2983,756 @@ def run_app():
         exit()
 
 
+def run_crawl_coordinator(work_queue, recipe_types, include_details=False, wait=True):
+    """Function which starts (or adds to) a distributed crawl:  It adds a task for each recipe type (a list of recipe type, link pairs) to the work queue shared with the workers.  If wait is True, it then reports the crawl's progress until every task has been done.  Returns True if every task succeeded"""
+    added = work_queue.enqueue({"url": url, "kind": WorkQueue.KIND_RECIPE_TYPE, "recipe_type": recipe_type, "include_details": include_details}
+                               for recipe_type, url in recipe_types)
+    update_system_log("run_crawl_coordinator", f"{added} recipe type(s) queued ({len(recipe_types) - added} already queued) in {work_queue.path}", level="info")
+    if not wait:
+        return True
+
+    # Report the progress of the workers until the queue is drained:
+    while True:
+        counts = work_queue.counts()
+        update_system_log("run_crawl_coordinator", "  ".join(f"{kind}: " + ", ".join(f"{counts[kind].get(state, 0)} {state}" for state in (WorkQueue.STATE_PENDING, WorkQueue.STATE_LEASED, WorkQueue.STATE_DONE, WorkQueue.STATE_FAILED))
+                                                        for kind in (WorkQueue.KIND_RECIPE_TYPE, WorkQueue.KIND_RECIPE)), level="info")
+        if work_queue.is_drained():
+            return not any(kind_counts.get(WorkQueue.STATE_FAILED) for kind_counts in counts.values())
+        time.sleep(WORK_QUEUE_POLL_INTERVAL * 5)
+
+
+def run_crawl_worker(work_queue, folder, extension=".csv", batch_size=WORK_QUEUE_BATCH_SIZE, cancel_event=None):
+    """Function which works on a distributed crawl until its work queue is drained (or cancel_event is set):  It claims tasks from the queue shared with other workers (possibly on other machines, sharing the output folder), scraping each recipe type to its own file and crawling recipe pages in batches, each batch's details written to its own partition file.  Returns the number of tasks processed (done or failed)"""
+    os.makedirs(os.path.join(folder, WORK_QUEUE_PARTITION_FOLDER_NAME), exist_ok=True)
+    tasks_processed = 0
+    while cancel_event is None or not cancel_event.is_set():
+        # Claim the next task(s).  If none is available, wait for tasks to be added (or for an expired lease), unless there is
+        # nothing left to do:
+        lease = work_queue.claim(batch_size)
+        if lease is None:
+            if work_queue.is_drained():
+                break
+            time.sleep(WORK_QUEUE_POLL_INTERVAL)
+            continue
+
+        # Work on the tasks, keeping their lease (renewed from a background thread) meanwhile:
+        lease_id, kind, tasks = lease
+        try:
+            with work_queue.keep_lease(lease_id):
+                if kind == WorkQueue.KIND_RECIPE_TYPE:
+                    completed = work_recipe_type_task(work_queue, lease_id, tasks[0], folder, extension)
+                else:
+                    completed = work_recipe_tasks(work_queue, lease_id, tasks, folder, extension)
+        except:  # An error has occurred (or the worker is being stopped).  Give the tasks up, so that they are claimed again:
+            update_system_log("run_crawl_worker", traceback.format_exc())
+            work_queue.release(lease_id)
+            raise
+        if completed:
+            tasks_processed += len(tasks)
+        metrics.increment("work_queue_tasks_total", len(tasks), kind=kind, outcome="completed" if completed else "lease_lost")
+
+    # Once the crawl is complete, remove any partitions left by workers which stopped before recording them:
+    if work_queue.is_drained():
+        remove_orphaned_partitions(work_queue, folder)
+    return tasks_processed
+
+
+def run_cli(argv=None):
+    """Function which runs this application from the command line.  Without a command (or with the "gui" command), the GUI is started; any other command runs without GUI.  Returns the exit code for the process"""
+    global fetch_backend, driver_profile, cache_mode, url_recipe_site, site_profile_path
+
+    # Define the command-line arguments:
+    parser = argparse.ArgumentParser(prog="main.py", description="Scrape recipe data from www.allrecipes.com.")
+    parser.add_argument("--backend", choices=[FETCH_BACKEND_HTTP, FETCH_BACKEND_SELENIUM], default=fetch_backend, help="fetch backend to try first (default: %(default)s)")
+    parser.add_argument("--driver-profile", choices=[DRIVER_PROFILE_LEAN, DRIVER_PROFILE_STANDARD], default=driver_profile, help="profile of the browsers started by the Selenium backend (default: %(default)s)")
+    parser.add_argument("--cache", choices=[CACHE_MODE_NORMAL, CACHE_MODE_OFFLINE, CACHE_MODE_DISABLED], default=cache_mode, help="page cache mode (default: %(default)s)")
+    parser.add_argument("--site", default=url_recipe_site, metavar="URL", help="main page of the recipe website (default: %(default)s)")
+    parser.add_argument("--site-profile", default=site_profile_path, metavar="FILE", help="site profile describing the website's layout (default: site_profile.json)")
+    parser.add_argument("--metrics-file", metavar="FILE", help="write the metrics collected (Prometheus text format) to a file when done")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="serve the metrics collected (Prometheus text format) at http://localhost:PORT/metrics")
+    parser.add_argument("--profile", metavar="FILE", help="profile the run with cProfile, writing the statistics to a file (see the pstats module)")
+    parser.add_argument("--min-interval", type=float, default=host_rate_limiter.min_interval, metavar="SECONDS",
+                        help="minimum time between two requests to the same host (politeness limit, which caps the rate of requests to the website whatever the concurrency) (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.add_parser("gui", help="start the GUI (default)")
+    subparsers.add_parser("types", help="list the available recipe types")
+    parser_scrape = subparsers.add_parser("scrape", help="scrape recipes to files, without GUI")
+    parser_scrape.add_argument("--categories", nargs="+", metavar="RECIPE_TYPE", help="recipe types to scrape (default: all)")
+    parser_scrape.add_argument("--out", required=True, metavar="FOLDER", help="folder in which the output files are created")
+    parser_scrape.add_argument("--format", choices=[FILE_FORMAT_CSV, FILE_FORMAT_JSONL, FILE_FORMAT_SQLITE, FILE_FORMAT_PARQUET], default=FILE_FORMAT_CSV, help="output file format (default: %(default)s)")
+    parser_scrape.add_argument("--gzip", action="store_true", help="gzip-compress the output files (CSV and JSON Lines)")
+    parser_scrape.add_argument("--details", action="store_true", help="also crawl each recipe's page for its details (ingredients, times, rating)")
+    parser_scrape.add_argument("--incremental", action="store_true", help="only write the recipes added, removed or changed since the previous run")
+    parser_scrape.add_argument("--quick", action="store_true", help="with --incremental:  stop following a recipe type's pages at the first page listing no new recipe, and only crawl the details of added and changed recipes (faster, but renames and removals past that page, and changed details of unchanged recipes, are not reported)")
+    parser_scrape.add_argument("--workers", type=int, default=SCRAPE_MAX_WORKERS, help="recipe types scraped concurrently (default: %(default)s)")
+    parser_scrape.add_argument("--sort", action="store_true", help="write each recipe type's recipes sorted by recipe name (held until the recipe type has been scraped)")
+    parser_scrape.add_argument("--resume", action="store_true", help="skip the recipe types completed by a previous (interrupted) run into the same folder")
+    parser_search = subparsers.add_parser("search", help="search the recipes saved in a folder (by the scrape command) by name and, if their details were saved, ingredients")
+    parser_search.add_argument("query", help="words to search for (the last one also as a prefix)")
+    parser_search.add_argument("--folder", required=True, metavar="FOLDER", help="folder in which the scrape command saved the recipes (any format)")
+    parser_search.add_argument("--categories", nargs="+", metavar="RECIPE_TYPE", help="recipe types to search (default: all)")
+    parser_search.add_argument("--limit", type=int, default=SEARCH_RESULTS_LIMIT, help="maximum number of recipes listed (default: %(default)s)")
+    parser_coordinator = subparsers.add_parser("coordinator", help="queue recipe types for a distributed crawl, and report its progress")
+    parser_coordinator.add_argument("--queue", required=True, metavar="FILE", help="work queue (SQLite database) shared with the workers")
+    parser_coordinator.add_argument("--categories", nargs="+", metavar="RECIPE_TYPE", help="recipe types to crawl (default: all)")
+    parser_coordinator.add_argument("--details", action="store_true", help="also crawl each recipe's page for its details")
+    parser_coordinator.add_argument("--no-wait", action="store_true", help="exit once the recipe types are queued")
+    parser_worker = subparsers.add_parser("worker", help="work on a distributed crawl until its queue is drained")
+    parser_worker.add_argument("--queue", required=True, metavar="FILE", help="work queue (SQLite database) shared with the coordinator")
+    parser_worker.add_argument("--out", required=True, metavar="FOLDER", help="folder (shared by all workers) in which the output files are created")
+    parser_worker.add_argument("--format", choices=[FILE_FORMAT_CSV, FILE_FORMAT_JSONL, FILE_FORMAT_SQLITE, FILE_FORMAT_PARQUET], default=FILE_FORMAT_CSV, help="output file format (default: %(default)s)")
+    parser_worker.add_argument("--gzip", action="store_true", help="gzip-compress the output files (CSV and JSON Lines)")
+    parser_worker.add_argument("--batch", type=int, default=WORK_QUEUE_BATCH_SIZE, help="recipe pages claimed at a time (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    fetch_backend = args.backend
+    driver_profile = args.driver_profile
+    cache_mode = args.cache
+    url_recipe_site = args.site
+    site_profile_path = args.site_profile
+    host_rate_limiter.min_interval = max(0.0, args.min_interval)
+
+    # Serve the metrics collected while scraping, if so requested:
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    # Run the requested command, profiling it if so requested (cProfile is only imported if needed):
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        return run_cli_command(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+        system_log.flush()
+
+
+def run_cli_command(args):
+    """Function which runs the command given on the command line (see run_cli).  Returns the exit code for the process"""
+
+    # Run the requested command:
+    if args.command in (None, "gui"):
+        run_app()
+        return 0
+
+    # Show the progress logged while the command runs (see StructuredLogger) on the console:
+    system_log.console = sys.stderr
+
+    # Ensure that the output files can be written before scraping starts:
+    if args.command in ("scrape", "worker") and missing_output_package(output_file_extension(args.format, args.gzip)):
+        print(missing_output_package(output_file_extension(args.format, args.gzip)), file=sys.stderr)
+        return 2
+
+    # Worker of a distributed crawl (the recipe types to scrape are taken from the work queue):
+    if args.command == "worker":
+        extension = output_file_extension(args.format, args.gzip)
+        print(f"{run_crawl_worker(WorkQueue(args.queue), args.out, extension, args.batch)} task(s) processed")
+        return 0
+
+    # Search command.  Search the recipes saved by previous runs (the website is not contacted):
+    if args.command == "search":
+        if not load_saved_recipes(args.folder, set(args.categories) if args.categories else None):
+            print(f"No saved recipes found in {args.folder}", file=sys.stderr)
+            return 1
+        unknown_recipe_types = [recipe_type for recipe_type in args.categories or [] if recipe_type not in recipe_store.recipe_types()]
+        if unknown_recipe_types:
+            print("No saved recipes for recipe type(s): " + ", ".join(unknown_recipe_types), file=sys.stderr)
+            return 2
+        for recipe in search_recipes(args.query, limit=args.limit):
+            print(f"{recipe.name}\t{recipe.recipe_type}\t{recipe.url}")
+        return 0
+
+    recipe_types = scrape_recipe_types()
+    if recipe_types is None:
+        return 1
+    recipe_type_urls.update(recipe_types)
+
+    if args.command == "types":
+        for recipe_type, _ in recipe_types:
+            print(recipe_type)
+        return 0
+
+    # Scrape or coordinator command.  Ensure that the requested recipe types exist:
+    unknown_recipe_types = [recipe_type for recipe_type in args.categories or [] if recipe_type not in recipe_type_urls]
+    if unknown_recipe_types:
+        print("Unknown recipe type(s): " + ", ".join(unknown_recipe_types), file=sys.stderr)
+        return 2
+
+    if args.command == "coordinator":
+        selected = [(recipe_type, recipe_type_urls[recipe_type]) for recipe_type in args.categories] if args.categories else recipe_types
+        return 0 if run_crawl_coordinator(WorkQueue(args.queue), selected, args.details, not args.no_wait) else 1
+
+    extension = output_file_extension(args.format, args.gzip)
+    return 0 if scrape_to_folder(args.categories or [recipe_type for recipe_type, _ in recipe_types], args.out, extension, args.details, args.incremental, args.workers, args.resume, args.sort, args.quick) else 1
+
+
+def run_scrape_job(job, *args):
+    """Function which runs a scraping job on the background scraping worker, informing the GUI once it has finished"""
+    try:
+        job(*args)
+    finally:
+        system_log.flush()
+        post_gui_event("done")
+
+
+def search_recipes(query, recipe_type=None, limit=None):
+    """Function which searches the recipes scraped so far (see RecipeSearchIndex) for those matching every word of a query (the last word also as a prefix), optionally only those listed under a recipe type.  Returns the matching recipes (Recipe objects), sorted by name"""
+    return recipe_search_index.search(query, recipe_type, limit)
+
+
+def scrape_job_all_recipes(recipe_types, folder_path, sort=True):
+    """Function which scrapes every recipe type and writes one CSV file per recipe type to a folder (Get All Recipes, run on the background scraping worker)"""
+    try:
+        # Scrape all recipe types concurrently, writing the recipes of each recipe type to its own CSV file (if requested,
+        # sorted by recipe name, as the files are meant to be opened as spreadsheets; otherwise as they are captured).  As
+        # soon as a recipe type has been scraped, report the progress made:
+        files_created = 0
+        recipes_found = 0
+        failed_recipe_types = []
+        post_gui_event("progress", "recipe types", 0, len(recipe_types), 0)
+        scraped = iter_recipe_categories_to_files(recipe_types, lambda recipe_type: recipe_type_file_path(folder_path, recipe_type), cancel_event=scrape_cancel_event, sort=sort)
+        for done, (recipe_type, recipes, _) in enumerate(scraped, 1):
+            if recipes is None:
+                failed_recipe_types.append(recipe_type)
+            else:
+                recipe_store.add_many(recipe_type, recipes)
+                files_created += 1
+                recipes_found += len(recipes)
+            post_gui_event("progress", "recipe types", done, len(recipe_types), recipes_found)
+
+        # Inform user of the outcome:
+        message = f"{files_created} recipe file(s) have been created in the following folder:\n\n{folder_path}"
+        if scrape_cancel_event.is_set():
+            message = "Retrieval of recipes was cancelled.  " + message
+        if failed_recipe_types:
+            message += "\n\nThe following recipe type(s) could not be retrieved:\n" + "\n".join(failed_recipe_types)
+        notify_user("Recipe Files Created", message)
+
+    except:  # An error has occurred.
+        # Inform user:
+        notify_user("Error", f"Error (scrape_job_all_recipes): {traceback.format_exc()}")
+
+        # Update system log with error details:
+        update_system_log("scrape_job_all_recipes", traceback.format_exc())
+
+
+def scrape_job_recipes(recipe_type, file_path, include_details, sort=True):
+    """Function which scrapes a recipe type and writes its recipes (and, if requested, their details) to file(s) (Get Recipes, run on the background scraping worker)"""
+    try:
+        # Report the progress made after each of the recipe type's pages (their number is not known in advance), stopping
+        # at the next page once the user has cancelled:
+        pages_scraped = 0
+        recipes_found = 0
+
+        def report_page(_, page_recipes):
+            nonlocal pages_scraped, recipes_found
+            pages_scraped += 1
+            recipes_found += len(page_recipes)
+            post_gui_event("progress", "recipe list pages", pages_scraped, None, recipes_found)
+            return scrape_cancel_event.is_set()
+
+        # Scrape the recipe website for the name and link of each recipe pertaining to the recipe type, writing them to the
+        # file (if requested, sorted by recipe name, as the file is meant to be opened as a spreadsheet; otherwise as they
+        # are captured).  If an error occurs or the user has cancelled meanwhile, no file is kept:
+        post_gui_event("progress", "recipe list pages", 0, None, 0)
+        recipes = [recipes for _, recipes, _ in iter_recipe_categories_to_files([recipe_type], lambda _: file_path, max_workers=1, cancel_event=scrape_cancel_event,
+                                                                               sort=sort, on_page=report_page)][0]
+        if recipes is None or scrape_cancel_event.is_set():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(file_path)
+            return None
+        files_created = [file_path]
+
+        # Add the recipes just scraped to the recipe store:
+        recipe_store.add_many(recipe_type, recipes)
+
+        # If requested by user, follow each recipe's link and capture the recipe's details (ingredients, times, servings and
+        # rating), writing them to a second file as they are captured and reporting the progress made:
+        if include_details:
+            file_path_details = recipe_details_file_path(file_path)
+            recipe_urls = list(recipes)
+            post_gui_event("progress", "recipe pages", 0, len(recipe_urls), len(recipes))
+            write_recipe_details_to_file(file_path_details, recipe_type, recipe_urls, cancel_event=scrape_cancel_event,
+                                         on_progress=lambda done: post_gui_event("progress", "recipe pages", done, len(recipe_urls), len(recipes)))
+            files_created.append(file_path_details)
+
+        # Inform user that the file(s) have been created:
+        message = "The following file(s) have been created:\n\n" + "\n".join(files_created)
+        if scrape_cancel_event.is_set():
+            message = "Retrieval of recipe details was cancelled.  " + message
+        notify_user("Recipe File Created", message)
+
+    except:  # An error has occurred.
+        # Inform user:
+        notify_user("Error", f"Error (scrape_job_recipes): {traceback.format_exc()}")
+
+        # Update system log with error details:
+        update_system_log("scrape_job_recipes", traceback.format_exc())
+
+
+def scrape_recipe_categories(recipe_types, max_workers=SCRAPE_MAX_WORKERS):
+    """Function which scrapes several recipe types concurrently (all of them, or a selected set).  Returns a dictionary of recipe type -> recipes (None for a recipe type which could not be scraped), in the order the recipe types were given"""
+    results = dict(iter_recipe_categories(recipe_types, max_workers))
+    return {recipe_type: results[recipe_type] for recipe_type in recipe_types}
+
+
+def scrape_recipes_incremental(recipe_types, include_details=False, state_store=None, max_workers=SCRAPE_MAX_WORKERS, quick=False):
+    """Function which scrapes recipe types and returns only the recipes added, removed or changed since the previous run (as recorded in the scrape state store), recording the new state.  Every page of each recipe type is followed (unchanged pages are revalidated with the website rather than downloaded again, see PageCache), and, if requested, the details of every recipe listed are crawled, so that a recipe whose details have changed is reported as changed.  If quick is True, a recipe type's pages are only followed until a page lists no recipe not already known (new recipes are listed first), and details are only crawled for added and changed recipes:  Faster, but recipes renamed or removed past that page, and changed details of unchanged recipes, are not reported.  Returns the changes and the recipe types which could not be scraped"""
+    state_store = state_store or scrape_state_store
+
+    # In quick mode, stop following a recipe type's pages at the first page all of whose recipes are already known.  Recipes
+    # listed on the pages not followed cannot be found to be removed:
+    partially_scraped = set()
+
+    def stop_at_known_page(recipe_type, page_recipes):
+        if page_recipes and all(state_store.is_known(url, recipe_type) for url in page_recipes):
+            partially_scraped.add(recipe_type)
+            metrics.increment("recipe_types_stopped_early_total")
+            return True
+        return False
+
+    # Scrape the recipe types concurrently, and compare each with its previous state.  A recipe type which could not be
+    # scraped is left untouched (rather than reporting all of its recipes as removed):
+    delta = []
+    failed_recipe_types = []
+    listed = {}  # Link -> recipe type and name of each recipe listed (recipes whose details are crawled)
+    for recipe_type, recipes in iter_recipe_categories(recipe_types, max_workers, on_page=stop_at_known_page if quick else None):
+        if recipes is None:
+            failed_recipe_types.append(recipe_type)
+            continue
+        delta.extend(state_store.apply(recipe_type, recipes, complete=recipe_type not in partially_scraped))
+        if not quick:
+            listed.update((url, (recipe_type, name)) for url, name in recipes.items())
+
+    # If requested, crawl the details of the recipes (in quick mode, only of the added and changed recipes), recording the
+    # fingerprint of each recipe's details for the next run.  The details are added to the changes if they are new or have
+    # changed since they were last crawled (a recipe otherwise unchanged is then reported as changed):
+    if include_details:
+        rows_by_url = {row["url"]: row for row in delta if row["change"] != ScrapeStateStore.CHANGE_REMOVED}
+        for details in get_recipe_details(list(listed) if not quick else list(rows_by_url)):
+            if state_store.apply_details(details["url"], details):
+                if details["url"] not in rows_by_url:
+                    recipe_type, name = listed[details["url"]]
+                    rows_by_url[details["url"]] = {"change": ScrapeStateStore.CHANGE_CHANGED, "recipe_type": recipe_type, "name": name, "url": details["url"]}
+                    delta.append(rows_by_url[details["url"]])
+                rows_by_url[details["url"]]["details"] = details
+
+    return delta, failed_recipe_types
+
+
+def scrape_recipe_pages(url, fetch_page, on_page=None, progress=None):
+    """Function which captures the name and link of each recipe listed on a recipe type's page and on each of its next pages (see Paginator), downloading each page with a given function (returning the final URL and HTML of a page).  A recipe listed on several pages is captured once.  If given, on_page is called with the recipes newly captured from each page (see scrape_recipes).  The progress made is recorded in progress (see RecipeListProgress), if given:  If another fetch backend has failed part way, its pages are resumed from the page at which it failed.  Returns a dictionary of recipe link -> name"""
+    paginator = get_site_profile().pagination["recipes"]
+    progress = progress if progress is not None else RecipeListProgress()
+    recipes = progress.recipes
+    visited_urls = set()
+    page_count = progress.page_count if progress.next_url else 0
+    url = progress.next_url or url
+
+    # Download the first page.  While a page is being parsed and its recipes captured, its next page (if any) is already
+    # being downloaded in the background (prefetching), so that the time spent waiting for the website and the time spent
+    # processing pages overlap:
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") as prefetcher:
+        pending_page = prefetcher.submit(contextvars.copy_context().run, fetch_page, url)
+        while pending_page is not None:
+            page_url, html = pending_page.result()
+            visited_urls.update((url, page_url))
+            page_count += 1
+            progress.page_count = page_count
+            metrics.increment("recipe_list_pages_total")
+
+            # Start downloading the next page, unless it has been visited already (pages linking back) or the page limit has
+            # been reached:
+            document = parse_html_document(html)
+            url = paginator.next_page_url(document, page_url)
+            pending_page = None
+            if url and url not in visited_urls and page_count < paginator.max_pages:
+                pending_page = prefetcher.submit(contextvars.copy_context().run, fetch_page, url)
+
+            # Capture the recipes not already captured from a previous page (recipes are identified by their link):
+            page_recipes = {recipe_url: name for recipe_url, name in extract_recipes_from_document(document, page_url).items() if recipe_url not in recipes}
+            recipes.update(page_recipes)
+            if on_page is not None and on_page(page_recipes) and pending_page is not None:
+                pending_page.cancel()
+                pending_page = None
+
+            # Record the page being downloaded as the next page to be scraped (the page to resume from, if its download fails):
+            progress.next_url = url if pending_page is not None else None
+
+    return recipes
+
+
+def scrape_recipe_pages_in_driver(driver, url, on_page=None, progress=None):
+    """Function which captures the name and link of each recipe listed on the recipe type's page currently loaded in a Selenium driver (its first page, or the page to resume from, see scrape_recipe_pages), loading more recipes ("load more" / infinite scrolling) and going to each of its next pages (see Paginator).  A recipe listed several times is captured once.  If given, on_page is called with the recipes newly captured from each page (see scrape_recipes).  The progress made is recorded in progress, if given.  Returns a dictionary of recipe link -> name"""
+    profile = get_site_profile()
+    paginator = profile.pagination["recipes"]
+    progress = progress if progress is not None else RecipeListProgress()
+    recipes = progress.recipes
+    visited_urls = {url, driver.current_url}
+    page_count = progress.page_count if progress.next_url else 0
+
+    while True:
+        # Load all of the page's recipes, then capture those not already captured (recipes are identified by their link) in a
+        # single round trip (retried if the browser fails transiently, e.g. while the page is still changing):
+        while paginator.load_more_in_driver(driver, profile.lists["recipes"]):
+            pass
+        page_count += 1
+        progress.page_count = page_count
+        metrics.increment("recipe_list_pages_total")
+        page_recipes = {recipe_url: name for recipe_url, name in retry_policy.call(url, lambda: extract_recipes_bulk(driver)).items() if recipe_url not in recipes}
+        recipes.update(page_recipes)
+        store_page_in_cache(url, driver)
+        progress.next_url = None
+        if on_page is not None and on_page(page_recipes):
+            return recipes
+
+        # Go to the next page, unless it has been visited already (pages linking back) or the page limit has been reached.
+        # Record it as the next page to be scraped (the page to resume from, if loading it fails):
+        url = paginator.next_page_url_in_driver(driver)
+        if not url or url in visited_urls or page_count >= paginator.max_pages:
+            return recipes
+        progress.next_url = url
+        load_page_in_driver(driver, url)
+        visited_urls.update((url, driver.current_url))
+
+
+def scrape_recipe_types():
+    """Function which scrapes the name and link of each recipe type, trying the configured fetch backend first and falling back to Selenium.  Returns None if an error occurs"""
+
+    # Try the lightweight (HTTP) fetch backend first, if so configured.  If it fails or finds nothing (e.g., the page
+    # requires JavaScript to render its contents), fall back to the Selenium fetch backend:
+    if fetch_backend == FETCH_BACKEND_HTTP:
+        try:
+            recipe_types = scrape_recipe_types_http()
+            if recipe_types:
+                return recipe_types
+        except:  # An error has occurred.  Update system log with error details, then fall back to Selenium:
+            update_system_log("scrape_recipe_types_http", traceback.format_exc())
+
+    return scrape_recipe_types_selenium()
+
+
+def scrape_recipe_types_http():
+    """Function which scrapes the name and link of each recipe type using the lightweight (HTTP) fetch backend"""
+    global url_recipe_type_page
+
+    # Download and parse the website's main page:
+    page_url, html = fetch_page_html(url_recipe_site)
+    document = parse_html_document(html)
+
+    # Follow the link of each navigation step (see the site profile) in turn, to reach the recipe-type page of the website.
+    # If a link is not found, no recipe types can be scraped:
+    for step in get_site_profile().navigation["recipe_type_page"]:
+        element = step.find(document)
+        if element is None or not element.get_attribute("href"):
+            return []
+        recipe_type_page = urljoin(page_url, element.get_attribute("href"))
+        page_url, html = fetch_page_html(recipe_type_page)
+        document = parse_html_document(html)
+
+    # Remember the recipe-type page's address (so the Selenium fetch backend can go straight to it):
+    if url_recipe_type_page is None:
+        url_recipe_type_page = recipe_type_page
+
+    # Capture the name and link of each recipe type:
+    return extract_recipe_types_from_document(document, page_url)
+
+
+def scrape_recipe_types_selenium():
+    """Function which scrapes the name and link of each recipe type using the Selenium fetch backend.  Returns None if an error occurs"""
+    try:
+        # If the recipe-type page is cached, capture the recipe types from the cached copy (no browser is needed):
+        cached_page = read_page_from_cache(url_recipe_type_page)
+        if cached_page:
+            recipe_types = extract_recipe_types_from_document(parse_html_document(cached_page[1]), cached_page[0])
+            if recipe_types:
+                return recipe_types
+        if cache_mode == CACHE_MODE_OFFLINE:
+            raise LookupError("Recipe types are not cached (offline mode).")
+
+        # Go to the recipe-type page on the website.  Return the Selenium driver initiated in same for further use in this function.
+        # If an error occurs, return failed-execution indication to the calling function:
+        driver = go_to_recipe_type_page_on_website()
+        if not driver:
+            return None
+
+        # Capture the name and link of every recipe type on the page in a single round trip, then store the (rendered) page
+        # in the cache:
+        recipe_types = extract_recipe_types_bulk(driver)
+        store_page_in_cache(driver.current_url, driver)
+
+        # Return the Selenium driver (still on the recipe-type page) to the pool for reuse:
+        driver_pool.release(driver)
+
+        # Return the recipe types to the calling function:
+        return recipe_types
+
+    except:  # An error has occurred.
+        # Inform user:
+        notify_user("Error", f"Error (scrape_recipe_types_selenium): {traceback.format_exc()}")
+
+        # Update system log with error details:
+        update_system_log("scrape_recipe_types_selenium", traceback.format_exc())
+
+        # If a Selenium driver has been leased, close it (its state is unknown) and remove it from the pool:
+        try:
+            driver_pool.release(driver, discard=True)
+        except:
+            pass
+
+        # Return failed-execution indication to the calling function:
+        return None
+
+
+def scrape_recipes(recipe_type, on_page=None):
+    """Function which scrapes the name and link of each recipe for a recipe type, trying the configured fetch backend first and falling back to Selenium.  If given, on_page is called with the recipes (dictionary of recipe link -> name) newly captured from each of the recipe type's pages, as soon as they are captured (each recipe once, even if captured again by the fallback); if it returns True, the remaining pages are skipped.  Returns None if an error occurs"""
+
+    # Add the recipe type to the system log records of its scraping:
+    with log_context(category=recipe_type):
+        recipes = None
+        progress = RecipeListProgress()  # Progress made through the recipe type's pages, by either fetch backend
+
+        # Try the lightweight (HTTP) fetch backend first, if so configured.  If it fails or finds nothing (e.g., the page
+        # requires JavaScript to render its contents), fall back to the Selenium fetch backend, which resumes from the page
+        # at which the first failed (if it failed part way), skipping the recipes already captured:
+        if fetch_backend == FETCH_BACKEND_HTTP:
+            try:
+                recipes = scrape_recipes_http(recipe_type, on_page, progress)
+            except:  # An error has occurred.  Update system log with error details, then fall back to Selenium:
+                update_system_log("scrape_recipes_http", traceback.format_exc())
+        if not recipes:
+            recipes = scrape_recipes_selenium(recipe_type, on_page, progress)
+
+        # Count the recipe types and recipes scraped:
+        if recipes is None:
+            metrics.increment("recipe_types_scraped_total", outcome="failed")
+        else:
+            metrics.increment("recipe_types_scraped_total", outcome="succeeded")
+            metrics.increment("recipes_scraped_total", len(recipes))
+        return recipes
+
+
+def scrape_recipes_http(recipe_type, on_page=None, progress=None):
+    """Function which scrapes the name and link of each recipe for a recipe type using the lightweight (HTTP) fetch backend, recording the progress made in progress, if given (see scrape_recipe_pages)"""
+
+    # Identify the link to the recipe type's page.  If not known yet (recipe types not scraped yet), scrape the recipe types
+    # first, keeping their links for the other recipe types:
+    load_recipe_type_urls(recipe_type)
+    with recipe_type_urls_lock:
+        url = recipe_type_urls.get(recipe_type)
+    if not url:
+        return {}
+
+    # Download each of the recipe type's pages, and capture the name and link of each recipe:
+    return scrape_recipe_pages(url, fetch_page_html, on_page, progress)
+
+
+def scrape_recipes_selenium(recipe_type, on_page=None, progress=None):
+    """Function which scrapes the name and link of each recipe for a recipe type using the Selenium fetch backend, resuming from the progress made by another fetch backend and recording the progress made in progress, if given (see scrape_recipe_pages).  Returns None if an error occurs"""
+    progress = progress if progress is not None else RecipeListProgress()
+    try:
+        # If the recipe type's pages (from the page to resume from, if any) are cached, capture the recipes from the cached
+        # copies (no browser is needed):
+        def read_cached_page(url):
+            cached_page = read_page_from_cache(url)
+            if not cached_page:
+                raise LookupError(f"Page is not cached: {url}")
+            return cached_page
+
+        if read_page_from_cache(progress.next_url or recipe_type_urls.get(recipe_type)):
+            try:
+                recipes = scrape_recipe_pages(recipe_type_urls.get(recipe_type), read_cached_page, on_page, progress)
+                if recipes:
+                    return recipes
+            except LookupError:  # Some of the recipe type's pages are not cached:  Use the browser
+                pass
+        if cache_mode == CACHE_MODE_OFFLINE:
+            raise LookupError(f"Recipes are not cached (offline mode): {recipe_type}")
+
+        # Go to the recipe-type page on the website.  Return the Selenium driver initiated in same for further use in this function.
+        # If an error occurs, return None:
+        driver = go_to_recipe_type_page_on_website()
+        if not driver:
+            return None
+
+        # Identify the link to the page of the recipe type that the user has selected, searching the recipe types at the
+        # target website if it is not known yet.  If it is not found, no recipes can be retrieved:
+        if recipe_type not in recipe_type_urls:
+            recipe_types = extract_recipe_types_bulk(driver)
+            with recipe_type_urls_lock:
+                recipe_type_urls.update(recipe_types)
+        recipe_type_url = recipe_type_urls.get(recipe_type)
+        if not recipe_type_url:
+            driver_pool.release(driver)
+            return {}
+
+        # Go to the page where all recipes for the selected recipe type are available (or to the page to resume from), and
+        # capture the name and link of every recipe pertaining to the user-selected recipe type (following the list across
+        # pages, if needed):
+        recipe_type_url = progress.next_url or recipe_type_url
+        load_page_in_driver(driver, recipe_type_url)
+        recipes = scrape_recipe_pages_in_driver(driver, recipe_type_url, on_page, progress)
+
+        # Return the Selenium driver to the pool for reuse:
+        driver_pool.release(driver)
+
+        # Return the recipes to the calling function:
+        return recipes
+
+    except:  # An error has occurred.
+        # Inform user:
+        notify_user("Error", f"Error (scrape_recipes_selenium): {traceback.format_exc()}")
+
+        # Update system log with error details:
+        update_system_log("scrape_recipes_selenium", traceback.format_exc())
+
+        # If a Selenium driver has been leased, close it (its state is unknown) and remove it from the pool:
+        try:
+            driver_pool.release(driver, discard=True)
+        except:
+            pass
+
+        # Return failed-execution indication to the calling function:
+        return None
+
+
+def scrape_to_folder(recipe_types, folder, extension=".csv", include_details=False, incremental=False, max_workers=SCRAPE_MAX_WORKERS, resume=False, sort=False, quick=False):
+    """Function which scrapes recipe types (without GUI) and writes the results to files in a folder:  One file per recipe type (plus one with recipe details, if requested), or, for an incremental run, a single file of the recipes added, removed or changed since the previous run (see scrape_recipes_incremental, in quick mode if quick is True).  If resume is True, the recipe types completed by a previous (interrupted) run into the same folder are skipped.  Recipes are written as they are captured, or, if sort is True, sorted by recipe name.  Returns True if every recipe type was scraped"""
+    os.makedirs(folder, exist_ok=True)
+
+    # Incremental run:  Write only the differences from the previous run:
+    if incremental:
+        delta, failed_recipe_types = scrape_recipes_incremental(recipe_types, include_details, max_workers=max_workers, quick=quick)
+        file_path = os.path.join(folder, "Recipe Changes" + extension)
+        update_system_log("scrape_to_folder", f"{write_recipe_delta_to_file(file_path, delta)} change(s) written to {file_path}", level="info")
+        for recipe_type in failed_recipe_types:
+            update_system_log("scrape_to_folder", f"{recipe_type}: could not be scraped (its changes are reported by the next run)", level="warning", category=recipe_type)
+        return not failed_recipe_types
+
+    # Full run.  The recipe types completed so far are recorded in a checkpoint file, so that if the run is interrupted (or
+    # some recipe types fail), it can be resumed without scraping the completed recipe types again:
+    checkpoint_path = os.path.join(folder, SCRAPE_CHECKPOINT_FILE_NAME)
+    completed_recipe_types = set(read_scrape_checkpoint(checkpoint_path)) if resume else set()
+    if completed_recipe_types:
+        update_system_log("scrape_to_folder", f"Resuming:  {len(completed_recipe_types)} recipe type(s) already completed", level="info")
+
+    # Write the recipes of each recipe type to its own file as they are captured.  As soon as a recipe type has been scraped,
+    # write the details of its recipes (if requested) to another file:
+    all_scraped = True
+    remaining_recipe_types = [recipe_type for recipe_type in recipe_types if recipe_type not in completed_recipe_types]
+    scraped = iter_recipe_categories_to_files(remaining_recipe_types, lambda recipe_type: recipe_type_file_path(folder, recipe_type, extension), max_workers, sort=sort)
+    for recipe_type, recipes, rows_written in scraped:
+        if recipes is None:
+            update_system_log("scrape_to_folder", f"{recipe_type}: could not be scraped", level="warning", category=recipe_type)
+            all_scraped = False
+            continue
+
+        file_path = recipe_type_file_path(folder, recipe_type, extension)
+        update_system_log("scrape_to_folder", f"{recipe_type}: {rows_written} recipe(s) written to {file_path}", level="info", category=recipe_type)
+        if include_details:
+            file_path = recipe_details_file_path(file_path)
+            update_system_log("scrape_to_folder", f"{recipe_type}: {write_recipe_details_to_file(file_path, recipe_type, list(recipes))} recipe detail(s) written to {file_path}", level="info", category=recipe_type)
+
+        completed_recipe_types.add(recipe_type)
+        write_scrape_checkpoint(checkpoint_path, completed_recipe_types)
+
+    # Once every recipe type has been completed, the checkpoint is no longer needed:
+    if all_scraped:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(checkpoint_path)
+    else:
+        update_system_log("scrape_to_folder", "Not all recipe types could be scraped.  Run again with --resume to scrape the remaining ones.", level="warning")
+
+    return all_scraped
+
+
+def set_scrape_controls_running(running):
+    """Function which enables / disables the buttons and progress bar of the application window, depending on whether the background scraping worker is running"""
+    scrape_buttons_state = "disabled" if running else "normal"
+    gui_widgets["button_scrape"].config(state=scrape_buttons_state)
+    gui_widgets["button_scrape_all"].config(state=scrape_buttons_state)
+    gui_widgets["button_cancel"].config(state="normal" if running else "disabled")
+
+    progressbar = gui_widgets["progressbar"]
+    if running:
+        # Until the worker reports its first progress, show that it is busy (the amount of work is not yet known):
+        progressbar.config(mode="indeterminate")
+        progressbar.start()
+        gui_widgets["label_status"].config(text="Please wait...")
+    else:
+        progressbar.stop()
+        progressbar.config(mode="determinate", value=0)
+        if scrape_cancel_event.is_set():
+            status = "Cancelled."
+        elif scrape_progress.get("unit"):
+            status = f"Finished in {format_duration(time.monotonic() - scrape_progress['job_started'])}."
+        else:
+            status = ""
+        gui_widgets["label_status"].config(text=status)
+
+
 def setup_driver(url, width, height):
     """Function for initiating and configuring a Selenium driver object"""
     try:
-        # Keep Chrome browser open after program finishes:
+        # Import Selenium (it is optional when only the lightweight fetch backend is used, so it is imported on first use):
+        from selenium import webdriver
+
+        # Configure the Chrome browser.  It is not detached, so it is closed along with its driver (drivers are kept open
+        # and reused by the driver pool instead):
         chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_experimental_option("detach", True)
+
+        # In the lean profile, run the browser headless (with a window large enough to display the website's elements
+        # needed), without extensions and without loading images.  Pages are handed over once their HTML has been parsed
+        # (the elements read are waited for explicitly).  Every domain other than the recipe website's is made unreachable:
+        if driver_profile == DRIVER_PROFILE_LEAN:
+            site_host = urlsplit(url_recipe_site).hostname or ""
+            chrome_options.page_load_strategy = "eager"
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument(f"--window-size={width},{height}")
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE {site_host}, EXCLUDE *.{site_host.removeprefix('www.')}")
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
         # Create and configure the Chrome driver (pass above options into the web driver):
-        driver = webdriver.Chrome(options=chrome_options)
+        with metrics.timer("driver_startup"):
+            driver = webdriver.Chrome(options=chrome_options)
+
+        # In the lean profile, block requests for images, fonts and media at the network level (Chrome DevTools Protocol),
+        # before any page is loaded:
+        if driver_profile == DRIVER_PROFILE_LEAN:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": DRIVER_BLOCKED_URL_PATTERNS})
 
         # Access the desired URL.
-        driver.get(url)
+        load_page_in_driver(driver, url)
 
-        # Set window position and dimensions, with the latter being large enough to display the website's elements needed:
-        driver.set_window_position(0, 0)
-        driver.set_window_size(width, height)
+        # In the standard profile, set window position and dimensions, with the latter being large enough to display the
+        # website's elements needed:
+        if driver_profile == DRIVER_PROFILE_STANDARD:
+            driver.set_window_position(0, 0)
+            driver.set_window_size(width, height)
 
         # Return the Selenium driver object to the calling function:
         return driver
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (setup_driver): {traceback.format_exc()}")
+        notify_user("Error", f"Error (setup_driver): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("setup_driver", traceback.format_exc())
 
         # If Selenium driver object is open, close and destroy it:
         try:
-            driver.close()
+            driver.quit()
             del driver
         except:
             pass
@@ -325,23 +3741,123 @@ def setup_driver(url, width, height):
         return False
 
 
-def update_system_log(activity, log):
-    """Function to update the system log with errors encountered"""
-    try:
-        # Capture current date/time:
-        current_date_time = datetime.now()
-        current_date_time_file = current_date_time.strftime("%Y-%m-%d")
+def show_recipe_types(recipe_types, saved_at=None, refreshing=False):
+    """Function which lists the recipe types (scraped in the background, or saved by a previous run at time saved_at) in the combo box on the main application window, replacing those previously listed.  The user's selection and search are kept, unless the selected recipe type is no longer available"""
+    combobox_recipe_type_values[:] = [recipe_type for recipe_type, _ in recipe_types]
+    with recipe_type_urls_lock:  # The background scraping worker may be reading them
+        recipe_type_urls.clear()
+        recipe_type_urls.update(recipe_types)
+    if selected_recipe_type.get() not in recipe_type_urls:
+        selected_recipe_type.set("")
+
+    # List the recipe types (only those matching the search, if any), noting when they were saved if not just scraped:
+    gui_widgets["combobox_recipe_type"].config(values=combobox_recipe_type_values)
+    if gui_widgets["entry_search"].get():
+        handle_search_box_changed()
+    label_text = f"SELECT RECIPE TYPE ({len(combobox_recipe_type_values)} types available):"
+    if saved_at is not None:
+        label_text += f"\n(as of {datetime.fromtimestamp(saved_at):%Y-%m-%d %H:%M}" + (", checking for changes...)" if refreshing else ")")
+    gui_widgets["label_recipe_type"].config(text=label_text)
+
+
+def show_scrape_progress(unit, done, total, recipes_found):
+    """Function which shows the progress reported by the background scraping worker (units of work done out of the total, e.g. recipe types scraped) on the progress bar, together with the throughput and estimated time remaining.  If the total is not known (None), only the units of work done and the throughput are shown"""
+
+    # A new unit of work (e.g., recipe pages after recipe types) restarts the throughput calculation:
+    now = time.monotonic()
+    if scrape_progress.get("unit") != unit:
+        scrape_progress.update(unit=unit, started=now)
+
+    if total is None:
+        if str(gui_widgets["progressbar"].cget("mode")) != "indeterminate":
+            gui_widgets["progressbar"].config(mode="indeterminate")
+            gui_widgets["progressbar"].start()
+        status = f"{done} {unit}  |  {recipes_found} recipes found"
+    else:
+        gui_widgets["progressbar"].stop()
+        gui_widgets["progressbar"].config(mode="determinate", maximum=max(total, 1), value=done)
+        status = f"{done} of {total} {unit}  |  {recipes_found} recipes found"
+    elapsed = now - scrape_progress["started"]
+    if done and elapsed > 0:
+        rate = done / elapsed
+        status += f"  |  {rate:.1f} {unit}/s" + (f"  |  ETA {format_duration((total - done) / rate)}" if total is not None else "")
+    gui_widgets["label_status"].config(text=status)
+
+
+def start_recipe_types_refresh(saved_recipe_types, saved_at):
+    """Function which scrapes the recipe types again on a background thread (at start-up, while those saved by the previous run are listed), updating the combo box once done.  If they cannot be scraped, the failure is only logged (the user is not interrupted) and the saved recipe types remain listed"""
+    global recipe_types_refresher
+
+    def refresh_recipe_types():
+        user_notifications_muted.set(True)  # Only affects this thread
+        if not get_recipe_types():
+            update_system_log("start_recipe_types_refresh", "Recipe types could not be refreshed.  The saved recipe types remain listed.", level="warning")
+            post_gui_event("recipe_types", saved_recipe_types, saved_at)
+
+    recipe_types_refresher = threading.Thread(target=refresh_recipe_types, name="recipe-types-refresh", daemon=True)
+    recipe_types_refresher.start()
+    window.after(GUI_POLL_INTERVAL, poll_gui_events)
+
+
+def start_scrape_job(job, *args):
+    """Function which runs a scraping job (e.g., scrape_job_recipes) on the background scraping worker, so that the application window remains responsive.  Only one job runs at a time"""
+    global scrape_worker
+
+    if scrape_worker is not None and scrape_worker.is_alive():
+        notify_user("Please Wait", "Recipes are still being retrieved.")
+        return False
+
+    # Reset the cancellation request and progress of the previous job, then start the worker and begin checking for the
+    # progress it reports:
+    scrape_cancel_event.clear()
+    scrape_progress.clear()
+    scrape_progress["job_started"] = time.monotonic()
+    set_scrape_controls_running(True)
+    scrape_worker = threading.Thread(target=run_scrape_job, args=(job,) + args, name="scrape-worker", daemon=True)
+    scrape_worker.start()
+    window.after(GUI_POLL_INTERVAL, poll_gui_events)
+    return True
+
+
+def store_page_in_cache(url, driver):
+    """Function which stores the page currently loaded in a Selenium driver (as rendered by the browser) in the on-disk page cache"""
+    if cache_mode != CACHE_MODE_DISABLED:
+        page_cache.put(url, driver.current_url, driver.page_source)
 
-        # Update log file.  If log file does not exist, create it:
-        with open("log_recipe_data_web_scraper_" + current_date_time_file + ".txt", "a") as f:
-            f.write(datetime.now().strftime("%Y-%m-%d @ %I:%M %p") + ":\n")
-            f.write(activity + ": " + log + "\n")
 
-        # Close the log file:
-        f.close()
+def tokenize_text(text):
+    """Function which splits text into the words (tokens) used for searching:  Lower-case, without accents or punctuation"""
+    text = unicodedata.normalize("NFKD", text or "").casefold()
+    return re.findall(r"\w+", "".join(character for character in text if not unicodedata.combining(character)))
+
+
+def update_system_log(activity, log, level="error", **fields):
+    """Function to update the system log with errors (or, at another level, other events) encountered.  Any given fields (e.g., url) are added to the log record (see StructuredLogger)"""
+    try:
+        # Add a record to the system log (it is buffered, and written to the log file in batches):
+        system_log.log(level, activity, log, **fields)
 
     except:  # An error has occurred.
-        messagebox.showinfo("Error", f"Error: System log could not be updated.\n{traceback.format_exc()}")
+        notify_user("Error", f"Error: System log could not be updated.\n{traceback.format_exc()}")
+
+
+def url_hash(url):
+    """Function which returns a 64-bit hash of a link, the same in every run (unlike Python's own string hashes).  Used for indexing and identifying recipes (see RecipeStore)"""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def wait_for_element_in_driver(driver, xpath, timeout=DRIVER_ELEMENT_WAIT_TIMEOUT, clickable=True):
+    """Function which waits until an element (located by XPath) is present on the page currently loaded in a Selenium driver and, if clickable is True, can be clicked.  Returns the element, or None if it has not appeared in time"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    condition = expected_conditions.element_to_be_clickable if clickable else expected_conditions.presence_of_element_located
+    try:
+        return WebDriverWait(driver, timeout).until(condition((By.XPATH, xpath)))
+    except TimeoutException:
+        return None
 
 
 def window_center_screen():
@@ -367,7 +3883,7 @@ def window_center_screen():
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (window_center_screen): {traceback.format_exc()}")
+        notify_user("Error", f"Error (window_center_screen): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("window_center_screen", traceback.format_exc())
@@ -394,7 +3910,7 @@ def window_config():
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (window_config): {traceback.format_exc()}")
+        notify_user("Error", f"Error (window_config): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("window_config", traceback.format_exc())
@@ -428,7 +3944,7 @@ def window_create_and_config():
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (window_create_and_config): {traceback.format_exc()}")
+        notify_user("Error", f"Error (window_create_and_config): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("window_create_and_config", traceback.format_exc())
@@ -438,49 +3954,90 @@ def window_create_and_config():
 
 
 def window_create_and_config_user_interface():
-    """Function which creates and configures items comprising the user interface, including the canvas (which overlays on top of the app. window), labels, combo box, and button"""
+    """Function which creates and configures items comprising the user interface, including the canvas (which overlays on top of the app. window), labels, combo box, and buttons"""
     global img
 
     try:
         # Create and configure canvas which overlays on top of window:
-        canvas = Canvas(window)
-        img = PhotoImage(file="yummy.png")
+        canvas = tk.Canvas(window)
+        img = tk.PhotoImage(file="yummy.png")
         canvas.config(height=img.height(), width=img.width(), bg='white', highlightthickness=0)
         canvas.create_image(40,40, image=img)
         canvas.grid(column=0, row=1, columnspan=3, padx=0, pady=0)
         canvas.update()
 
         # Create and configure the introductory header text (label):
-        label_intro = Label(text=f"WELCOME TO MY RECIPE RETRIEVER!", height=3, bg='white', fg='black', padx=0, pady=0, font=(FONT_NAME,16, "bold"))
+        label_intro = tk.Label(text=f"WELCOME TO MY RECIPE RETRIEVER!", height=3, bg='white', fg='black', padx=0, pady=0, font=(FONT_NAME,16, "bold"))
         label_intro.grid(column=0, row=0, columnspan=3)
 
         # Create and configure the header text (label) summarizing the objectives:
         objectives = f"Objectives of this application are as follows:\n\n1. To scrape a website containing recipe data\nand capture desired data elements.\n\n2. To write captured data to a CSV file.\n\nWebsite to be scraped: www.allrecipes.com"
-        label_objectives = Label(text=objectives, height=6, bg='white', fg='blue', padx=0, pady=50, font=(FONT_NAME,14, "bold"), justify=LEFT)
+        label_objectives = tk.Label(text=objectives, height=6, bg='white', fg='blue', padx=0, pady=50, font=(FONT_NAME,14, "bold"), justify=tk.LEFT)
         label_objectives.grid(column=0, row=2, columnspan=3)
 
         # Define a label for the recipe-type combo box:
-        label_recipe_type = Label(text=f"SELECT RECIPE TYPE ({len(combobox_recipe_type_values)} types available):", bg='white', fg='red', padx=0, pady=5, font=(FONT_NAME,14, "bold"))
+        label_recipe_type = tk.Label(text=f"SELECT RECIPE TYPE ({len(combobox_recipe_type_values)} types available):", bg='white', fg='red', padx=0, pady=5, font=(FONT_NAME,14, "bold"))
         label_recipe_type.grid(column=0, row=3, columnspan=3)
+        gui_widgets["label_recipe_type"] = label_recipe_type
 
         # Create and configure a combo box to list recipe types:
         combobox_recipe_type = ttk.Combobox(window, height=10, width=25, font=(FONT_NAME,14, "normal"), state="readonly", values=combobox_recipe_type_values, textvariable=selected_recipe_type)
         combobox_recipe_type.grid(column=0, row=4, padx=0, pady=0, columnspan=3)
+        gui_widgets["combobox_recipe_type"] = combobox_recipe_type
 
-        # Create and configure the blank "label" which serves as a separator between the recipe combo box and the button:
-        label_space = Label(text="", bg='white', fg='white', padx=0, pady=0, font=(FONT_NAME,16, "bold"))
-        label_space.grid(column=0, row=5)
+        # Create and configure the check boxes used to also capture each recipe's details, and to sort the recipe files by
+        # recipe name.  They also serve as a separator between the recipe combo box and the button:
+        frame_options = tk.Frame(window, bg='white', pady=8)
+        frame_options.grid(column=0, row=5, columnspan=3)
+        checkbutton_details = tk.Checkbutton(frame_options, text="Include recipe details (ingredients, times, rating)", variable=include_recipe_details, bg='white', activebackground='white', padx=0, pady=0, font=(FONT_NAME,11, "normal"))
+        checkbutton_details.pack(anchor="w")
+        checkbutton_sort = tk.Checkbutton(frame_options, text="Sort recipes by name (written once all are retrieved)", variable=sort_recipes, bg='white', activebackground='white', padx=0, pady=0, font=(FONT_NAME,11, "normal"))
+        checkbutton_sort.pack(anchor="w")
 
         # Create and configure button used to run the web scraper and subsequent functionality:
-        button_scrape = Button(text="Get Recipes", width=12, height=1, bg='red', fg='white', pady=0, font=(FONT_NAME,16,"bold"), command=get_recipes)
+        button_scrape = tk.Button(text="Get Recipes", width=12, height=1, bg='red', fg='white', pady=0, font=(FONT_NAME,16,"bold"), command=get_recipes)
         button_scrape.grid(column=0, row=6,columnspan=3)
+        gui_widgets["button_scrape"] = button_scrape
+
+        # Create and configure button used to run the web scraper for all recipe types (one CSV file per recipe type):
+        button_scrape_all = tk.Button(text="Get All Recipes", width=14, height=1, bg='white', fg='red', pady=0, font=(FONT_NAME,14,"bold"), command=get_all_recipes)
+        button_scrape_all.grid(column=0, row=7, columnspan=3, pady=10)
+        gui_widgets["button_scrape_all"] = button_scrape_all
+
+        # Create and configure the progress bar and status text (label) showing the progress of the scraping under way,
+        # including its throughput and estimated time remaining:
+        progressbar = ttk.Progressbar(window, orient="horizontal", length=400, mode="determinate")
+        progressbar.grid(column=0, row=8, columnspan=3, pady=(5, 0))
+        gui_widgets["progressbar"] = progressbar
+        label_status = tk.Label(text="", bg='white', fg='black', padx=0, pady=5, font=(FONT_NAME,10, "normal"))
+        label_status.grid(column=0, row=9, columnspan=3)
+        gui_widgets["label_status"] = label_status
+
+        # Create and configure button used to stop the scraping under way:
+        button_cancel = tk.Button(text="Cancel", width=10, height=1, bg='white', fg='black', pady=0, font=(FONT_NAME,12,"bold"), state="disabled", command=cancel_scrape_job)
+        button_cancel.grid(column=0, row=10, columnspan=3)
+        gui_widgets["button_cancel"] = button_cancel
+
+        # Create and configure the search box, which narrows down the recipe types listed in the combo box and lists the
+        # matching recipes scraped so far as the user types (double-click on a recipe to open it in the web browser):
+        label_search = tk.Label(text="SEARCH RECIPE TYPES AND RECIPES RETRIEVED:", bg='white', fg='red', padx=0, pady=5, font=(FONT_NAME,12, "bold"))
+        label_search.grid(column=0, row=11, columnspan=3, pady=(15, 0))
+        entry_search = tk.Entry(window, width=40, font=(FONT_NAME,12, "normal"))
+        entry_search.grid(column=0, row=12, columnspan=3)
+        entry_search.bind("<KeyRelease>", handle_search_box_changed)
+        gui_widgets["entry_search"] = entry_search
+        listbox_search_results = tk.Listbox(window, height=6, width=55, font=(FONT_NAME,11, "normal"))
+        listbox_search_results.grid(column=0, row=13, columnspan=3, pady=(5, 0))
+        listbox_search_results.bind("<Double-Button-1>", handle_search_result_opened)
+        gui_widgets["listbox_search_results"] = listbox_search_results
+        gui_widgets["search_results"] = []
 
         # Return successful-execution indication to the calling function:
         return True
 
     except:  # An error has occurred.
         # Inform user:
-        messagebox.showinfo("Error", f"Error (window_create_and_config_user_interface): {traceback.format_exc()}")
+        notify_user("Error", f"Error (window_create_and_config_user_interface): {traceback.format_exc()}")
 
         # Update system log with error details:
         update_system_log("window_create_and_config_user_interface", traceback.format_exc())
@@ -489,54 +4046,114 @@ def window_create_and_config_user_interface():
         return False
 
 
-def write_to_csv_file(selected_recipe_type_scrape):
-    """Function for archiving all recipes for a selected recipe type to a CSV file"""
-    try:
-
-        # Archive all recipes for the selected recipe types, using the contents of the "selected recipes" dictionary:
-        file_path_identified = filedialog.asksaveasfilename(parent=window, initialfile="Recipes - " + selected_recipe_type_scrape,title="Save Recipes To File", defaultextension=".csv", filetypes=[("CSV file(*.csv)", "*.csv")])
-        if file_path_identified:   # User has selected a file name and location.
-            try:
-                with open(file_path_identified, mode="w") as file:
-                    # Write the column headers:
-                    file.write("Recipe" + "," "URL" + "\n")
-
-                    # Write each recipe's name and URL.  URL is written inside a "HYPERLINK" formula so that if the CSV file is
-                    # opened in MS-Excel,the URL will be an active link that the user can click on to get to the desired recipe:
-                    for recipe in selected_recipes:
-                        file.write(recipe + "," + "=HYPERLINK(" + '"' + selected_recipes[recipe] + '"' + ")" + "\n")  # The character "," will be used as the delimiter.
-
-                # Close the newly-created recipe CSV file:
-                file.close()
-
-                # Inform user that CSV file has been created:
-                messagebox.showinfo("Recipe File Created", f"The following file has been created:\n\n{file_path_identified}")
-
-            except Exception as err:  # Error has occurred.
-                messagebox.showinfo("Error", f"{err}.\n\nFile has not been created.")
-
-        else:  # User has not identified a file name and location to store the retrieved recipes.
-            messagebox.showinfo("Recipe File Not Created", "File has not been created.")
-
-        # Return successful-execution indication to the calling function:
-        return True
-
-    except:  # An error has occurred.
-        # Inform user:
-        messagebox.showinfo("Error", f"Error (write_to_csv_file): {traceback.format_exc()}")
-
-        # Update system log with error details:
-        update_system_log("write_to_csv_file", traceback.format_exc())
-
-        # Return failed-execution indication to the calling function:
+def write_scrape_checkpoint(checkpoint_path, completed_recipe_types):
+    """Function which records the recipe types completed by a scrape run in its checkpoint file.  The file is replaced in a single step, so that it remains readable if the run is interrupted while writing it"""
+    with open(checkpoint_path + ".tmp", "w", encoding="utf-8") as checkpoint_file:
+        json.dump({"completed_recipe_types": sorted(completed_recipe_types)}, checkpoint_file, indent=1)
+    os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
+
+def work_recipe_tasks(work_queue, lease_id, tasks, folder, extension):
+    """Function which crawls a leased batch of recipe pages (distributed crawl), writing their details to a new partition file.  The partition is kept only if the batch is recorded as done while its lease is still held.  Returns True if so"""
+    file_path = os.path.join(folder, WORK_QUEUE_PARTITION_FOLDER_NAME, "part-" + lease_id + extension)
+    temporary_path = os.path.join(os.path.dirname(file_path), ".tmp-" + os.path.basename(file_path))
+    tasks_by_url = {task["url"]: task for task in tasks}
+    done_urls, failed_urls, permanently_failed_urls = [], [], []
+
+    def write_details(url, details):
+        if details:
+            details["name"] = details["name"] or tasks_by_url[url]["name"]
+            details["recipe_type"] = tasks_by_url[url]["recipe_type"]
+            with metrics.timer("write"):
+                writer.write(details)
+            done_urls.append(url)
+        elif url not in permanently_failed_urls:
+            failed_urls.append(url)
+
+    def classify_failure(url, err):
+        # A page which failed permanently (e.g., page not found) is not retried by other workers (see is_transient_error):
+        if not is_transient_error(err):
+            permanently_failed_urls.append(url)
+
+    # Crawl the recipe pages, writing their details to a temporary file, then move it into place as a partition and record
+    # the outcome.  If the lease has been lost meanwhile, another worker is crawling the batch again:  Discard the partition:
+    with open_recipe_sink(temporary_path, OUTPUT_RECIPE_DETAILS) as writer:
+        crawl_recipe_details(list(tasks_by_url), write_details, on_error=classify_failure)
+    if not done_urls:  # No recipe page could be crawled:  No partition is needed
+        os.remove(temporary_path)
+        return work_queue.complete(lease_id, done_urls, failed_urls, permanently_failed_urls=permanently_failed_urls)
+    os.replace(temporary_path, file_path)
+    if not work_queue.complete(lease_id, done_urls, failed_urls, output=file_path, permanently_failed_urls=permanently_failed_urls):
+        os.remove(file_path)
         return False
+    metrics.increment("rows_written_total", writer.rows_written)
+    failed_count = len(failed_urls) + len(permanently_failed_urls)
+    update_system_log("work_recipe_tasks", f"{len(done_urls)} recipe detail(s) written to {file_path}" + (f" ({failed_count} failed)" if failed_count else ""), level="info")
+    return True
+
+
+def work_recipe_type_task(work_queue, lease_id, task, folder, extension):
+    """Function which scrapes a leased recipe type (distributed crawl), writing its recipes to its own file and, if requested, adding a task to the work queue for each of its recipe pages (recipes already queued, e.g. under another recipe type, are skipped).  Returns True if the outcome has been recorded (the lease was still held)"""
+    recipe_type = task["recipe_type"]
+    recipe_type_urls[recipe_type] = task["url"]
+
+    # Write the recipes to a temporary file as they are captured, then move it into place.  A recipe type scraped again
+    # (after its lease has expired) simply replaces its file:
+    file_path = recipe_type_file_path(folder, recipe_type, extension)
+    temporary_path = os.path.join(folder, ".tmp-" + lease_id + "-" + os.path.basename(file_path))
+    recipes = [recipes for _, recipes, _ in iter_recipe_categories_to_files([recipe_type], lambda _: temporary_path, max_workers=1)][0]
+    if recipes is None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary_path)
+        return work_queue.complete(lease_id, [], [task["url"]])
+    os.replace(temporary_path, file_path)
+
+    new_tasks = [{"url": url, "kind": WorkQueue.KIND_RECIPE, "recipe_type": recipe_type, "name": name} for url, name in recipes.items()] if task["include_details"] else []
+    completed = work_queue.complete(lease_id, [task["url"]], output=file_path, new_tasks=new_tasks)
+    if completed:
+        update_system_log("work_recipe_type_task", f"{recipe_type}: {len(recipes)} recipe(s) written to {file_path}", level="info", category=recipe_type)
+    return completed
+
+
+def write_recipe_delta_to_file(file_path, delta):
+    """Function which writes the differences found by an incremental run (see scrape_recipes_incremental) to a CSV or JSON Lines file"""
+    with metrics.timer("write"), open_recipe_sink(file_path, OUTPUT_RECIPE_DELTA) as writer:
+        for row in delta:
+            writer.write(row)
+    metrics.increment("rows_written_total", writer.rows_written)
+    return writer.rows_written
+
+
+def write_recipe_details_to_file(file_path, recipe_type, recipe_urls, cancel_event=None, on_progress=None):
+    """Function which crawls the pages of a recipe type's recipes and writes the details of each recipe to a CSV or JSON Lines file as soon as they are captured.  If given, on_progress is called with the number of pages crawled so far after each page.  Returns the number of recipes written"""
+    pages_crawled = 0
+
+    def write_details(url, details):
+        nonlocal pages_crawled
+        if details:
+            details["recipe_type"] = recipe_type
+            with metrics.timer("write"):
+                writer.write(details)
+            recipe_search_index.add_details(url, details)
+        pages_crawled += 1
+        if on_progress is not None:
+            on_progress(pages_crawled)
+
+    with open_recipe_sink(file_path, OUTPUT_RECIPE_DETAILS) as writer:
+        crawl_recipe_details(recipe_urls, write_details, cancel_event=cancel_event)
+    metrics.increment("rows_written_total", writer.rows_written)
+    return writer.rows_written
+
+
+def write_recipes_to_file(file_path, recipe_type, recipes, sort=False):
+    """Function which writes recipes (a dictionary of recipe link -> name) to a CSV or JSON Lines file, in the order given or, if sort is True, sorted by recipe name.  Returns the number of recipes written"""
+    with metrics.timer("write"), open_recipe_sink(file_path, OUTPUT_RECIPES, sort_key=(lambda row: row["name"]) if sort else None) as writer:
+        for recipe_link, recipe_name in recipes.items():
+            writer.write({"recipe_type": recipe_type, "name": recipe_name, "url": recipe_link})
+    metrics.increment("rows_written_total", writer.rows_written)
+    return writer.rows_written
 
 
-# Run the application:
-run_app()
-
-# Keep application window open until user closes it:
-window.mainloop()
-
 if __name__ == '__main__':
-    run_app()
\ No newline at end of file
+    # Run the application (GUI, or a command given on the command line):
+    sys.exit(run_cli())
@@ -0,0 +1,53 @@
+# Shared fixtures for the tests:  Each test runs in its own temporary folder, with its own page cache and store of previous
+# runs, and the scraper's shared state (recipes, metrics, circuits, ...) reset.  Scraping tests are run against the local
+# fixture website served by benchmark.py.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+import main
+
+
+@pytest.fixture(autouse=True)
+def isolated_scraper(tmp_path, monkeypatch):
+    """Fixture which isolates each test:  Files (system log, cache, state) are created in a temporary folder (the system log's buffered records are written there once the test is done), and the scraper's settings and shared state are restored afterwards"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main.system_log, "file_prefix", str(tmp_path / "log_"))
+    monkeypatch.setattr(main.system_log, "console", None)
+    for name in ("cache_mode", "fetch_backend", "url_recipe_site", "url_recipe_type_page"):
+        monkeypatch.setattr(main, name, getattr(main, name))
+    monkeypatch.setattr(main, "page_cache", main.PageCache(str(tmp_path / "cache.sqlite3"), main.PAGE_CACHE_TTL, main.PAGE_CACHE_MAX_BYTES))
+    monkeypatch.setattr(main, "scrape_state_store", main.ScrapeStateStore(str(tmp_path / "state.sqlite3")))
+    monkeypatch.setattr(main.host_rate_limiter, "min_interval", 0)
+    monkeypatch.setattr(main.retry_policy, "backoff_base", 0.01)  # Retries are tested, not the time waited between them
+    main.retry_policy.circuit_breaker.reset()
+    main.recipe_type_urls.clear()
+    main.recipe_store.clear()
+    monkeypatch.setattr(main, "recipe_search_index", main.RecipeSearchIndex(main.recipe_store))
+    main.metrics.reset()
+    yield
+    main.system_log.flush()  # Write the records logged by the test to its own log file (not the project folder's)
+    main.retry_policy.circuit_breaker.reset()
+
+
+@pytest.fixture
+def fixture_site():
+    """Fixture which serves a fixture website (see benchmark.build_fixture_site) and points the scraper at it (HTTP fetch backend, cache disabled).  Returns a function taking the site's size (and fault rate) and returning its pages (which may be changed while served) and base URL"""
+    servers = []
+
+    def serve(category_count=2, card_count=10, recipe_page_count=0, category_page_count=1, fault_rate=0.0, seed=1):
+        pages = benchmark.build_fixture_site(category_count, card_count, recipe_page_count, category_page_count)
+        server, base_url = benchmark.start_fixture_server(pages, fault_rate, seed)
+        servers.append(server)
+        benchmark.prepare_scraper(base_url, main.FETCH_BACKEND_HTTP)
+        return pages, base_url
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
@@ -0,0 +1,34 @@
+# Tests of the command line:  Recipes scraped to a folder (in each output format) can be searched afterwards, by name and
+# ingredients, without contacting the website again.
+import main
+import pytest
+
+
+@pytest.mark.parametrize("output_options", [["--format", "csv"], ["--format", "csv", "--gzip"], ["--format", "jsonl"], ["--format", "sqlite"]])
+def test_search_uses_saved_recipes(fixture_site, tmp_path, capsys, output_options):
+    pages, base_url = fixture_site(category_count=2, card_count=5, recipe_page_count=5)
+    pages["/recipe/1-3/"] = pages["/recipe/1-3/"].replace("Ingredient 1", "Saffron")
+    folder = str(tmp_path / "recipes")
+    assert main.run_cli(["scrape", "--out", folder, "--details"] + output_options) == 0
+    main.recipe_store.clear()
+    main.metrics.reset()
+    capsys.readouterr()
+
+    # Search by name prefix (optionally within a recipe type) and by ingredient:
+    assert main.run_cli(["search", "reci", "--folder", folder]) == 0
+    assert [line.split("\t")[:2] for line in capsys.readouterr().out.splitlines()] == [[f"Recipe {c}-{i}, Deluxe", f"Category {c}"] for c in (1, 2) for i in range(1, 6)]
+    assert main.run_cli(["search", "deluxe", "--folder", folder, "--categories", "Category 1", "--limit", "2"]) == 0
+    assert [line.split("\t")[0] for line in capsys.readouterr().out.splitlines()] == ["Recipe 1-1, Deluxe", "Recipe 1-2, Deluxe"]
+    assert main.run_cli(["search", "saff", "--folder", folder]) == 0
+    assert capsys.readouterr().out.splitlines() == [f"Recipe 1-3, Deluxe\tCategory 1\t{base_url}recipe/1-3/"]
+    assert not any(name.startswith("pages_fetched_total") for name in main.metrics.snapshot()["counters"])
+
+
+def test_search_reports_missing_recipes(tmp_path, capsys):
+    assert main.run_cli(["search", "curry", "--folder", str(tmp_path / "none")]) == 1
+    assert "No saved recipes" in capsys.readouterr().err
+
+
+def test_politeness_limit_can_be_changed(tmp_path):
+    main.run_cli(["--min-interval", "0.25", "search", "curry", "--folder", str(tmp_path / "none")])
+    assert main.host_rate_limiter.min_interval == 0.25
@@ -0,0 +1,115 @@
+# Tests of scraping several recipe types concurrently:  The recipe types' links are scraped once for all of the scraping
+# threads (without blocking the threads which only read them), and the recipes of every recipe type are captured.
+import threading
+import time
+
+import main
+import pytest
+
+
+def test_recipe_types_are_scraped_once_for_concurrent_threads(fixture_site, monkeypatch):
+    _, base_url = fixture_site(category_count=6, card_count=25, category_page_count=3)
+    calls = []
+    scrape_recipe_types_http = main.scrape_recipe_types_http
+    monkeypatch.setattr(main, "scrape_recipe_types_http", lambda: calls.append(1) or scrape_recipe_types_http())
+
+    recipes = main.scrape_recipe_categories([f"Category {c}" for c in range(1, 7)], max_workers=6)
+    assert len(calls) == 1
+    assert recipes == {f"Category {c}": {f"{base_url}recipe/{c}-{i}/": f"Recipe {c}-{i}, Deluxe" for i in range(1, 26)} for c in range(1, 7)}
+
+
+def test_recipe_type_links_can_be_read_while_they_are_scraped(fixture_site, monkeypatch):
+    fixture_site(category_count=2)
+    started, proceed = threading.Event(), threading.Event()
+    scrape_recipe_types_http = main.scrape_recipe_types_http
+
+    def slow_scrape_recipe_types_http():
+        started.set()
+        proceed.wait(10)
+        return scrape_recipe_types_http()
+
+    monkeypatch.setattr(main, "scrape_recipe_types_http", slow_scrape_recipe_types_http)
+    scraping = threading.Thread(target=main.load_recipe_type_urls, args=("Category 1",))
+    scraping.start()
+    assert started.wait(10)
+
+    # The lock is not held while the website is waited for:
+    assert main.recipe_type_urls_lock.acquire(timeout=1)
+    main.recipe_type_urls_lock.release()
+    proceed.set()
+    scraping.join(10)
+    assert set(main.recipe_type_urls) == {"Category 1", "Category 2"}
+
+
+def test_threads_waiting_for_the_recipe_types_share_their_failure(monkeypatch):
+    started, proceed = threading.Event(), threading.Event()
+
+    def failing_scrape_recipe_types_http():
+        started.set()
+        proceed.wait(10)
+        raise ConnectionResetError("website unreachable")
+
+    monkeypatch.setattr(main, "scrape_recipe_types_http", failing_scrape_recipe_types_http)
+    errors = []
+
+    def load(recipe_type):
+        try:
+            main.load_recipe_type_urls(recipe_type)
+        except ConnectionResetError as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=load, args=(f"Category {c}",)) for c in range(1, 4)]
+    threads[0].start()
+    assert started.wait(10)
+    for thread in threads[1:]:
+        thread.start()
+    proceed.set()
+    for thread in threads:
+        thread.join(10)
+    assert len(errors) == 3 and main.recipe_type_urls_pending is None
+
+    # The next thread to need the links scrapes them again:
+    monkeypatch.setattr(main, "scrape_recipe_types_http", lambda: [("Category 1", "https://example.com/category/1/")])
+    main.load_recipe_type_urls("Category 1")
+    assert main.recipe_type_urls == {"Category 1": "https://example.com/category/1/"}
+
+
+@pytest.mark.parametrize("size", [1, 3])
+def test_driver_pool_never_leases_more_drivers_than_its_size(monkeypatch, size):
+    lock = threading.Lock()
+    counts = {"leased": 0, "most_leased": 0, "started": 0, "quit": 0}
+
+    class FakeDriver:
+        current_url = "https://example.com/"
+
+        def quit(self):
+            with lock:
+                counts["quit"] += 1
+
+    def setup_driver(*args):
+        with lock:
+            counts["started"] += 1
+        return FakeDriver()
+
+    monkeypatch.setattr(main, "setup_driver", setup_driver)
+    pool = main.DriverPool(size, idle_timeout=60)
+
+    def use_drivers():
+        for attempt in range(20):
+            driver = pool.acquire()
+            with lock:
+                counts["leased"] += 1
+                counts["most_leased"] = max(counts["most_leased"], counts["leased"])
+            time.sleep(0.001)
+            with lock:
+                counts["leased"] -= 1
+            pool.release(driver, discard=attempt % 5 == 0)
+
+    threads = [threading.Thread(target=use_drivers) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    pool.close_all()
+    assert counts["most_leased"] <= size
+    assert counts["started"] == counts["quit"] > 0
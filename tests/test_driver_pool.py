@@ -0,0 +1,121 @@
+# Tests of the pool of Selenium drivers, with fake drivers standing in for browsers:  The pool's size limit, reuse of idle
+# drivers, drivers discarded (and replaced) after an error, and recipes scraped by several workers sharing the pool.
+import threading
+import time
+
+import main
+import pytest
+
+
+class FakeDriver:
+    """Class which stands in for a Selenium driver, failing to load the given pages (as if its browser had died)"""
+
+    def __init__(self, url, failing_urls=()):
+        self.current_url = url
+        self.failing_urls = failing_urls
+        self.loaded_urls = []
+        self.closed = False
+
+    def get(self, url):
+        self.loaded_urls.append(url)
+        if url in self.failing_urls:
+            raise type("WebDriverException", (Exception,), {})("unknown error: chrome not reachable")
+        self.current_url = url
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """Fixture which replaces the driver pool with one of size 2, whose drivers are fake.  Returns the drivers started, and the URLs which fail to load (to which the test may add)"""
+    started, failing_urls = [], set()
+    started_lock = threading.Lock()
+
+    def setup_driver(url, width, height):
+        driver = FakeDriver(url, failing_urls)
+        with started_lock:
+            started.append(driver)
+        return driver
+
+    monkeypatch.setattr(main, "setup_driver", setup_driver)
+    monkeypatch.setattr(main, "driver_pool", main.DriverPool(2, idle_timeout=60))
+    yield started, failing_urls
+    main.driver_pool.close_all()
+
+
+@pytest.fixture
+def selenium_site(monkeypatch, drivers):
+    """Fixture which points the Selenium fetch backend at a website of 6 recipe types (of 3 recipes each), whose recipe-type pages are "scraped" from the fake drivers.  Returns the number of drivers leased at the time each page was scraped"""
+    monkeypatch.setattr(main, "fetch_backend", main.FETCH_BACKEND_SELENIUM)
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_DISABLED)
+    monkeypatch.setattr(main, "url_recipe_type_page", "https://example.com/recipes/")
+    main.recipe_type_urls.update((f"Category {c}", f"https://example.com/category/{c}/") for c in range(1, 7))
+    leased = []
+
+    def scrape_recipe_pages_in_driver(driver, url, on_page=None, progress=None):
+        leased.append(len(main.driver_pool._in_use))
+        time.sleep(0.01)
+        page_recipes = {f"{driver.current_url}recipe/{i}/": f"Recipe {i}" for i in range(1, 4)}
+        progress.recipes.update(page_recipes)
+        if on_page is not None:
+            on_page(page_recipes)
+        return progress.recipes
+
+    monkeypatch.setattr(main, "scrape_recipe_pages_in_driver", scrape_recipe_pages_in_driver)
+    return leased
+
+
+def test_acquire_waits_for_a_driver_once_the_pool_is_full(drivers):
+    started, _ = drivers
+    first, second = main.driver_pool.acquire(), main.driver_pool.acquire()
+    acquired = []
+    waiting = threading.Thread(target=lambda: acquired.append(main.driver_pool.acquire()))
+    waiting.start()
+    waiting.join(0.2)
+    assert waiting.is_alive() and len(started) == 2
+
+    # Once a driver is released, the waiting thread reuses it (no new driver is started):
+    main.driver_pool.release(second)
+    waiting.join(5)
+    assert acquired == [second] and len(started) == 2
+    main.driver_pool.release(first)
+    main.driver_pool.release(second)
+
+
+def test_idle_driver_on_the_preferred_page_is_reused(drivers):
+    first, second = main.driver_pool.acquire(), main.driver_pool.acquire()
+    first.current_url = "https://example.com/recipes/"
+    main.driver_pool.release(first)
+    main.driver_pool.release(second)
+    assert main.driver_pool.acquire("https://example.com/recipes/") is first
+
+
+def test_discarded_driver_is_closed_and_replaced(drivers):
+    started, _ = drivers
+    driver = main.driver_pool.acquire()
+    main.driver_pool.release(driver, discard=True)
+    assert driver.closed
+    assert main.driver_pool.acquire() is not driver and len(started) == 2
+
+
+def test_recipes_scraped_by_several_workers_are_merged(selenium_site, drivers):
+    recipes = main.scrape_recipe_categories([f"Category {c}" for c in range(1, 7)], max_workers=4)
+    assert recipes == {f"Category {c}": {f"https://example.com/category/{c}/recipe/{i}/": f"Recipe {i}" for i in range(1, 4)} for c in range(1, 7)}
+
+    # The 4 workers shared the 2 drivers of the pool, which are idle again:
+    assert max(selenium_site) <= 2 and len(drivers[0]) == 2
+    assert not main.driver_pool._in_use and len(main.driver_pool._idle) == 2
+
+
+def test_driver_is_released_when_scraping_fails(selenium_site, drivers):
+    started, failing_urls = drivers
+    failing_urls.add("https://example.com/category/2/")
+    recipes = main.scrape_recipe_categories(["Category 1", "Category 2", "Category 3"], max_workers=1)
+    assert recipes["Category 2"] is None
+    assert recipes["Category 1"] and recipes["Category 3"]
+
+    # The driver whose browser died was not retried, but closed (and replaced for the next recipe type):
+    failed = [driver for driver in started if driver.closed]
+    assert len(failed) == 1 and failed[0].loaded_urls.count("https://example.com/category/2/") == 1
+    assert not main.driver_pool._in_use
@@ -0,0 +1,78 @@
+# Tests of the lightweight (HTTP) fetch backend's HTML parsing and list extraction, and of its parity with the Selenium
+# fetch backend (the same recipe types and recipes must be captured by either).
+import benchmark
+import main
+import pytest
+
+
+def scrape_with_backend(backend, base_url):
+    """Function which scrapes the recipe types and the recipes of each recipe type of the fixture website with a fetch backend"""
+    benchmark.prepare_scraper(base_url, backend)
+    recipe_types = main.scrape_recipe_types_http() if backend == main.FETCH_BACKEND_HTTP else main.scrape_recipe_types_selenium()
+    scrape = main.scrape_recipes_http if backend == main.FETCH_BACKEND_HTTP else main.scrape_recipes_selenium
+    return recipe_types, {recipe_type: scrape(recipe_type) for recipe_type, _ in recipe_types}
+
+
+def test_text_collapses_whitespace_and_skips_scripts():
+    document = main.parse_html_document('<div id="a"> Chicken\n  <b>Curry</b>, <script>var x = 1;</script><style>b {}</style>Deluxe </div>')
+    assert document.elements_by_id["a"].text == "Chicken Curry, Deluxe"
+
+
+def test_void_and_stray_end_tags_keep_the_tree_intact():
+    document = main.parse_html_document('<ul><li id="one"><img src="a.jpg"><br>One</span></li><li id="two">Two</li></ul>')
+    first, second = document.elements_by_id["one"], document.elements_by_id["two"]
+    assert first.text == "One" and second.text == "Two"
+    assert second.parent is first.parent
+
+
+def test_first_element_with_an_id_wins():
+    document = main.parse_html_document('<p id="x">First</p><p id="x">Second</p>')
+    assert document.elements_by_id["x"].text == "First"
+
+
+def test_next_page_links_are_noted():
+    document = main.parse_html_document('<a rel="nofollow" href="/a">A</a><link rel="Next" href="/b"><a rel="next noopener" href="/c">C</a>')
+    assert [link.get_attribute("href") for link in document.next_page_links] == ["/b", "/c"]
+
+
+def test_list_extractor_stops_at_first_missing_item_and_skips_incomplete_items():
+    extractor = main.ListExtractor("item_{index}", {"name": {"path": "span", "value": "text"}, "url": {"path": "", "value": "@href"}})
+    document = main.parse_html_document('<a id="item_1" href="/r/1"><span>One</span></a>'
+                                        '<a id="item_2" href="/r/2">No name</a>'
+                                        '<a id="item_3" href="r/3"><span>Three</span></a>'
+                                        '<a id="item_5" href="/r/5"><span>Five</span></a>')
+    assert extractor.extract(document, "http://example.com/list/") == [{"name": "One", "url": "http://example.com/r/1"},
+                                                                      {"name": "Three", "url": "http://example.com/list/r/3"}]
+
+
+def test_list_extractor_rejects_item_id_without_index():
+    with pytest.raises(ValueError):
+        main.ListExtractor("item", {"name": {"path": "", "value": "text"}})
+
+
+def test_http_backend_captures_fixture_site(fixture_site):
+    _, base_url = fixture_site(category_count=3, card_count=40, category_page_count=3)
+    recipe_types, recipes = scrape_with_backend(main.FETCH_BACKEND_HTTP, base_url)
+
+    assert recipe_types == [(f"Category {c}", f"{base_url}category/{c}/") for c in range(1, 4)]
+    for c in range(1, 4):
+        # Every card is captured once (each page repeats the previous page's last card), in page order:
+        assert list(recipes[f"Category {c}"].items()) == [(f"{base_url}recipe/{c}-{i}/", f"Recipe {c}-{i}, Deluxe") for i in range(1, 41)]
+
+
+def test_http_backend_matches_selenium_backend(fixture_site):
+    _, base_url = fixture_site(category_count=2, card_count=30, category_page_count=2)
+    if not benchmark.selenium_available(base_url):
+        pytest.skip("Selenium or a Chrome browser is not available")
+    try:
+        assert scrape_with_backend(main.FETCH_BACKEND_HTTP, base_url) == scrape_with_backend(main.FETCH_BACKEND_SELENIUM, base_url)
+    finally:
+        main.driver_pool.close_all()
+
+
+def test_recipe_details_are_parsed_from_json_ld(fixture_site):
+    pages, base_url = fixture_site(category_count=1, card_count=3, recipe_page_count=3)
+    details = main.parse_recipe_details(pages["/recipe/1-2/"], base_url + "recipe/1-2/")
+    assert details["ingredients"] == [f"Ingredient {n}" for n in range(1, 13)]
+    assert (details["prep_time"], details["cook_time"], details["total_time"]) == (15, 65, 80)
+    assert (details["rating"], details["rating_count"]) == (4.6, 14)
@@ -0,0 +1,84 @@
+# Tests of incremental scraping:  Recipes added, removed or changed (renamed, or with changed details) since the previous run
+# are reported wherever they are listed among a recipe type's pages, and a recipe type which cannot be scraped fails the run.
+import csv
+import os
+import re
+
+import main
+
+
+def card(category, number, item_number, name):
+    """Function which returns the HTML of a recipe card of the fixture website (see benchmark.build_fixture_site)"""
+    return (f'<a id="mntl-card-list-items_{item_number}-0" class="card" href="/recipe/{category}-{number}/">'
+            f'<div class="card__media"></div><div class="card__content"><span class="card__title"><span class="card__title-text">{name}</span></span></div></a>')
+
+
+def changes(folder):
+    """Function which returns the changes written by an incremental run, as (change, recipe type, name) triples, and the details columns of each changed recipe (by name)"""
+    with open(os.path.join(folder, "Recipe Changes.csv"), newline="", encoding="utf-8") as changes_file:
+        rows = list(csv.DictReader(changes_file))
+    return sorted((row["Change"], row["Recipe Type"], row["Recipe"]) for row in rows), {row["Recipe"]: row["Ingredients"] for row in rows}
+
+
+def run_incremental(folder, *options):
+    """Function which runs an incremental scrape of the fixture website from the command line.  Returns its exit code"""
+    return main.run_cli(["scrape", "--out", folder, "--incremental", *options])
+
+
+def test_changes_are_found_on_every_page(fixture_site, tmp_path):
+    pages, _ = fixture_site(category_count=2, card_count=30, category_page_count=3)
+    folder = str(tmp_path / "out")
+    assert run_incremental(folder) == 0
+    assert len(changes(folder)[0]) == 60
+
+    # Unchanged website:  Nothing to report:
+    assert run_incremental(folder) == 0
+    assert changes(folder)[0] == []
+
+    # Rename a recipe on page 2, remove the last recipe of page 3 and add a recipe at the end of page 2:
+    pages["/category/1/?page=2"] = pages["/category/1/?page=2"].replace("Recipe 1-15, Deluxe", "Recipe 1-15, Special")
+    pages["/category/1/?page=3"] = re.sub(r'<a id="mntl-card-list-items_\d+-0" class="card" href="/recipe/1-30/">.*?</a>', "", pages["/category/1/?page=3"])
+    pages["/category/1/?page=2"] = pages["/category/1/?page=2"].replace("</div><a rel=", card(1, 99, 12, "Recipe 1-99, New") + "</div><a rel=")
+    assert run_incremental(folder) == 0
+    assert changes(folder)[0] == [("added", "Category 1", "Recipe 1-99, New"),
+                                  ("changed", "Category 1", "Recipe 1-15, Special"),
+                                  ("removed", "Category 1", "Recipe 1-30, Deluxe")]
+
+
+def test_changed_details_of_unchanged_recipes_are_reported(fixture_site, tmp_path):
+    pages, _ = fixture_site(category_count=1, card_count=6, recipe_page_count=6, category_page_count=2)
+    folder = str(tmp_path / "out")
+    assert run_incremental(folder, "--details") == 0
+    assert run_incremental(folder, "--details") == 0
+    assert changes(folder)[0] == []
+
+    pages["/recipe/1-5/"] = pages["/recipe/1-5/"].replace("Ingredient 3", "Saffron")
+    assert run_incremental(folder, "--details") == 0
+    rows, ingredients = changes(folder)
+    assert rows == [("changed", "Category 1", "Recipe 1-5, Deluxe")]
+    assert "Saffron" in ingredients["Recipe 1-5, Deluxe"]
+
+
+def test_quick_mode_stops_at_the_first_known_page(fixture_site, tmp_path):
+    pages, _ = fixture_site(category_count=1, card_count=30, category_page_count=3)
+    folder = str(tmp_path / "out")
+    assert run_incremental(folder, "--quick") == 0
+    main.metrics.reset()
+
+    # New recipes (listed first) are found, but, as documented, changes past the first known page are not:
+    pages["/category/1/"] = pages["/category/1/"].replace("Recipe 1-2, Deluxe", "Recipe 1-2, Special")
+    pages["/category/1/?page=2"] = pages["/category/1/?page=2"].replace("Recipe 1-15, Deluxe", "Recipe 1-15, Special")
+    assert run_incremental(folder, "--quick") == 0
+    assert changes(folder)[0] == [("changed", "Category 1", "Recipe 1-2, Special")]
+    assert main.metrics.snapshot()["counters"]["recipe_list_pages_total"] == 1
+
+
+def test_run_fails_if_a_recipe_type_cannot_be_scraped(fixture_site, tmp_path):
+    pages, _ = fixture_site(category_count=2, card_count=5)
+    folder = str(tmp_path / "out")
+    assert run_incremental(folder) == 0
+
+    # The recipe type which failed is left untouched (its recipes are not reported as removed):
+    del pages["/category/2/"]
+    assert run_incremental(folder) == 1
+    assert changes(folder)[0] == []
@@ -0,0 +1,99 @@
+# Tests of writing the recipes of several recipe types to their own files as they are scraped (progress reported after each
+# page, and paging stopped by the caller or once cancelled, with the recipes captured so far kept), and of the output files
+# themselves:  Sorted output spilled in several runs, links within HYPERLINK formulas, and Parquet files.
+import csv
+import threading
+
+import main
+import pytest
+
+
+def written_names(file_path):
+    """Function which returns the recipe names written to a CSV output file"""
+    with open(file_path, newline="", encoding="utf-8-sig") as recipe_file:
+        return [row["Recipe"] for row in csv.DictReader(recipe_file)]
+
+
+def test_each_page_is_reported_once_written(fixture_site, tmp_path):
+    fixture_site(category_count=2, card_count=30, category_page_count=3)
+    reported = []
+
+    def report_page(recipe_type, page_recipes):
+        reported.append((recipe_type, len(page_recipes), len(written_names(tmp_path / f"{recipe_type}.csv"))))
+        return False
+
+    scraped = main.iter_recipe_categories_to_files(["Category 1", "Category 2"], lambda recipe_type: str(tmp_path / f"{recipe_type}.csv"), max_workers=1, on_page=report_page)
+    assert [(recipe_type, rows_written) for recipe_type, _, rows_written in scraped] == [("Category 1", 30), ("Category 2", 30)]
+    assert [(recipe_type, count) for recipe_type, count, _ in reported] == [(recipe_type, count) for recipe_type in ("Category 1", "Category 2") for count in (10, 10, 10)]
+
+
+def test_paging_stops_when_asked_to_or_cancelled(fixture_site, tmp_path):
+    fixture_site(category_count=2, card_count=30, category_page_count=3)
+    file_path_for = lambda recipe_type: str(tmp_path / f"{recipe_type}.csv")
+
+    # Stopped by the caller after the first page:
+    scraped = main.iter_recipe_categories_to_files(["Category 1"], file_path_for, max_workers=1, on_page=lambda recipe_type, page_recipes: True)
+    assert [rows_written for _, _, rows_written in scraped] == [10]
+    assert len(written_names(file_path_for("Category 1"))) == 10
+
+    # Cancelled during the first page:  The remaining pages are skipped (the recipes written so far are kept), and so are the
+    # remaining recipe types:
+    cancel_event = threading.Event()
+    scraped = main.iter_recipe_categories_to_files(["Category 1", "Category 2"], file_path_for, max_workers=1, cancel_event=cancel_event,
+                                                   on_page=lambda recipe_type, page_recipes: cancel_event.set())
+    assert list(scraped) == []
+    assert len(written_names(file_path_for("Category 1"))) == 10
+
+
+def test_recipes_captured_again_by_the_fallback_are_written_once(fixture_site, tmp_path, monkeypatch):
+    pages, _ = fixture_site(category_count=1, card_count=30, category_page_count=3)
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_NORMAL)
+    del pages["/category/1/?page=2"]
+
+    # The HTTP fetch backend fails on page 2.  The fallback reads page 1 again (from the cache), but its recipes are not
+    # written again:
+    scraped = main.iter_recipe_categories_to_files(["Category 1"], lambda recipe_type: str(tmp_path / f"{recipe_type}.csv"), max_workers=1)
+    assert [(recipes, rows_written) for _, recipes, rows_written in scraped] == [(None, 10)]
+    assert written_names(tmp_path / "Category 1.csv") == [f"Recipe 1-{i}, Deluxe" for i in range(1, 11)]
+
+
+def test_sorted_rows_spilled_in_several_runs_are_merged(tmp_path):
+    names = [f"Recipe {i:02d}" for i in (7, 3, 10, 1, 9, 4, 2, 8, 6, 5)]
+    writer = main.RecipeWriter(str(tmp_path / "sorted.csv"), main.CSV_COLUMNS_RECIPES, sort_key=lambda row: row["name"], sort_buffer_rows=3)
+    for name in names:
+        writer.write({"name": name, "url": f"https://example.com/{name}"})
+    assert len(writer._sort_runs) == 3 and len(writer._sort_buffer) == 1
+    writer.close()
+
+    assert writer.rows_written == 10
+    assert written_names(tmp_path / "sorted.csv") == sorted(names)
+
+
+def test_links_with_double_quotes_are_escaped_in_hyperlink_formulas(tmp_path):
+    url = 'https://example.com/recipe/1/?q="curry"'
+    with main.RecipeWriter(str(tmp_path / "recipes.csv"), main.CSV_COLUMNS_RECIPES) as writer:
+        writer.write({"name": "Curry", "url": url})
+
+    with open(tmp_path / "recipes.csv", newline="", encoding="utf-8-sig") as recipe_file:
+        assert next(csv.DictReader(recipe_file))["URL"] == '=HYPERLINK("https://example.com/recipe/1/?q=""curry""")'
+    assert [row["url"] for row in main.read_recipe_file(str(tmp_path / "recipes.csv"))] == [url]
+
+
+def test_parquet_file_has_the_table_schema_and_every_row(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    rows = [{"recipe_type": "Dinner", "name": f"Recipe {i}", "url": f"https://example.com/recipe/{i}/", "ingredients": ["Rice", f"Spice {i}"],
+             "prep_time": i, "cook_time": None, "total_time": i + 10, "servings": "4", "rating": 4.5, "rating_count": 10 * i, "json_ld": {"name": f"Recipe {i}"}}
+            for i in range(5)]
+    file_path = str(tmp_path / "details.parquet")
+    with main.ParquetSink(file_path, main.TABLE_COLUMNS_RECIPE_DETAILS, batch_rows=2) as sink:
+        for row in rows:
+            sink.write(row)
+
+    parquet_file = pyarrow.parquet.ParquetFile(file_path)
+    assert parquet_file.metadata.num_row_groups == 3
+    types = {"TEXT": pyarrow.string(), "INTEGER": pyarrow.int64(), "REAL": pyarrow.float64()}
+    assert parquet_file.schema_arrow == pyarrow.schema([(name, types[column_type]) for name, column_type, _ in main.TABLE_COLUMNS_RECIPE_DETAILS])
+    assert parquet_file.read().to_pylist() == [{name: value(row) for name, _, value in main.TABLE_COLUMNS_RECIPE_DETAILS} for row in rows]
+    assert [(row["url"], row["ingredients"]) for row in main.read_recipe_file(file_path)] == [(row["url"], row["ingredients"]) for row in rows]
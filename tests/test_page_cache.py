@@ -0,0 +1,129 @@
+# Tests of the on-disk page cache:  Freshness (TTL), revalidation with the website (ETag / "304 Not Modified") and eviction of
+# the least recently used pages once the cache is full.
+import itertools
+import threading
+
+import main
+import pytest
+
+
+def cache_total(cache):
+    """Function which returns the total size of the cached pages, as tracked by the cache"""
+    return cache._connect().execute("SELECT total FROM cache_size").fetchone()[0]
+
+
+def cached_urls(cache):
+    """Function which returns the URLs of the cached pages"""
+    return {url for url, in cache._connect().execute("SELECT url FROM pages")}
+
+
+def test_page_is_fresh_until_ttl_has_passed(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+    cache = main.PageCache(str(tmp_path / "ttl.sqlite3"), ttl=15, max_bytes=10000)
+    cache.put("http://example.com/a", "http://example.com/a/", "<p>A</p>", etag='"a"')
+
+    now[0] += 10
+    assert cache.get("http://example.com/a") == {"final_url": "http://example.com/a/", "html": "<p>A</p>", "etag": '"a"', "last_modified": None, "fresh": True}
+    now[0] += 10
+    assert not cache.get("http://example.com/a")["fresh"]
+    cache.revalidated("http://example.com/a")
+    now[0] += 10
+    assert cache.get("http://example.com/a")["fresh"]
+    assert cache.get("http://example.com/missing") is None
+
+
+def test_fresh_page_is_not_downloaded_again(fixture_site, monkeypatch):
+    _, base_url = fixture_site()
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_NORMAL)
+
+    assert main.fetch_page_html(base_url + "recipes/") == main.fetch_page_html(base_url + "recipes/")
+    counters = main.metrics.snapshot()["counters"]
+    assert counters['pages_fetched_total{backend="http"}'] == 1
+    assert counters["cache_hits_total"] == 1
+
+
+def test_stale_page_is_revalidated_with_its_etag(fixture_site, monkeypatch, tmp_path):
+    pages, base_url = fixture_site()
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_NORMAL)
+    monkeypatch.setattr(main, "page_cache", main.PageCache(str(tmp_path / "stale.sqlite3"), ttl=0, max_bytes=10 ** 6))
+    url = base_url + "recipes/"
+
+    # Unchanged page:  The website answers "304 Not Modified", and the cached copy is used:
+    _, html = main.fetch_page_html(url)
+    assert main.page_cache.get(url)["etag"]
+    assert main.fetch_page_html(url)[1] == html
+    counters = main.metrics.snapshot()["counters"]
+    assert counters['pages_fetched_total{backend="http"}'] == 1
+    assert counters["cache_revalidations_total"] == 1
+
+    # Changed page:  It is downloaded again, and replaces the cached copy:
+    pages["/recipes/"] = html.replace("Category 1", "Category One")
+    assert "Category One" in main.fetch_page_html(url)[1]
+    assert "Category One" in main.page_cache.get(url)["html"]
+    assert main.metrics.snapshot()["counters"]['pages_fetched_total{backend="http"}'] == 2
+
+
+def test_offline_mode_only_uses_cached_pages(fixture_site, monkeypatch):
+    _, base_url = fixture_site()
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_NORMAL)
+    main.fetch_page_html(base_url + "recipes/")
+
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_OFFLINE)
+    assert "Category 1" in main.fetch_page_html(base_url + "recipes/")[1]
+    with pytest.raises(LookupError):
+        main.fetch_page_html(base_url + "category/1/")
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000.0)
+    monkeypatch.setattr(main.time, "time", lambda: next(clock))
+    cache = main.PageCache(str(tmp_path / "lru.sqlite3"), ttl=60, max_bytes=300)
+    for name in "abc":
+        cache.put(name, name, "x" * 100)
+    cache.get("a")  # "b" is now the least recently used page
+
+    cache.put("d", "d", "x" * 100)
+    assert cached_urls(cache) == {"a", "c", "d"}
+    assert cache_total(cache) == 300
+
+
+def test_cache_size_is_counted_in_bytes(tmp_path):
+    cache = main.PageCache(str(tmp_path / "bytes.sqlite3"), ttl=60, max_bytes=300)
+    cache.put("a", "a", "é" * 100)  # 200 bytes (UTF-8)
+    cache.put("b", "b", "x" * 100)
+    assert cache_total(cache) == 300
+
+    cache.put("c", "c", "x")
+    assert cached_urls(cache) == {"b", "c"}
+    assert cache_total(cache) == 101
+
+
+def test_cache_size_survives_replacements_and_reopening(tmp_path):
+    path = str(tmp_path / "reopen.sqlite3")
+    cache = main.PageCache(path, ttl=60, max_bytes=10000)
+    cache.put("a", "a", "x" * 100)
+    cache.put("a", "a", "x" * 40)
+    cache.put("b", "b", "x" * 10)
+    assert cache_total(cache) == 50
+
+    assert cache_total(main.PageCache(path, ttl=60, max_bytes=10000)) == 50
+    cache.clear()
+    assert cache_total(cache) == 0 and not cached_urls(cache)
+
+
+def test_detail_crawl_uses_the_cache_off_the_event_loop(fixture_site, monkeypatch, tmp_path):
+    _, base_url = fixture_site(category_count=1, card_count=4, recipe_page_count=4)
+    monkeypatch.setattr(main, "cache_mode", main.CACHE_MODE_NORMAL)
+    monkeypatch.setattr(main, "page_cache", main.PageCache(str(tmp_path / "async.sqlite3"), ttl=0, max_bytes=10 ** 6))
+    cache_threads = set()
+    for name in ("get", "put", "revalidated"):
+        method = getattr(main.page_cache, name)
+        monkeypatch.setattr(main.page_cache, name, lambda *args, method=method: cache_threads.add(threading.current_thread()) or method(*args))
+
+    # Crawl the recipe pages twice (downloaded, then revalidated), from a generator of URLs:
+    for _ in range(2):
+        details = main.get_recipe_details(f"{base_url}recipe/1-{i}/" for i in range(1, 5))
+        assert [recipe["url"] for recipe in details] == [f"{base_url}recipe/1-{i}/" for i in range(1, 5)]
+    assert main.metrics.snapshot()["counters"]["cache_revalidations_total"] == 4
+    assert cache_threads and threading.main_thread() not in cache_threads
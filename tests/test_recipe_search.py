@@ -0,0 +1,36 @@
+# Tests of the search index built on the recipe store:  Every word of a query must match (the last one also as a prefix),
+# accents and case are ignored, and recipes and details added later are indexed incrementally.
+import main
+
+
+def names(recipes):
+    """Function which returns the names of recipes (Recipe objects)"""
+    return [recipe.name for recipe in recipes]
+
+
+def test_search_matches_every_word_and_the_last_as_prefix():
+    store = main.RecipeStore()
+    index = main.RecipeSearchIndex(store)
+    store.add_many("Dinner", {"https://example.com/1": "Chicken Curry", "https://example.com/2": "Chicken Pie", "https://example.com/3": "Crème Brûlée"})
+    store.add_many("Lunch", {"https://example.com/4": "Curried Chicken Salad"})
+
+    assert names(index.search("chicken cur")) == ["Chicken Curry", "Curried Chicken Salad"]
+    assert names(index.search("curry chicken")) == ["Chicken Curry"]
+    assert names(index.search("CREME brul")) == ["Crème Brûlée"]
+    assert names(index.search("chicken", recipe_type="Lunch")) == ["Curried Chicken Salad"]
+    assert names(index.search("chicken", limit=2)) == ["Chicken Curry", "Chicken Pie"]
+    assert index.search("chicken lamb") == [] and index.search("  ") == []
+
+
+def test_search_index_follows_the_store_and_indexes_ingredients():
+    store = main.RecipeStore()
+    index = main.RecipeSearchIndex(store)
+    store.add("Dinner", "Chicken Curry", "https://example.com/1")
+    assert names(index.search("chi")) == ["Chicken Curry"]
+
+    # Recipes added after a search are indexed on the next one, as are details captured later:
+    store.add("Dinner", "Chickpea Stew", "https://example.com/2")
+    assert names(index.search("chi")) == ["Chicken Curry", "Chickpea Stew"]
+    index.add_details("https://example.com/2", {"ingredients": ["2 cups chickpeas", "1 tsp cumin"]})
+    assert names(index.search("cumin")) == ["Chickpea Stew"]
+    assert index.complete("chi") == ["chicken", "chickpea", "chickpeas"]
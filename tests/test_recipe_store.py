@@ -0,0 +1,56 @@
+# Tests of the in-memory recipe store:  Deduplication by link, growth of its link index, and lookups by id, link, recipe type
+# and name prefix.
+import main
+
+
+def names(recipes):
+    """Function which returns the names of recipes (Recipe objects)"""
+    return [recipe.name for recipe in recipes]
+
+
+def test_recipes_are_deduplicated_by_link():
+    store = main.RecipeStore()
+    recipe_id = store.add("Dinner", "Chicken Curry", "https://example.com/recipe/1/")
+    assert store.add("Dinner", "Chicken Curry", "https://example.com/recipe/1/") == recipe_id
+    assert store.add_many("Lunch", {"https://example.com/recipe/1/": "Chicken Curry", "https://example.com/recipe/2/": "Soup"}) == 1
+
+    # A recipe listed under several recipe types is held once, and listed under each:
+    assert len(store) == 2
+    assert names(store.by_recipe_type("Dinner")) == ["Chicken Curry"]
+    assert names(store.by_recipe_type("Lunch")) == ["Chicken Curry", "Soup"]
+    assert store.find("https://example.com/recipe/1/").recipe_type == "Dinner"
+    assert store.get(recipe_id).url == "https://example.com/recipe/1/"
+    assert "https://example.com/recipe/3/" not in store
+    assert store.find("https://example.com/recipe/3/") is None and store.get("not an id") is None
+
+
+def test_link_index_grows_and_keeps_every_recipe():
+    store = main.RecipeStore()
+    count = main.RecipeStore.INITIAL_INDEX_SLOTS * 4
+    ids = [store.add(f"Type {i % 7}", f"Recipe {i}", f"https://example.com/recipe/{i}/") for i in range(count)]
+
+    assert len(store._slot_recipes) > main.RecipeStore.INITIAL_INDEX_SLOTS
+    assert len(store) == count
+    for i in range(count):
+        recipe = store.find(f"https://example.com/recipe/{i}/")
+        assert (recipe.name, recipe.id) == (f"Recipe {i}", ids[i])
+        assert store.get(ids[i]).name == f"Recipe {i}"
+    assert store.add("Type 0", "Recipe 0", "https://example.com/recipe/0/") == ids[0]
+    assert len(store) == count
+
+
+def test_recipe_ids_are_stable_across_stores():
+    first, second = main.RecipeStore(), main.RecipeStore()
+    second.add("Lunch", "Soup", "https://example.com/recipe/2/")
+    assert first.add("Dinner", "Curry", "https://example.com/recipe/1/") == second.add("Dinner", "Curry", "https://example.com/recipe/1/")
+
+
+def test_name_prefix_lookup():
+    store = main.RecipeStore()
+    store.add_many("Dinner", {"https://example.com/1": "Chicken Curry", "https://example.com/2": "chicken pie", "https://example.com/3": "Beef Stew"})
+    store.add_many("Lunch", {"https://example.com/4": "Chickpea Salad"})
+
+    assert names(store.search_prefix("chick")) == ["Chicken Curry", "chicken pie", "Chickpea Salad"]
+    assert names(store.search_prefix("CHICK", recipe_type="Lunch")) == ["Chickpea Salad"]
+    assert names(store.search_prefix("chick", limit=1)) == ["Chicken Curry"]
+    assert store.search_prefix("lamb") == []
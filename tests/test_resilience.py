@@ -0,0 +1,240 @@
+# Tests of the resilience of page fetches:  Classification of errors, retries with backoff, per-host circuit breaking, and
+# scraping a website which fails part of its requests (the fixture server's fault injection).
+import asyncio
+import http.client
+import ssl
+import urllib.error
+
+import main
+import pytest
+
+
+class FlakyRequest:
+    """Class which stands in for a request, failing with the given errors (in turn) before succeeding"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "page"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture which replaces the monotonic clock (as seen by the circuit breaker) with a clock advanced by the test"""
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    return now
+
+
+def selenium_error(name, message=""):
+    """Function which returns a Selenium error (errors are classified by name, so Selenium need not be installed)"""
+    return type(name, (Exception,), {})(message)
+
+
+def read_response(data):
+    """Function which reads an HTTP response from raw bytes, as the asyncio connection pool does"""
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await main.AsyncHTTPConnectionPool._read_response(reader)
+    return asyncio.run(read())
+
+
+@pytest.mark.parametrize("err, transient", [
+    (urllib.error.HTTPError("http://example.com/", 503, "Service Unavailable", {}, None), True),
+    (urllib.error.HTTPError("http://example.com/", 429, "Too Many Requests", {}, None), True),
+    (urllib.error.HTTPError("http://example.com/", 404, "Not Found", {}, None), False),
+    (main.HTTPStatusError("http://example.com/", 502), True),
+    (main.HTTPStatusError("http://example.com/", 410), False),
+    (ConnectionResetError(), True),
+    (TimeoutError(), True),
+    (http.client.IncompleteRead(b"partial"), True),
+    (asyncio.IncompleteReadError(b"partial", 100), True),
+    (ssl.SSLCertVerificationError("certificate verify failed"), False),
+    (urllib.error.URLError(ssl.SSLCertVerificationError("certificate verify failed")), False),
+    (main.CircuitOpenError("open"), False),
+    (LookupError("Page is not cached (offline mode)"), False),
+    (ValueError(), False),
+    (selenium_error("StaleElementReferenceException"), True),
+    (selenium_error("WebDriverException", "unknown error: net::ERR_CONNECTION_RESET"), True),
+    (selenium_error("WebDriverException", "unknown error: chrome not reachable"), False),
+    (selenium_error("WebDriverException", "disconnected: not connected to DevTools"), False),
+    (selenium_error("InvalidSessionIdException", "invalid session id"), False),
+    (selenium_error("NoSuchWindowException", "no such window: target window already closed"), False),
+])
+def test_errors_are_classified(err, transient):
+    assert main.is_transient_error(err) is transient
+
+
+@pytest.mark.parametrize("data, error", [
+    (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhel", asyncio.IncompleteReadError),
+    (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n", ConnectionResetError),
+    (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\nhello\r\n0\r\n\r\n", ConnectionError),
+    (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhelloX0\r\n\r\n", ConnectionError),
+    (b"garbage\r\n\r\n", ConnectionError),
+])
+def test_cut_short_or_garbled_responses_are_transient(data, error):
+    with pytest.raises(error) as raised:
+        read_response(data)
+    assert main.is_transient_error(raised.value)
+
+
+def test_chunked_response_is_read():
+    status, headers, body, reusable = read_response(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5;x=1\r\nhello\r\n6\r\n world\r\n0\r\nTrailer: 1\r\n\r\n")
+    assert (status, body, reusable) == (200, b"hello world", True)
+
+
+def test_transient_errors_are_retried_until_success():
+    policy = main.RetryPolicy(4, 0.001, 0.01, main.CircuitBreaker(10, 60))
+    request = FlakyRequest(ConnectionResetError(), main.HTTPStatusError("http://example.com/", 503, "0"))
+    assert policy.call("http://example.com/page", request) == "page"
+    assert (request.calls, policy.retries) == (3, 2)
+
+
+def test_permanent_errors_are_not_retried():
+    policy = main.RetryPolicy(4, 0.001, 0.01, main.CircuitBreaker(10, 60))
+    request = FlakyRequest(main.HTTPStatusError("http://example.com/", 404), ConnectionResetError())
+    with pytest.raises(main.HTTPStatusError):
+        policy.call("http://example.com/page", request)
+    assert request.calls == 1
+
+
+def test_last_error_is_raised_once_all_attempts_have_failed():
+    policy = main.RetryPolicy(3, 0.001, 0.01, main.CircuitBreaker(10, 60))
+    request = FlakyRequest(*(ConnectionResetError(str(attempt)) for attempt in range(1, 5)))
+    with pytest.raises(ConnectionResetError, match="3"):
+        policy.call("http://example.com/page", request)
+    assert request.calls == 3
+
+
+def test_async_requests_are_retried():
+    policy = main.RetryPolicy(4, 0.001, 0.01, main.CircuitBreaker(10, 60))
+    request = FlakyRequest(ConnectionResetError(), TimeoutError())
+
+    async def request_async():
+        return request()
+
+    assert asyncio.run(policy.call_async("http://example.com/page", request_async)) == "page"
+    assert request.calls == 3
+
+
+def test_backoff_delay_grows_exponentially_and_honours_retry_after():
+    policy = main.RetryPolicy(10, 0.5, 4, main.CircuitBreaker(10, 60))
+    for attempt, limit in ((1, 0.5), (2, 1), (3, 2), (4, 4), (8, 4)):
+        assert all(0 <= policy.backoff_delay(attempt) <= limit for _ in range(50))
+    assert policy.backoff_delay(1, main.HTTPStatusError("http://example.com/", 429, "3")) == 3
+    assert policy.backoff_delay(1, main.HTTPStatusError("http://example.com/", 429, "120")) == 4
+    assert policy.backoff_delay(1, urllib.error.HTTPError("http://example.com/", 503, "", {"Retry-After": "2"}, None)) == 2
+
+
+def test_circuit_opens_after_consecutive_failures_and_lets_a_trial_through(clock):
+    breaker = main.CircuitBreaker(3, 60)
+    for _ in range(2):
+        breaker.record_failure("http://example.com/a")
+    breaker.check("http://example.com/b")  # Closed:  Below the threshold
+
+    # Open:  Requests to the host (only) are stopped:
+    breaker.record_failure("http://example.com/c")
+    with pytest.raises(main.CircuitOpenError):
+        breaker.check("http://example.com/a")
+    breaker.check("http://other.example.com/a")
+
+    # Half-open:  Once the reset time-out has passed, a single trial request is let through...
+    clock[0] += 60
+    breaker.check("http://example.com/a")
+    with pytest.raises(main.CircuitOpenError):
+        breaker.check("http://example.com/a")
+
+    # ...and the circuit remains open if it fails, or is closed if it succeeds:
+    breaker.record_failure("http://example.com/a")
+    clock[0] += 30
+    with pytest.raises(main.CircuitOpenError):
+        breaker.check("http://example.com/a")
+    clock[0] += 30
+    breaker.check("http://example.com/a")
+    breaker.record_success("http://example.com/a")
+    breaker.check("http://example.com/a")
+    breaker.check("http://example.com/a")
+
+
+def test_success_resets_the_failure_count():
+    breaker = main.CircuitBreaker(2, 60)
+    breaker.record_failure("http://example.com/a")
+    breaker.record_success("http://example.com/a")
+    breaker.record_failure("http://example.com/a")
+    breaker.check("http://example.com/a")
+
+
+def test_dead_browser_is_neither_retried_nor_counted_against_the_circuit():
+    policy = main.RetryPolicy(4, 0.001, 0.01, main.CircuitBreaker(1, 60))
+    request = FlakyRequest(selenium_error("WebDriverException", "unknown error: session deleted because of page crash"))
+    with pytest.raises(Exception, match="session deleted"):
+        policy.call("http://example.com/page", request)
+    assert request.calls == 1
+    policy.circuit_breaker.check("http://example.com/page")
+    assert main.metrics.snapshot()["counters"]['fetch_errors_total{kind="driver"}'] == 1
+
+
+def test_fallback_resumes_from_the_page_which_failed(fixture_site):
+    _, base_url = fixture_site(category_count=1, card_count=30, category_page_count=3)
+    fetched_urls = []
+
+    def fetch_page(url):
+        fetched_urls.append(url)
+        if url.endswith("page=2") and fetched_urls.count(url) == 1:
+            raise ConnectionResetError()
+        return main.fetch_page_html(url)
+
+    # The first fetch backend fails on page 2, after the recipes of page 1 have been passed on:
+    captured = []
+    progress = main.RecipeListProgress()
+    with pytest.raises(ConnectionResetError):
+        main.scrape_recipe_pages(base_url + "category/1/", fetch_page, lambda page_recipes: captured.extend(page_recipes), progress)
+    assert (progress.next_url, progress.page_count) == (base_url + "category/1/?page=2", 1)
+
+    # The fallback resumes from page 2, passing each remaining recipe on once:
+    recipes = main.scrape_recipe_pages(base_url + "category/1/", fetch_page, lambda page_recipes: captured.extend(page_recipes), progress)
+    assert fetched_urls == [base_url + "category/1/", base_url + "category/1/?page=2", base_url + "category/1/?page=2", base_url + "category/1/?page=3"]
+    assert captured == list(recipes) == [f"{base_url}recipe/1-{i}/" for i in range(1, 31)]
+    assert (progress.next_url, progress.page_count) == (None, 3)
+
+
+def test_open_circuit_stops_retries():
+    policy = main.RetryPolicy(10, 0.001, 0.01, main.CircuitBreaker(2, 60))
+    request = FlakyRequest(*(ConnectionResetError() for _ in range(10)))
+    with pytest.raises(main.CircuitOpenError):
+        policy.call("http://example.com/page", request)
+    assert request.calls == 2
+
+
+def test_scrape_survives_an_unreliable_website(fixture_site, monkeypatch):
+    _, base_url = fixture_site(category_count=4, card_count=30, recipe_page_count=30, category_page_count=3, fault_rate=0.3, seed=7)
+    monkeypatch.setattr(main.retry_policy, "max_attempts", 12)
+    monkeypatch.setattr(main.retry_policy.circuit_breaker, "failure_threshold", 1000)
+
+    recipe_types = main.scrape_recipe_types()
+    assert [recipe_type for recipe_type, _ in recipe_types] == [f"Category {c}" for c in range(1, 5)]
+    main.recipe_type_urls.update(recipe_types)
+    recipes = main.scrape_recipe_categories([recipe_type for recipe_type, _ in recipe_types])
+    assert {recipe_type: len(category_recipes) for recipe_type, category_recipes in recipes.items()} == {f"Category {c}": 30 for c in range(1, 5)}
+
+    details = {}
+    assert main.crawl_recipe_details(list(recipes["Category 1"]), details.__setitem__) == (30, 0)
+    assert all(details.values())
+    assert main.metrics.snapshot()["counters"]["retries_total"] > 0
+
+
+def test_missing_pages_fail_at_once(fixture_site):
+    _, base_url = fixture_site(category_count=1, card_count=3, recipe_page_count=1)
+    failures = []
+    result = main.crawl_recipe_details([base_url + "recipe/1-1/", base_url + "recipe/missing/"], lambda url, details: None,
+                                       on_error=lambda url, err: failures.append((url, main.is_transient_error(err))))
+    assert result == (1, 1)
+    assert failures == [(base_url + "recipe/missing/", False)]
+    assert "retries_total" not in main.metrics.snapshot()["counters"]
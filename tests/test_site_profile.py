@@ -0,0 +1,54 @@
+# Tests of compiling site profiles:  The site profile shipped with this application is valid, and a malformed profile (bad
+# paths, missing or mistyped keys, invalid JSON) is rejected with an error naming the entry at fault.
+import copy
+import json
+
+import main
+import pytest
+
+
+def shipped_profile():
+    """Function which returns the site profile shipped with this application, as read from its JSON file"""
+    with open(main.SITE_PROFILE_PATH, encoding="utf-8") as profile_file:
+        return json.load(profile_file)
+
+
+def test_shipped_site_profile_is_valid():
+    profile = main.SiteProfile.load(main.SITE_PROFILE_PATH)
+    assert profile.navigation["recipe_type_page"][0].steps == (("div", 1), ("ul", 1), ("li", 2), ("a", 1))
+    assert [name for name, *_ in profile.lists["recipes"].fields] == ["name", "url"]
+    assert profile.pagination["recipes"].max_pages == 50
+
+
+@pytest.mark.parametrize("change, error", [
+    (lambda profile: profile["navigation"]["recipe_type_page"][0].update(path="div[x]/span"), r'navigation "recipe_type_page":  Path "div\[x\]/span" is not valid:  Step "div\[x\]"'),
+    (lambda profile: profile["navigation"]["recipe_type_page"][0].update(path="div//span"), r'navigation "recipe_type_page":  Path "div//span" is not valid:  Step ""'),
+    (lambda profile: profile["navigation"]["recipe_type_page"][0].update(path="li[0]"), r'Step "li\[0\]"'),
+    (lambda profile: profile["navigation"]["recipe_type_page"][0].pop("element_id"), r'navigation "recipe_type_page" does not define "element_id"'),
+    (lambda profile: profile["navigation"]["recipe_type_page"][0].update(element_id=""), r"Element id '' is not a non-empty string"),
+    (lambda profile: profile["navigation"].update(recipe_type_page={"element_id": "nav"}), r'navigation "recipe_type_page":  .* is not a list of steps'),
+    (lambda profile: profile["navigation"].pop("recipe_type_page"), r'does not define navigation "recipe_type_page"'),
+    (lambda profile: profile["lists"]["recipes"].pop("item_id"), r'list "recipes" does not define "item_id"'),
+    (lambda profile: profile["lists"]["recipes"].update(item_id="card_1-0"), r'list "recipes":  Item id .* does not contain "\{index\}"'),
+    (lambda profile: profile["lists"]["recipes"].update(fields=["name", "url"]), r'list "recipes":  "fields" is not an object'),
+    (lambda profile: profile["lists"]["recipes"]["fields"]["url"].update(value="href"), r'list "recipes":  Value \'href\' of field "url" is neither'),
+    (lambda profile: profile["lists"]["recipes"]["fields"]["name"].update(path="div[2]/span[@class='title']"), r'list "recipes":  Field "name":  Path .* is not valid'),
+    (lambda profile: profile["lists"]["recipes"]["fields"].pop("url"), r'does not define list "recipes" with fields name, url'),
+    (lambda profile: profile.update(lists=[]), r'"lists" is not an object'),
+    (lambda profile: profile["pagination"]["recipes"].update(max_pages=0), r'pagination "recipes":  "max_pages" \(0\) is not a whole number'),
+    (lambda profile: profile["pagination"]["recipes"].update(max_pages="50"), r'pagination "recipes":  "max_pages"'),
+    (lambda profile: profile["pagination"]["recipes"].update(next_page=[{"path": "a"}]), r'pagination "recipes" does not define "element_id"'),
+    (lambda profile: profile["pagination"].update(recipe=profile["pagination"]["recipes"]), r'Pagination "recipe" is given for a list which is not defined'),
+])
+def test_malformed_site_profile_is_rejected(change, error):
+    profile = copy.deepcopy(shipped_profile())
+    change(profile)
+    with pytest.raises(ValueError, match=r"Site profile 'allrecipes' .*" + error):
+        main.SiteProfile(profile)
+
+
+def test_site_profile_file_which_is_not_json_is_rejected(tmp_path):
+    file_path = tmp_path / "site_profile.json"
+    file_path.write_text(json.dumps(shipped_profile())[:-2], encoding="utf-8")
+    with pytest.raises(ValueError, match="is not valid JSON"):
+        main.SiteProfile.load(str(file_path))
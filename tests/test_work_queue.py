@@ -0,0 +1,109 @@
+# Tests of the work queue of a distributed crawl:  Leases, their expiry (a task is claimed again once its worker's lease has
+# expired), retries and outcomes.
+import time
+
+import main
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture which replaces the current time (as seen by the work queue) with a clock advanced by the test"""
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+    return now
+
+
+def recipe_tasks(count, recipe_type="Dinner"):
+    """Function which returns recipe-page tasks"""
+    return [{"url": f"https://example.com/recipe/{i}/", "kind": main.WorkQueue.KIND_RECIPE, "recipe_type": recipe_type, "name": f"Recipe {i}"} for i in range(count)]
+
+
+def test_tasks_are_deduplicated_and_recipe_types_claimed_first(tmp_path):
+    queue = main.WorkQueue(str(tmp_path / "queue.sqlite3"))
+    assert queue.enqueue(recipe_tasks(3)) == 3
+    assert queue.enqueue(recipe_tasks(4)) == 1
+    queue.enqueue([{"url": "https://example.com/dinner/", "kind": main.WorkQueue.KIND_RECIPE_TYPE, "recipe_type": "Dinner", "include_details": True}])
+
+    _, kind, tasks = queue.claim(batch_size=10)
+    assert kind == main.WorkQueue.KIND_RECIPE_TYPE
+    assert tasks == [{"url": "https://example.com/dinner/", "kind": "recipe_type", "recipe_type": "Dinner", "name": None, "include_details": 1}]
+    _, kind, tasks = queue.claim(batch_size=3)
+    assert kind == main.WorkQueue.KIND_RECIPE and len(tasks) == 3
+    assert [task["url"] for task in queue.claim(batch_size=3)[2]] == ["https://example.com/recipe/3/"]
+    assert queue.claim() is None
+
+
+def test_expired_lease_is_claimed_again_and_loses_its_output(tmp_path, clock):
+    queue = main.WorkQueue(str(tmp_path / "queue.sqlite3"), lease_timeout=60)
+    queue.enqueue(recipe_tasks(2))
+    lease_id, _, tasks = queue.claim()
+
+    # While the lease is held, the tasks are not available to other workers:
+    clock[0] += 59
+    assert queue.claim() is None
+
+    # Once it has expired, they are claimed again, and the first worker's results are refused:
+    clock[0] += 2
+    new_lease_id, _, new_tasks = queue.claim()
+    assert new_tasks == tasks
+    assert not queue.renew(lease_id)
+    assert not queue.complete(lease_id, [task["url"] for task in tasks], output="part-old.csv")
+    assert queue.complete(new_lease_id, [task["url"] for task in tasks], output="part-new.csv")
+    assert queue.outputs() == {"part-new.csv"}
+    assert queue.is_drained()
+
+
+def test_renewed_lease_is_kept(tmp_path, clock):
+    queue = main.WorkQueue(str(tmp_path / "queue.sqlite3"), lease_timeout=60)
+    queue.enqueue(recipe_tasks(1))
+    lease_id, _, _ = queue.claim()
+    clock[0] += 50
+    assert queue.renew(lease_id)
+    clock[0] += 50
+    assert queue.claim() is None
+    assert queue.complete(lease_id, ["https://example.com/recipe/0/"])
+
+
+def test_lease_is_kept_while_its_tasks_are_worked_on(tmp_path):
+    queue = main.WorkQueue(str(tmp_path / "queue.sqlite3"), lease_timeout=0.3)
+    queue.enqueue(recipe_tasks(1))
+    lease_id, _, _ = queue.claim()
+    with queue.keep_lease(lease_id):
+        time.sleep(1.0)
+        assert queue.claim() is None
+    assert queue.complete(lease_id, ["https://example.com/recipe/0/"])
+
+
+def test_failed_tasks_are_retried_up_to_max_attempts(tmp_path, clock):
+    queue = main.WorkQueue(str(tmp_path / "queue.sqlite3"), lease_timeout=60, max_attempts=2)
+    queue.enqueue(recipe_tasks(2))
+
+    # A task failing with a transient error is retried, one failing permanently (e.g., page not found) is not:
+    lease_id, _, _ = queue.claim()
+    assert queue.complete(lease_id, [], ["https://example.com/recipe/0/"], permanently_failed_urls=["https://example.com/recipe/1/"])
+    lease_id, _, tasks = queue.claim()
+    assert [task["url"] for task in tasks] == ["https://example.com/recipe/0/"]
+
+    # Once max_attempts have been made, the task is given up on (also when its lease expires):
+    assert queue.complete(lease_id, [], ["https://example.com/recipe/0/"])
+    assert queue.claim() is None
+    assert queue.counts()[main.WorkQueue.KIND_RECIPE] == {main.WorkQueue.STATE_FAILED: 2}
+
+    queue.enqueue(recipe_tasks(3)[2:])
+    queue.claim()
+    clock[0] += 61
+    queue.claim()
+    clock[0] += 61
+    assert queue.claim() is None
+    assert queue.counts()[main.WorkQueue.KIND_RECIPE] == {main.WorkQueue.STATE_FAILED: 3}
+
+
+def test_released_tasks_are_available_at_once(tmp_path):
+    queue = main.WorkQueue(str(tmp_path / "queue.sqlite3"), max_attempts=1)
+    queue.enqueue(recipe_tasks(1))
+    lease_id, _, _ = queue.claim()
+    queue.release(lease_id)
+    new_lease_id, _, _ = queue.claim()
+    assert queue.complete(new_lease_id, ["https://example.com/recipe/0/"])
+    assert queue.counts()[main.WorkQueue.KIND_RECIPE] == {main.WorkQueue.STATE_DONE: 1}